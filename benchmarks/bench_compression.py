@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Response Compression Benchmark
+Bytes on the wire and CPU time per request for each negotiated encoding,
+using the Flask test client. ``/`` and ``/api/info`` serve variants
+precompressed by the response cache; the report endpoint is a generated
+health-report-sized JSON payload compressed on every request.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import app
+from src.compression import Compression
+
+
+def add_report_route(checks):
+    """Register a dynamic JSON payload shaped like a health report"""
+    payload = {
+        'environment': 'staging',
+        'checks': [{'name': f"check-{i}", 'status': 'healthy', 'response_time': 0.0123 + i / 1e4,
+                    'details': {'endpoint': f"/api/resource/{i}", 'status_code': 200}}
+                   for i in range(checks)]
+    }
+    app.add_url_rule('/__bench/report', 'bench_report', lambda: payload)
+
+
+def cpu_per_request(client, path, headers, iterations):
+    """Process CPU seconds per request and the response size in bytes"""
+    response = client.get(path, headers=headers)
+    for _ in range(min(iterations, 100)):
+        client.get(path, headers=headers)
+
+    start = time.process_time()
+    for _ in range(iterations):
+        client.get(path, headers=headers)
+    return (time.process_time() - start) / iterations, len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark negotiated response compression')
+    parser.add_argument('--iterations', type=int, default=2000, help='Requests per scenario')
+    parser.add_argument('--checks', type=int, default=200, help='Entries in the generated report payload')
+    parser.add_argument('--min-size', type=int, default=0,
+                        help='COMPRESS_MIN_SIZE for the run (0 compresses the small static payloads too)')
+    args = parser.parse_args()
+
+    app.config['COMPRESS_MIN_SIZE'] = args.min_size
+    add_report_route(args.checks)
+    client = app.test_client()
+    encodings = [None] + list(Compression().encodings)
+
+    print(f"{'endpoint':<10} {'encoding':<9} {'bytes':>9} {'ratio':>7} {'cpu/request':>12}")
+    for name, path in (('index', '/'), ('info', '/api/info'), ('report', '/__bench/report')):
+        identity_bytes = None
+        for encoding in encodings:
+            headers = {'Accept-Encoding': encoding} if encoding else {}
+            cpu, size = cpu_per_request(client, path, headers, args.iterations)
+            identity_bytes = identity_bytes or size
+            print(f"{name:<10} {encoding or 'identity':<9} {size:>9} "
+                  f"{size / identity_bytes:>7.2f} {cpu * 1e6:>9.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Findings Store Benchmark
+Fills a findings history with thousands of builds of slowly drifting
+findings and times the query CLI's trend, first-seen, diff and package
+lookups.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'security'))
+
+from findings import make_finding
+from findings_store import FindingsStore
+
+SEVERITIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
+
+def populate(store, builds, findings_per_build, churn, seed=1):
+    """Each build fixes ``churn`` findings and introduces as many new ones"""
+    rng = random.Random(seed)
+    next_id = findings_per_build
+    current = list(range(findings_per_build))
+
+    for build in range(1, builds + 1):
+        for _ in range(churn):
+            current[rng.randrange(len(current))] = next_id
+            next_id += 1
+        snapshot = list(current)
+        store.record_build(str(build), {'trivy': lambda snapshot=snapshot: (
+            make_finding('trivy', f"CVE-2023-{n:06d}", package=f"pkg-{n % 500}@1.{n % 7}",
+                         location='debian', severity=SEVERITIES[n % 4])
+            for n in snapshot)})
+    return next_id
+
+
+def timed(label, func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<28} {elapsed * 1000:8.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark findings history queries')
+    parser.add_argument('--builds', type=int, default=2000, help='Builds to record')
+    parser.add_argument('--findings', type=int, default=300, help='Findings per build')
+    parser.add_argument('--churn', type=int, default=5, help='Findings replaced per build')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'findings.db')
+        with FindingsStore(path) as store:
+            start = time.perf_counter()
+            populate(store, args.builds, args.findings, args.churn)
+            elapsed = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"recorded {args.builds} builds x {args.findings} findings in {elapsed:.1f}s "
+                  f"({elapsed / args.builds * 1000:.1f} ms/build, {size_mb:.1f} MB)")
+
+            last = str(args.builds)
+            timed('trend (all builds)', lambda: store.trend())
+            timed('trend (last 50, critical)', lambda: store.trend(severity='critical', limit=50))
+            timed('first-seen CVE', lambda: store.first_seen('CVE-2023-000150'))
+            timed('diff last two builds', lambda: store.diff(str(args.builds - 1), last))
+            timed('diff first vs last build', lambda: store.diff('1', last))
+            timed('package history', lambda: store.package_history('pkg-42'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+HTML Report Benchmark
+Renders the security report with full findings tables for generated Trivy
+reports of increasing size and compares wall time and peak RSS of streaming
+the page to disk against building it as one string first. Each run uses its
+own process so peak RSS is measured independently.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEVERITIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'UNKNOWN']
+
+RENDER_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, {security_dir!r})
+import generate_security_report as report
+from html_report import render_report, write_report
+results = {{name: report.skipped_result(name) for name in report.PARSER_INPUTS}}
+results['trivy'] = report.parse_trivy_report(stream='always')
+data = report.consolidate_security_data(results)
+tables = report.findings_tables(['trivy'], 'always')
+start = time.perf_counter()
+chunks = render_report(data, tables, report.RAW_REPORTS)
+if {mode!r} == 'stream':
+    write_report('security-summary.html', chunks)
+else:
+    with open('security-summary.html', 'w', encoding='utf-8') as f:
+        f.write(''.join(chunks))
+elapsed = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'elapsed': elapsed, 'peak_rss_mb': peak_kb / 1024}}))
+"""
+
+
+def write_fixture(workdir, findings):
+    """Trivy JSON report with ``findings`` vulnerabilities plus its text output"""
+    with open(os.path.join(workdir, 'trivy-report.json'), 'w') as f:
+        f.write('{"SchemaVersion": 2, "Results": [')
+        for start in range(0, findings, 1000):
+            if start:
+                f.write(', ')
+            layer = [json.dumps({
+                'VulnerabilityID': f"CVE-2023-{n:07d}",
+                'PkgName': f"package-{n % 5000}",
+                'InstalledVersion': '1.2.3-4',
+                'Severity': SEVERITIES[n % len(SEVERITIES)],
+                'Title': 'Out-of-bounds write in <example> parser'
+            }) for n in range(start, min(start + 1000, findings))]
+            f.write('{"Target": "layer-%d", "Vulnerabilities": [%s]}' % (start // 1000, ', '.join(layer)))
+        f.write(']}')
+    with open(os.path.join(workdir, 'trivy-report.txt'), 'w') as f:
+        for n in range(findings):
+            f.write(f"| package-{n % 5000} | CVE-2023-{n:07d} | {SEVERITIES[n % 5]} | 1.2.3-4 |\n")
+
+
+def run_render(workdir, mode):
+    script = RENDER_SCRIPT.format(security_dir=os.path.join(ROOT, 'security'), mode=mode)
+    output = subprocess.run([sys.executable, '-c', script], cwd=workdir, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming HTML report rendering')
+    parser.add_argument('--findings', default='50000,500000',
+                        help='Comma separated finding counts to render')
+    parser.add_argument('--modes', default='stream,buffered',
+                        help='Comma separated render modes (stream = chunked writes, buffered = one string)')
+    args = parser.parse_args()
+
+    print(f"{'findings':>9} {'mode':<9} {'time':>8} {'peak RSS':>10} {'HTML size':>10}")
+    for count in (int(n) for n in args.findings.split(',')):
+        with tempfile.TemporaryDirectory() as workdir:
+            write_fixture(workdir, count)
+            for mode in args.modes.split(','):
+                result = run_render(workdir, mode)
+                size_mb = os.path.getsize(os.path.join(workdir, 'security-summary.html')) / 1024 / 1024
+                print(f"{count:>9} {mode:<9} {result['elapsed']:>7.1f}s {result['peak_rss_mb']:>7.0f} MB "
+                      f"{size_mb:>7.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Logging Pipeline Benchmark
+Logs at a fixed rate (10k lines/sec by default) through the classic
+synchronous ``StreamHandler`` and through the batching queue handler, into
+a fast sink and into a slow one that sleeps on every write. Reports the
+latency the logging call adds to the caller, the rate actually achieved,
+and how many lines were written or dropped.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.log_pipeline import BatchingQueueHandler, JSONFormatter
+
+
+class Sink:
+    """Discards output, optionally sleeping on every write like a slow disk or pipe"""
+
+    def __init__(self, write_delay):
+        self.write_delay = write_delay
+        self.lines = 0
+
+    def write(self, text):
+        if self.write_delay:
+            time.sleep(self.write_delay)
+        self.lines += text.count('\n')
+
+    def flush(self):
+        pass
+
+
+def build_handler(kind, sink):
+    if kind == 'sync':
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    else:
+        handler = BatchingQueueHandler(stream=sink)
+        handler.setFormatter(JSONFormatter())
+    return handler
+
+
+def percentile(ordered, percent):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def run(kind, write_delay, rate, duration):
+    sink = Sink(write_delay)
+    handler = build_handler(kind, sink)
+    logger = logging.getLogger(f"bench.{kind}.{write_delay}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+
+    total = int(rate * duration)
+    interval = 1 / rate
+    latencies = []
+    start = time.perf_counter()
+    for i in range(total):
+        # Pace the producer; a blocking handler makes it fall behind schedule
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        before = time.perf_counter()
+        logger.info("Served %s %s in %.2f ms", 'GET', '/api/info', 1.23, extra={'status': 200})
+        latencies.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - start
+
+    handler.flush()
+    handler.close()
+    logger.removeHandler(handler)
+    latencies.sort()
+    return {
+        'achieved': total / elapsed,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'max': latencies[-1],
+        'written': sink.lines,
+        'dropped': getattr(handler, 'dropped', 0)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark synchronous vs. batched logging')
+    parser.add_argument('--rate', type=float, default=10000, help='Log lines per second')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds per scenario')
+    parser.add_argument('--slow-write-ms', type=float, default=1.0,
+                        help='Sleep per write call of the slow sink')
+    args = parser.parse_args()
+
+    print(f"{'handler':<8} {'sink':<6} {'lines/s':>9} {'p50':>8} {'p99':>8} {'max':>9} "
+          f"{'written':>8} {'dropped':>8}")
+    for sink_name, delay in (('fast', 0.0), ('slow', args.slow_write_ms / 1000)):
+        for kind in ('sync', 'batched'):
+            result = run(kind, delay, args.rate, args.duration)
+            print(f"{kind:<8} {sink_name:<6} {result['achieved']:>9.0f} "
+                  f"{result['p50'] * 1e6:>6.1f}us {result['p99'] * 1e6:>6.1f}us "
+                  f"{result['max'] * 1e3:>7.2f}ms {result['written']:>8} {result['dropped']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+Measures the per-request cost of the Prometheus instrumentation.
+
+Two identical Flask apps differ by a few percent through the test client
+on a busy machine, which is as large as the budget itself. The gated number
+is therefore the instrumentation measured in isolation: the metrics
+middleware around a no-op WSGI app, minus the bare no-op app, relative to
+the real per-request cost of the uninstrumented app. The end-to-end A/B run
+(alternating rounds, GC paused, median of per-round ratios) is printed as a
+cross-check.
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from prometheus_client import CollectorRegistry
+
+from src.metrics import Metrics
+
+
+def build_app(instrumented):
+    bench_app = Flask('bench')
+    if instrumented:
+        Metrics(bench_app, registry=CollectorRegistry())
+
+    @bench_app.route('/api/secure-data')
+    def secure_data():
+        return jsonify({'user_id': 123, 'data': 'This is secure data'}), 200
+
+    return bench_app
+
+
+def per_request_seconds(client, iterations):
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            client.get('/api/secure-data')
+        return (time.perf_counter() - start) / iterations
+    finally:
+        gc.enable()
+
+
+def instrumentation_seconds(iterations):
+    """Per-request cost of the metrics middleware alone"""
+    metrics = Metrics(registry=CollectorRegistry())
+    request = SimpleNamespace(url_rule=SimpleNamespace(rule='/api/secure-data'))
+
+    def noop_app(environ, start_response):
+        start_response('200 OK', [])
+        return [b'']
+
+    def run(app):
+        environ = {'PATH_INFO': '/api/secure-data', 'REQUEST_METHOD': 'GET', 'werkzeug.request': request}
+        start_response = lambda *args: None
+        start = time.perf_counter()
+        for _ in range(iterations):
+            app(environ, start_response)
+        return (time.perf_counter() - start) / iterations
+
+    wrapped = metrics._instrument(noop_app)
+    run(wrapped)
+    return min(run(wrapped) for _ in range(5)) - min(run(noop_app) for _ in range(5))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Prometheus instrumentation overhead')
+    parser.add_argument('--iterations', type=int, default=500, help='Requests per round')
+    parser.add_argument('--rounds', type=int, default=41, help='Alternating rounds per variant')
+    parser.add_argument('--budget', type=float, default=5.0, help='Allowed overhead in percent')
+    args = parser.parse_args()
+
+    clients = {
+        'baseline': build_app(False).test_client(),
+        'instrumented': build_app(True).test_client()
+    }
+    samples = {name: [] for name in clients}
+
+    for client in clients.values():
+        per_request_seconds(client, 200)
+    order = list(clients.items())
+    for _ in range(args.rounds):
+        for name, client in order:
+            samples[name].append(per_request_seconds(client, args.iterations))
+        order.reverse()
+
+    baseline = statistics.median(samples['baseline'])
+    instrumented = statistics.median(samples['instrumented'])
+    overhead = statistics.median(
+        (with_metrics - without) / without * 100
+        for without, with_metrics in zip(samples['baseline'], samples['instrumented']))
+
+    cost = instrumentation_seconds(args.iterations * 100)
+    isolated = cost / baseline * 100
+
+    print(f"baseline:     {baseline * 1e6:8.1f} us/request")
+    print(f"instrumented: {instrumented * 1e6:8.1f} us/request (A/B overhead {overhead:.2f} %)")
+    print(f"middleware:   {cost * 1e6:8.1f} us/request")
+    print(f"overhead:     {isolated:8.2f} % (budget {args.budget:.1f} %)")
+
+    sys.exit(0 if isolated <= args.budget else 1)
+
+
+if __name__ == '__main__':
+    main()
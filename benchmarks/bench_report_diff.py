@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Report Diff Benchmark
+Times the single-pass streaming delta the report generator uses for two
+builds of generated findings that differ by a small churn: writing the
+baseline snapshot, loading it, and diffing the next build against it, plus
+the peak Python memory of that diff.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'security'))
+
+from findings import make_finding
+from report_diff import load_snapshot, stream_delta
+
+SEVERITIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
+
+def generate(start, count):
+    return (make_finding('trivy', f"CVE-2023-{n:06d}", package=f"pkg-{n % 997}@1.{n % 7}",
+                         location=f"layer-{n % 13}", severity=SEVERITIES[n % 4],
+                         title=f"Vulnerability {n}")
+            for n in range(start, start + count))
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed * 1000:9.1f} ms")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the build-to-build findings diff')
+    parser.add_argument('--findings', type=int, default=100_000, help='Findings per build')
+    parser.add_argument('--churn', type=int, default=1000, help='Findings fixed and introduced')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'security-findings.json')
+        timed('write snapshot', lambda: stream_delta(generate(0, args.findings), snapshot_path=path))
+        loaded, load_time = timed('load snapshot', lambda: load_snapshot(path))
+        current_findings = list(generate(args.churn, args.findings))
+        delta, diff_time = timed('stream delta', lambda: stream_delta(iter(current_findings), loaded))
+        current_path = os.path.join(directory, 'current.json')
+        _, stream_time = timed('stream delta + snapshot',
+                               lambda: stream_delta(generate(args.churn, args.findings), loaded, current_path))
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        tracemalloc.start()
+        stream_delta(generate(args.churn, args.findings), loaded, current_path)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    print(f"\n{args.findings} findings: {delta['new']['total']} new, {delta['fixed']['total']} fixed, "
+          f"snapshot {size_mb:.1f} MB")
+    print(f"load + diff: {(load_time + diff_time) * 1000:.0f} ms")
+    print(f"streaming delta from the reports: {stream_time * 1000:.0f} ms, "
+          f"peak {peak_mb:.1f} MB above the loaded baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Request Timing Overhead Benchmark
+Measures the per-request cost of the Server-Timing instrumentation the same
+way as ``bench_metrics_overhead.py``: the hooks are timed in isolation inside
+one request context and compared with the real per-request cost of an
+uninstrumented app. The end-to-end run is printed as a cross-check next to
+an A/A run between two identical uninstrumented apps, which shows how much
+of the end-to-end difference is noise.
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.request_timing import RequestTimer, _marks
+
+
+def build_app(instrumented):
+    bench_app = Flask('bench')
+    if instrumented:
+        RequestTimer(bench_app)
+
+    @bench_app.route('/api/secure-data')
+    def secure_data():
+        return {'user_id': 123, 'data': 'This is secure data'}, 200
+
+    return bench_app
+
+
+def per_request_seconds(client, iterations):
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            client.get('/api/secure-data')
+        return (time.perf_counter() - start) / iterations
+    finally:
+        gc.enable()
+
+
+def hook_seconds(iterations):
+    """Per-request cost of the timing middleware and hooks alone"""
+    bench_app = build_app(True)
+    timer = bench_app.extensions['request_timing']
+    dispatch = timer._time_dispatch(lambda: None)
+    finalize = timer._time_finalize(lambda rv, from_error_handler=False: rv)
+    response = bench_app.response_class(b'{}')
+
+    with bench_app.test_request_context('/api/secure-data'):
+        def timed():
+            _marks.set([time.perf_counter(), None])
+            dispatch()
+            finalize(response)
+
+        def bare():
+            (lambda: None)()
+            (lambda rv, from_error_handler=False: rv)(response)
+
+        def run(func):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            return (time.perf_counter() - start) / iterations
+
+        run(timed)
+        return min(run(timed) for _ in range(5)) - min(run(bare) for _ in range(5))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark request timing overhead')
+    parser.add_argument('--iterations', type=int, default=500, help='Requests per round')
+    parser.add_argument('--rounds', type=int, default=41, help='Alternating rounds per variant')
+    parser.add_argument('--budget', type=float, default=5.0, help='Allowed overhead in percent')
+    args = parser.parse_args()
+
+    clients = {
+        'baseline': build_app(False).test_client(),
+        'control': build_app(False).test_client(),
+        'instrumented': build_app(True).test_client()
+    }
+    samples = {name: [] for name in clients}
+
+    for client in clients.values():
+        per_request_seconds(client, 200)
+    order = list(clients.items())
+    for _ in range(args.rounds):
+        for name, client in order:
+            samples[name].append(per_request_seconds(client, args.iterations))
+        order.reverse()
+
+    baseline = statistics.median(samples['baseline'])
+    instrumented = statistics.median(samples['instrumented'])
+    overhead = statistics.median(
+        (with_timing - without) / without * 100
+        for without, with_timing in zip(samples['baseline'], samples['instrumented']))
+    noise = statistics.median(
+        (control - without) / without * 100
+        for without, control in zip(samples['baseline'], samples['control']))
+
+    cost = hook_seconds(args.iterations * 20)
+    isolated = cost / baseline * 100
+
+    print(f"baseline:     {baseline * 1e6:8.1f} us/request")
+    print(f"instrumented: {instrumented * 1e6:8.1f} us/request (A/B overhead {overhead:.2f} %, "
+          f"A/A noise {noise:.2f} %)")
+    print(f"hooks:        {cost * 1e6:8.1f} us/request")
+    print(f"overhead:     {isolated:8.2f} % (budget {args.budget:.1f} %)")
+
+    sys.exit(0 if isolated <= args.budget else 1)
+
+
+if __name__ == '__main__':
+    main()
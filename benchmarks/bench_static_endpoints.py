@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Static Endpoint Benchmark
+Compares requests/sec for ``/`` and ``/api/info`` with and without the
+response cache, using the Flask test client.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify
+
+from src.app import app, app_info, index
+
+
+def add_uncached_routes():
+    """Register the pre-cache implementation of each view for comparison"""
+    app.add_url_rule('/__bench/uncached/index', 'bench_uncached_index',
+                     lambda: (jsonify(index.__wrapped__()), 200))
+    app.add_url_rule('/__bench/uncached/info', 'bench_uncached_info',
+                     lambda: (jsonify(app_info.__wrapped__()), 200))
+
+
+def measure(client, path, iterations, headers=None):
+    """Return requests per second for ``iterations`` GETs of ``path``"""
+    for _ in range(min(iterations, 200)):
+        client.get(path, headers=headers)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        client.get(path, headers=headers)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cached static endpoints')
+    parser.add_argument('--iterations', type=int, default=5000, help='Requests per scenario')
+    args = parser.parse_args()
+
+    add_uncached_routes()
+    client = app.test_client()
+
+    scenarios = [
+        ('index', '/__bench/uncached/index', '/'),
+        ('info', '/__bench/uncached/info', '/api/info'),
+    ]
+
+    print(f"{'endpoint':<8} {'uncached':>12} {'cached':>12} {'304':>12} {'speedup':>8}")
+    for name, uncached_path, cached_path in scenarios:
+        etag = client.get(cached_path).headers['ETag']
+        uncached = measure(client, uncached_path, args.iterations)
+        cached = measure(client, cached_path, args.iterations)
+        not_modified = measure(client, cached_path, args.iterations,
+                               headers={'If-None-Match': etag})
+        print(f"{name:<8} {uncached:>10.0f}/s {cached:>10.0f}/s "
+              f"{not_modified:>10.0f}/s {cached / uncached:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Trivy Parsing Benchmark
+Generates a large Trivy-shaped report and compares wall time and peak RSS of
+the in-memory and streaming parsers. Each parser runs in its own process so
+peak RSS is measured independently.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEVERITIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'UNKNOWN']
+
+PARSE_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, {security_dir!r})
+import generate_security_report as report
+start = time.perf_counter()
+result = report.parse_trivy_report(stream={stream!r})
+elapsed = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'elapsed': elapsed, 'peak_rss_mb': peak_kb / 1024, 'summary': result['summary']}}))
+"""
+
+
+def write_fixture(path, size_mb):
+    """Write a Trivy report of roughly ``size_mb`` megabytes without holding it in memory"""
+    target_bytes = size_mb * 1024 * 1024
+    written = 0
+    index = 0
+    with open(path, 'w') as f:
+        f.write('{"SchemaVersion": 2, "ArtifactName": "bench:latest", "Results": [')
+        while written < target_bytes:
+            if index:
+                f.write(', ')
+            layer = []
+            for _ in range(1000):
+                layer.append(json.dumps({
+                    'VulnerabilityID': f"CVE-2023-{index:07d}",
+                    'PkgName': f"package-{index % 5000}",
+                    'InstalledVersion': '1.2.3-4',
+                    'FixedVersion': '1.2.4',
+                    'Severity': SEVERITIES[index % len(SEVERITIES)],
+                    'Title': 'Out-of-bounds write in example parser',
+                    'Description': 'A crafted input may cause memory corruption. ' * 6,
+                    'CVSS': {'nvd': {'V3Score': 7.5, 'V3Vector': 'CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:N/I:N/A:H'}},
+                    'References': [f"https://example.org/advisories/{index}"]
+                }))
+                index += 1
+            chunk = '{"Target": "layer-%d", "Vulnerabilities": [%s]}' % (index, ', '.join(layer))
+            f.write(chunk)
+            written += len(chunk)
+        f.write(']}')
+    return index
+
+
+def run_parser(workdir, stream):
+    script = PARSE_SCRIPT.format(security_dir=os.path.join(ROOT, 'security'), stream=stream)
+    output = subprocess.run([sys.executable, '-c', script], cwd=workdir, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Trivy report parsing modes')
+    parser.add_argument('--size-mb', type=int, default=2048, help='Approximate fixture size in MB')
+    parser.add_argument('--workdir', help='Directory for the fixture (default: temporary)')
+    parser.add_argument('--modes', default='never,always',
+                        help='Comma separated parse modes to run (never = in-memory, always = streaming)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        fixture = os.path.join(workdir, 'trivy-report.json')
+        start = time.perf_counter()
+        count = write_fixture(fixture, args.size_mb)
+        size_mb = os.path.getsize(fixture) / 1024 / 1024
+        print(f"fixture: {size_mb:.0f} MB, {count} vulnerabilities "
+              f"(generated in {time.perf_counter() - start:.1f}s)")
+
+        print(f"{'mode':<10} {'time':>9} {'peak RSS':>11} {'total':>10}")
+        for mode in args.modes.split(','):
+            try:
+                result = run_parser(workdir, mode)
+            except subprocess.CalledProcessError as e:
+                print(f"{mode:<10} failed (exit {e.returncode}, likely out of memory)")
+                continue
+            print(f"{mode:<10} {result['elapsed']:>8.1f}s {result['peak_rss_mb']:>8.0f} MB "
+                  f"{result['summary']['total']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Gunicorn Worker Class Benchmark
+Starts the app under gunicorn with the sync and the gevent worker class and
+drives each with 1000 concurrent keep-alive clients (a closed-loop
+LoadGenerator run). A few slow clients that trickle their request headers
+can be added to show how each worker class copes with them.
+"""
+
+import argparse
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'monitoring'))
+
+from load_generator import run_load_test
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(worker_class, port, workers):
+    # One local address drives all the load, so the per-client limit is off
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=worker_class, RATE_LIMIT_ENABLED='false')
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'src/gunicorn_conf.py',
+         '--bind', f"127.0.0.1:{port}", '--workers', str(workers), '--log-level', 'warning',
+         'src.app:app'],
+        cwd=ROOT, env=env)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return server
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+
+
+def open_slow_clients(port, count):
+    """Connections that send an incomplete request and then stall"""
+    clients = []
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n")
+        clients.append(sock)
+    return clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare gunicorn sync and gevent workers')
+    parser.add_argument('--worker-classes', default='sync,gevent', help='Comma separated worker classes')
+    parser.add_argument('--workers', type=int, default=4, help='Gunicorn worker processes')
+    parser.add_argument('--concurrency', type=int, default=1000, help='Concurrent keep-alive clients')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds of load per worker class')
+    parser.add_argument('--slow-clients', type=int, default=0,
+                        help='Clients that hold a connection with an unfinished request')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds')
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, min(hard, args.concurrency * 4)), hard))
+
+    print(f"{'worker':<8} {'requests':>9} {'req/s':>8} {'p50':>9} {'p99':>9} {'max':>9} {'errors':>8}")
+    for worker_class in args.worker_classes.split(','):
+        port = free_port()
+        server = start_server(worker_class, port, args.workers)
+        slow = open_slow_clients(port, args.slow_clients)
+        try:
+            report = run_load_test(f"http://127.0.0.1:{port}", concurrency=args.concurrency,
+                                   duration=args.duration, timeout=args.timeout,
+                                   endpoints={'/api/info': 1, '/api/secure-data?user_id=1': 1, '/health': 1})
+        finally:
+            for sock in slow:
+                sock.close()
+            server.terminate()
+            server.wait()
+
+        latency = report['latency']
+        p50, p99, worst = (f"{latency[name] * 1000:.0f}ms" if latency.get(name) is not None else '-'
+                           for name in ('p50', 'p99', 'max'))
+        print(f"{worker_class:<8} {report['requests']:>9} {report['throughput']:>8.0f} "
+              f"{p50:>9} {p99:>9} {worst:>9} {report['error_rate']:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Adaptive Request Scheduling
+Per-endpoint timeouts derived from observed latency, retries with
+exponential backoff and full jitter, and optional hedged requests.
+
+``AdaptiveSession`` wraps an aiohttp session and is used by the checks in
+place of it. Each endpoint's timeout is a multiple of its recent p99, so a
+stuck request is abandoned after a few typical round trips instead of the
+full ``--timeout``, and is retried while the run's budget allows. With
+hedging, a second copy of a request is sent once the first has been
+outstanding longer than the endpoint's p95, and whichever answers first
+wins.
+"""
+
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from http_pool import RequestTiming
+from quantile_sketch import QuantileSketch
+
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class RecentLatency:
+    """Latency of an endpoint's latest ``2 * generation`` requests or fewer.
+
+    Two sketches take turns: once the current one holds ``generation``
+    samples the older one is dropped, so quantiles follow changes in the
+    service and memory stays constant.
+    """
+
+    def __init__(self, generation=500):
+        self.generation = generation
+        self._previous = QuantileSketch()
+        self._current = QuantileSketch()
+
+    def add(self, seconds):
+        if self._current.count >= self.generation:
+            self._previous, self._current = self._current, QuantileSketch()
+        self._current.add(seconds)
+
+    @property
+    def count(self):
+        return self._previous.count + self._current.count
+
+    def percentile(self, percent):
+        return QuantileSketch().merge(self._previous).merge(self._current).percentile(percent)
+
+
+class AdaptivePolicy:
+    """Timeout, retry and hedging decisions per endpoint (URL path and query)"""
+
+    def __init__(self, max_timeout=30.0, min_timeout=0.25, timeout_factor=3.0, min_samples=5,
+                 retries=2, backoff=0.1, max_backoff=2.0, hedge=False, hedge_percentile=95,
+                 seed=None):
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.timeout_factor = timeout_factor
+        self.min_samples = min_samples
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.latency = {}
+        self._random = random.Random(seed)
+
+    def observe(self, endpoint, seconds):
+        self.latency.setdefault(endpoint, RecentLatency()).add(seconds)
+
+    def _percentile(self, endpoint, percent):
+        latency = self.latency.get(endpoint)
+        if latency is None or latency.count < self.min_samples:
+            return None
+        return latency.percentile(percent)
+
+    def timeout(self, endpoint):
+        """``timeout_factor`` times the endpoint's p99, within the configured
+        bounds; ``max_timeout`` until enough requests have been seen"""
+        p99 = self._percentile(endpoint, 99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_factor))
+
+    def hedge_delay(self, endpoint):
+        """Seconds to wait before hedging, or None when hedging is off or
+        the endpoint has too few samples"""
+        if not self.hedge:
+            return None
+        return self._percentile(endpoint, self.hedge_percentile)
+
+    def backoff_delay(self, attempt):
+        """Full jitter: uniform between 0 and the exponential cap, so
+        clients retrying together spread out"""
+        return self._random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class SchedulingStats:
+    """What retries and hedges cost and saved during one run"""
+
+    def __init__(self):
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.saved = 0.0
+
+    def to_dict(self, policy):
+        return {
+            'requests': self.requests,
+            'attempts': self.attempts,
+            'retries': self.retries,
+            'timeouts': self.timeouts,
+            'hedges': self.hedges,
+            'hedge_rate': self.hedges / self.requests * 100 if self.requests else 0,
+            'hedge_wins': self.hedge_wins,
+            'saved_latency': self.saved,
+            'avg_saved_latency': self.saved / self.hedge_wins if self.hedge_wins else None,
+            'timeouts_by_endpoint': {endpoint: policy.timeout(endpoint) for endpoint in sorted(policy.latency)}
+        }
+
+
+class _AdaptiveRequest:
+    """Async context manager returned by ``AdaptiveSession.get``"""
+
+    def __init__(self, owner, url, timeout, timing):
+        self._owner = owner
+        self._url = url
+        self._timeout = timeout
+        self._timing = timing
+        self._response = None
+
+    async def __aenter__(self):
+        self._response, timing = await self._owner._request(self._url, self._timeout)
+        if self._timing is not None:
+            # Report the phases of the attempt that produced the response
+            vars(self._timing).update(vars(timing))
+        return self._response
+
+    async def __aexit__(self, *exc_info):
+        self._response.release()
+
+
+class AdaptiveSession:
+    """Drop-in for ``aiohttp.ClientSession.get`` that applies an ``AdaptivePolicy``.
+
+    The caller's ``timeout`` bounds all attempts of a request together,
+    backoff included. A hedge that wins leaves the original request running
+    until it finishes or times out, which is how the latency it saved is
+    measured; ``drain`` waits for those before the session closes.
+    """
+
+    def __init__(self, session, policy):
+        self.session = session
+        self.policy = policy
+        self.stats = SchedulingStats()
+        self._losers = set()
+
+    def get(self, url, timeout=None, trace_request_ctx=None):
+        return _AdaptiveRequest(self, url, timeout, trace_request_ctx)
+
+    async def _send(self, url, endpoint, timeout):
+        timing = RequestTiming()
+        self.stats.attempts += 1
+        sent = time.perf_counter()
+        try:
+            # Not ``async with``: the body is read here and stays readable
+            # until the caller's context exits; reading to the end already
+            # returns the connection to the pool
+            response = await self.session.get(url, timeout=aiohttp.ClientTimeout(total=timeout),
+                                              trace_request_ctx=timing)
+            await response.read()
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        timing.end = time.perf_counter()
+        if response.status < 500:
+            self.policy.observe(endpoint, timing.end - sent)
+        return response, timing
+
+    def _track_loser(self, task, started, won_after):
+        """Credit a winning hedge with the time the original request took beyond it"""
+        def finished(task):
+            self._losers.discard(task)
+            if not task.cancelled():
+                task.exception()
+            self.stats.saved += max(0.0, time.perf_counter() - started - won_after)
+        self._losers.add(task)
+        task.add_done_callback(finished)
+
+    async def _attempt(self, url, endpoint, timeout):
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self._send(url, endpoint, timeout))
+        delay = self.policy.hedge_delay(endpoint)
+        if delay is None or delay >= timeout:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.stats.hedges += 1
+        hedge = asyncio.ensure_future(self._send(url, endpoint, timeout - delay))
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    continue
+                for other in pending:
+                    if task is hedge:
+                        self._track_loser(other, started, time.perf_counter() - started)
+                    else:
+                        other.cancel()
+                if task is hedge:
+                    self.stats.hedge_wins += 1
+                return task.result()
+        # Both copies failed; surface the original request's error
+        return primary.result()
+
+    async def _request(self, url, timeout):
+        parts = urlsplit(url)
+        endpoint = parts.path + (f"?{parts.query}" if parts.query else '')
+        budget = timeout.total if timeout is not None and timeout.total else self.policy.max_timeout
+        deadline = time.perf_counter() + budget
+        self.stats.requests += 1
+
+        for attempt in range(self.policy.retries + 1):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise asyncio.TimeoutError('Request budget exhausted')
+            try:
+                response, timing = await self._attempt(url, endpoint, min(self.policy.timeout(endpoint), remaining))
+                if response.status not in RETRY_STATUSES or attempt == self.policy.retries:
+                    return response, timing
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.policy.retries:
+                    raise
+            self.stats.retries += 1
+            await asyncio.sleep(min(self.policy.backoff_delay(attempt), max(0.0, deadline - time.perf_counter())))
+        raise asyncio.TimeoutError('Request budget exhausted')
+
+    async def drain(self, timeout):
+        """Wait up to ``timeout`` seconds for originals outrun by a hedge, then cancel them"""
+        if self._losers:
+            await asyncio.wait(set(self._losers), timeout=max(timeout, 0.001))
+            for task in list(self._losers):
+                task.cancel()
+            await asyncio.gather(*self._losers, return_exceptions=True)
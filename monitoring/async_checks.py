@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Async Health Check Engine
+Runs the health, API, security header and performance checks concurrently
+under one shared timeout budget and returns the same result schema as the
+blocking checks in health_check.py.
+"""
+
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from adaptive import AdaptivePolicy, AdaptiveSession
+from http_pool import DEFAULT_KEEPALIVE, DEFAULT_POOL_SIZE, create_session, measure_connection_setup, timed_get
+from quantile_sketch import QuantileSketch
+
+API_ENDPOINTS = [
+    '/api/info',
+    '/api/secure-data?user_id=123'
+]
+
+SECURITY_HEADERS = [
+    'X-Content-Type-Options',
+    'X-Frame-Options',
+    'X-XSS-Protection',
+    'Strict-Transport-Security',
+    'Content-Security-Policy',
+    'Referrer-Policy'
+]
+
+
+class Deadline:
+    """Shared time budget for every request issued during one run"""
+
+    def __init__(self, budget):
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def request_timeout(self, timeout):
+        """Per-request timeout capped by what is left of the budget"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise asyncio.TimeoutError('Health check budget exhausted')
+        return aiohttp.ClientTimeout(total=min(timeout, remaining))
+
+
+async def fetch(session, url, timeout, deadline):
+    """GET ``url`` and return (status, headers, body, seconds to headers, timing)"""
+    response, body, timing = await timed_get(session, url, deadline.request_timeout(timeout))
+    elapsed = timing.headers_received - timing.start
+    return response.status, response.headers, body, elapsed, timing.to_dict()
+
+
+def describe_error(error):
+    """Human readable message for client and timeout errors"""
+    if isinstance(error, asyncio.TimeoutError):
+        return str(error) or 'Request timed out'
+    return str(error) or error.__class__.__name__
+
+
+async def check_application_health(session, base_url, timeout, deadline):
+    """Check application health endpoint"""
+    try:
+        status, _, body, elapsed, timing = await fetch(session, f"{base_url}/health", timeout, deadline)
+        if status == 200:
+            return {
+                'status': 'healthy',
+                'response_time': elapsed,
+                'timing': timing,
+                'data': json.loads(body)
+            }
+        return {
+            'status': 'unhealthy',
+            'error': f"HTTP {status}",
+            'response_time': elapsed,
+            'timing': timing
+        }
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        return {
+            'status': 'error',
+            'error': describe_error(e),
+            'response_time': None
+        }
+
+
+async def check_endpoint(session, base_url, endpoint, timeout, deadline):
+    """Check a single API endpoint"""
+    try:
+        status, _, body, elapsed, timing = await fetch(session, f"{base_url}{endpoint}", timeout, deadline)
+        return {
+            'status_code': status,
+            'response_time': elapsed,
+            'timing': timing,
+            'content_length': len(body)
+        }
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return {
+            'error': describe_error(e),
+            'status_code': None,
+            'response_time': None
+        }
+
+
+async def check_api_endpoints(session, base_url, timeout, deadline):
+    """Check critical API endpoints concurrently"""
+    results = await asyncio.gather(*[
+        check_endpoint(session, base_url, endpoint, timeout, deadline)
+        for endpoint in API_ENDPOINTS
+    ])
+    return dict(zip(API_ENDPOINTS, results))
+
+
+async def check_security_headers(session, base_url, timeout, deadline):
+    """Check for security headers"""
+    try:
+        _, headers, _, _, _ = await fetch(session, base_url, timeout, deadline)
+        security_headers = {name: headers.get(name) for name in SECURITY_HEADERS}
+        missing_headers = [k for k, v in security_headers.items() if v is None]
+
+        return {
+            'headers': security_headers,
+            'missing_headers': missing_headers,
+            'security_score': (6 - len(missing_headers)) / 6 * 100
+        }
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return {
+            'error': describe_error(e),
+            'security_score': 0
+        }
+
+
+async def performance_test(session, base_url, timeout, deadline, iterations=10):
+    """Perform basic performance testing.
+
+    Requests stay sequential so each sample measures an otherwise idle
+    connection, matching the blocking implementation. With keep-alive only
+    the first sample pays for connection setup; ``avg_ttfb`` excludes it
+    entirely. Samples go into a quantile sketch rather than a list, so
+    memory stays constant however many iterations run.
+    """
+    sketch = QuantileSketch()
+    ttfb_total = 0.0
+    reused = 0
+    errors = 0
+
+    for _ in range(iterations):
+        try:
+            start_time = time.perf_counter()
+            status, _, _, _, timing = await fetch(session, f"{base_url}/health", timeout, deadline)
+            end_time = time.perf_counter()
+
+            if status == 200:
+                sketch.add(end_time - start_time)
+                ttfb_total += timing['ttfb']
+                reused += timing['reused_connection']
+            else:
+                errors += 1
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            errors += 1
+
+    result = performance_summary(sketch, iterations, errors)
+    result.update({
+        'avg_ttfb': ttfb_total / sketch.count if sketch.count else None,
+        'reused_connections': reused
+    })
+    return result
+
+
+def performance_summary(sketch, iterations, errors):
+    """Performance section of the report from the successful samples' sketch"""
+    return {
+        'iterations': iterations,
+        'errors': errors,
+        'success_rate': (iterations - errors) / iterations * 100 if sketch.count else 0,
+        'avg_response_time': sketch.mean,
+        'min_response_time': sketch.min,
+        'max_response_time': sketch.max,
+        'latency': sketch.summary(),
+        'latency_sketch': sketch.to_dict()
+    }
+
+
+async def run_health_checks(base_url, timeout=30, budget=None,
+                            pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, adaptive=None):
+    """Run every check concurrently and return results keyed like the report
+
+    ``adaptive`` (keyword arguments for ``adaptive.AdaptivePolicy``) turns on
+    per-endpoint timeouts, retries and optional hedging; its statistics are
+    returned under ``scheduling``.
+    """
+    deadline = Deadline(budget if budget is not None else timeout)
+
+    async with create_session(pool_size=pool_size, keepalive=keepalive) as session:
+        if adaptive is not None:
+            policy = AdaptivePolicy(**dict({'max_timeout': timeout}, **adaptive))
+            session = AdaptiveSession(session, policy)
+        app_health, api_checks, security_headers, performance, connection_setup = await asyncio.gather(
+            check_application_health(session, base_url, timeout, deadline),
+            check_api_endpoints(session, base_url, timeout, deadline),
+            check_security_headers(session, base_url, timeout, deadline),
+            performance_test(session, base_url, timeout, deadline),
+            measure_connection_setup(base_url, timeout=max(deadline.remaining(), 0.001))
+        )
+        if adaptive is not None:
+            await session.drain(deadline.remaining())
+
+    results = {
+        'application_health': app_health,
+        'api_endpoints': api_checks,
+        'security_headers': security_headers,
+        'performance': performance,
+        'connection_setup': connection_setup
+    }
+    if adaptive is not None:
+        results['scheduling'] = session.stats.to_dict(policy)
+    return results
+
+
+def collect_health_checks(base_url, timeout=30, budget=None,
+                          pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, adaptive=None):
+    """Blocking entry point for callers outside an event loop"""
+    return asyncio.run(run_health_checks(base_url, timeout=timeout, budget=budget,
+                                         pool_size=pool_size, keepalive=keepalive, adaptive=adaptive))
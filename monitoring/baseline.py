@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Latency Baselines
+Keeps per-endpoint latency sketches of past health checks in a local SQLite
+database, keyed by environment and application version, and compares a new
+run against the runs of an earlier version.
+
+A regression needs both statistical significance and a meaningful size:
+either a one-sided Mann-Whitney U test finds the new latencies larger and
+the median grew by at least ``min_slowdown``, or the bootstrap confidence
+interval of the p90 ratio lies entirely above ``1 + min_slowdown``. The
+first catches a shift of the whole distribution, the second a tail that got
+slower while the median did not. Either way the quantile must also have
+grown by ``min_increase`` seconds, so a 1 ms endpoint taking 2 ms is not
+a failed deploy.
+
+    python monitoring/baseline.py versions --environment production
+    python monitoring/baseline.py compare health-report-production-*.json --app-version 42
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from itertools import accumulate
+
+import aiohttp
+
+from daemon import PROBE_ENDPOINTS
+from http_pool import DEFAULT_KEEPALIVE, DEFAULT_POOL_SIZE, create_session, timed_get
+from quantile_sketch import MIN_VALUE, QuantileSketch
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    environment TEXT NOT NULL,
+    version TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_version ON runs (environment, version, id);
+CREATE TABLE IF NOT EXISTS run_latency (
+    run_id INTEGER NOT NULL,
+    endpoint TEXT NOT NULL,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (run_id, endpoint)
+) WITHOUT ROWID;
+"""
+
+DEFAULT_SAMPLES = 30
+DEFAULT_RUNS = 20
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_SLOWDOWN = 0.1
+DEFAULT_MIN_INCREASE = 0.005
+DEFAULT_BOOTSTRAP = 1000
+MIN_SAMPLES = 5
+
+
+class BaselineStore:
+    """SQLite-backed latency sketches per environment, version and run"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        self.db.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_run(self, environment, version, sketches, recorded_at=None):
+        """Store one run's ``{endpoint: QuantileSketch}``; returns the run id"""
+        recorded_at = recorded_at or datetime.utcnow().isoformat()
+        with self.db:
+            run_id = self.db.execute('INSERT INTO runs (environment, version, recorded_at) VALUES (?, ?, ?)',
+                                     (environment, version, recorded_at)).lastrowid
+            self.db.executemany('INSERT INTO run_latency (run_id, endpoint, sketch) VALUES (?, ?, ?)',
+                                [(run_id, endpoint, json.dumps(sketch.to_dict()))
+                                 for endpoint, sketch in sketches.items()])
+        return run_id
+
+    def versions(self, environment):
+        """Recorded versions of an environment, most recently run first"""
+        rows = self.db.execute(
+            'SELECT version, COUNT(*) AS runs, MIN(recorded_at) AS first_recorded, '
+            'MAX(recorded_at) AS last_recorded FROM runs WHERE environment = ? '
+            'GROUP BY version ORDER BY MAX(id) DESC', (environment,))
+        return [dict(row) for row in rows]
+
+    def latest_version(self, environment, exclude=None):
+        """The most recently recorded version other than ``exclude``"""
+        for row in self.versions(environment):
+            if row['version'] != exclude:
+                return row['version']
+        return None
+
+    def baseline(self, environment, version, runs=DEFAULT_RUNS):
+        """Merged sketches of the last ``runs`` runs of a version.
+
+        Returns ``({endpoint: QuantileSketch}, number of runs merged)``.
+        """
+        run_ids = [row['id'] for row in self.db.execute(
+            'SELECT id FROM runs WHERE environment = ? AND version = ? ORDER BY id DESC LIMIT ?',
+            (environment, version, runs))]
+        sketches = {}
+        if run_ids:
+            rows = self.db.execute(
+                f"SELECT endpoint, sketch FROM run_latency WHERE run_id IN ({','.join('?' * len(run_ids))})",
+                run_ids)
+            for row in rows:
+                sketch = QuantileSketch.from_dict(json.loads(row['sketch']))
+                sketches.setdefault(row['endpoint'], QuantileSketch(sketch.relative_accuracy)).merge(sketch)
+        return sketches, len(run_ids)
+
+
+def mann_whitney(baseline, current):
+    """One-sided p-value that ``current`` tends to be slower than ``baseline``.
+
+    U counts the (baseline, current) pairs in which the current sample is
+    larger, ties counting half. Both sketches report bin midpoints, so
+    samples in the same bin tie; the normal approximation is corrected for
+    those ties and for continuity.
+    """
+    if baseline.relative_accuracy != current.relative_accuracy:
+        raise ValueError('Cannot compare sketches with different accuracy')
+    counts = {}
+    for column, sketch in enumerate((baseline, current)):
+        for value, count in sketch.histogram():
+            counts.setdefault(value, [0, 0])[column] += count
+
+    n1, n2 = baseline.count, current.count
+    u = 0.0
+    below = 0
+    ties = 0
+    for value in sorted(counts):
+        a, b = counts[value]
+        u += b * (below + a / 2)
+        below += a
+        ties += (a + b) ** 3 - (a + b)
+
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _binomial_tail(n, p, r):
+    """P(Binomial(n, p) >= r)"""
+    if p >= 1:
+        return 1.0
+    log_p, log_q = math.log(p), math.log1p(-p)
+    log_n = math.lgamma(n + 1)
+    return min(1.0, sum(
+        math.exp(log_n - math.lgamma(k + 1) - math.lgamma(n - k + 1) + k * log_p + (n - k) * log_q)
+        for k in range(r, n + 1)))
+
+
+def _resampler(sketch, percent, rng):
+    """Draws the ``percent`` quantile of a bootstrap resample of ``sketch``.
+
+    Rather than resampling ``count`` values and sorting them, this samples
+    the quantile's exact bootstrap distribution: the r-th smallest of ``n``
+    draws is at most the j-th value when at least r draws land at or below
+    it, a binomial tail. Each draw is then a single bisection.
+    """
+    values, counts = zip(*sketch.histogram())
+    size = sketch.count
+    rank = max(1, math.ceil(percent / 100 * size))
+    cdf = [_binomial_tail(size, seen / size, rank) for seen in accumulate(counts)]
+
+    def draw():
+        return values[min(bisect.bisect_left(cdf, rng.random()), len(values) - 1)]
+    return draw
+
+
+def bootstrap_ratio_interval(baseline, current, percent, confidence=0.98,
+                             iterations=DEFAULT_BOOTSTRAP, seed=None):
+    """Percentile-bootstrap interval of ``current / baseline`` at ``percent``"""
+    rng = random.Random(seed)
+    draw_baseline = _resampler(baseline, percent, rng)
+    draw_current = _resampler(current, percent, rng)
+    ratios = sorted(draw_current() / max(draw_baseline(), MIN_VALUE) for _ in range(iterations))
+    tail = (1 - confidence) / 2
+    return ratios[int(tail * iterations)], ratios[math.ceil((1 - tail) * iterations) - 1]
+
+
+def _quantiles(sketch):
+    return {f"p{p}": sketch.percentile(p) for p in (50, 90, 99)}
+
+
+def compare_endpoint(baseline, current, alpha=DEFAULT_ALPHA, min_slowdown=DEFAULT_MIN_SLOWDOWN,
+                     min_increase=DEFAULT_MIN_INCREASE, iterations=DEFAULT_BOOTSTRAP, seed=None):
+    """Compare one endpoint's latency sketches.
+
+    ``status`` is regressed, improved, unchanged or insufficient data (fewer
+    than ``MIN_SAMPLES`` on either side). The bootstrap interval is two-sided
+    at ``1 - 2 * alpha``, so its lower bound is a one-sided bound at ``alpha``.
+    """
+    result = {
+        'baseline_samples': baseline.count,
+        'current_samples': current.count,
+        'baseline': _quantiles(baseline),
+        'current': _quantiles(current),
+        'p50_ratio': None,
+        'p90_ratio_interval': None,
+        'p_value': None,
+        'status': 'insufficient data'
+    }
+    if baseline.count < MIN_SAMPLES or current.count < MIN_SAMPLES:
+        return result
+
+    slower = mann_whitney(baseline, current)
+    faster = mann_whitney(current, baseline)
+    p50_ratio = current.percentile(50) / max(baseline.percentile(50), MIN_VALUE)
+    p50_increase = current.percentile(50) - baseline.percentile(50)
+    p90_increase = current.percentile(90) - baseline.percentile(90)
+    low, high = bootstrap_ratio_interval(baseline, current, 90, confidence=1 - 2 * alpha,
+                                         iterations=iterations, seed=seed)
+    threshold = 1 + min_slowdown
+
+    if ((slower < alpha and p50_ratio >= threshold and p50_increase >= min_increase)
+            or (low >= threshold and p90_increase >= min_increase)):
+        status = 'regressed'
+    elif faster < alpha and p50_ratio <= 1 / threshold and -p50_increase >= min_increase:
+        status = 'improved'
+    else:
+        status = 'unchanged'
+    result.update({'p50_ratio': p50_ratio, 'p90_ratio_interval': [low, high],
+                   'p_value': slower, 'status': status})
+    return result
+
+
+def compare_latency(baseline, current, **options):
+    """``compare_endpoint`` for every endpoint of the current run"""
+    return {
+        endpoint: compare_endpoint(baseline.get(endpoint, QuantileSketch()), sketch, **options)
+        for endpoint, sketch in current.items()
+    }
+
+
+async def sample_endpoints(base_url, endpoints=None, samples=DEFAULT_SAMPLES, timeout=30,
+                           pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE):
+    """Time ``samples`` sequential requests to each endpoint.
+
+    Endpoints are sampled concurrently, each behind one untimed warm-up
+    request so that connection setup does not land in the distribution.
+    Only 2xx and 3xx responses are recorded.
+    """
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def sample(session, endpoint):
+        sketch = QuantileSketch()
+        errors = 0
+        for attempt in range(samples + 1):
+            try:
+                start = time.perf_counter()
+                response, _, _ = await timed_get(session, f"{base_url}{endpoint}", client_timeout)
+                elapsed = time.perf_counter() - start
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt:
+                    errors += 1
+                continue
+            if attempt == 0:
+                continue
+            if response.status < 400:
+                sketch.add(elapsed)
+            else:
+                errors += 1
+        return {
+            'errors': errors,
+            'latency': sketch.summary(),
+            'latency_sketch': sketch.to_dict()
+        }
+
+    endpoints = list(endpoints or PROBE_ENDPOINTS)
+    async with create_session(pool_size=pool_size, keepalive=keepalive) as session:
+        results = await asyncio.gather(*[sample(session, endpoint) for endpoint in endpoints])
+    return {'samples': samples, 'endpoints': dict(zip(endpoints, results))}
+
+
+def collect_endpoint_latency(base_url, **options):
+    """Blocking entry point for ``sample_endpoints``"""
+    return asyncio.run(sample_endpoints(base_url, **options))
+
+
+def report_endpoint_sketches(report):
+    """``{endpoint: QuantileSketch}`` from a report's ``endpoint_latency``"""
+    return {
+        endpoint: QuantileSketch.from_dict(result['latency_sketch'])
+        for endpoint, result in report['endpoint_latency']['endpoints'].items()
+    }
+
+
+def check_latency_regression(report, store_path, version, baseline_version=None, runs=DEFAULT_RUNS,
+                             alpha=DEFAULT_ALPHA, min_slowdown=DEFAULT_MIN_SLOWDOWN,
+                             min_increase=DEFAULT_MIN_INCREASE, record=True, seed=None):
+    """Compare a report's ``endpoint_latency`` with the stored baseline.
+
+    The baseline is ``baseline_version``, or else the most recently recorded
+    other version of the report's environment. Unless a regression is found
+    the run is then recorded under ``version``, so a slow build never
+    becomes the reference for the next one.
+    """
+    environment = report['environment']
+    current = report_endpoint_sketches(report)
+
+    with BaselineStore(store_path) as store:
+        against = baseline_version or store.latest_version(environment, exclude=version)
+        baseline, baseline_runs = store.baseline(environment, against, runs) if against else ({}, 0)
+        endpoints = compare_latency(baseline, current, alpha=alpha, min_slowdown=min_slowdown,
+                                    min_increase=min_increase, seed=seed)
+        regressions = [endpoint for endpoint, result in endpoints.items() if result['status'] == 'regressed']
+        recorded = record and not regressions
+        if recorded:
+            store.record_run(environment, version, current)
+
+    return {
+        'version': version,
+        'baseline_version': against,
+        'baseline_runs': baseline_runs,
+        'alpha': alpha,
+        'min_slowdown': min_slowdown,
+        'min_increase': min_increase,
+        'endpoints': endpoints,
+        'regressions': regressions,
+        'recorded': recorded
+    }
+
+
+def regression_issues(comparison):
+    """Issue strings for every regressed endpoint"""
+    issues = []
+    for endpoint in comparison['regressions']:
+        result = comparison['endpoints'][endpoint]
+        low, high = result['p90_ratio_interval']
+        issues.append(f"Latency regression on {endpoint} vs version {comparison['baseline_version']}: "
+                      f"p50 {result['p50_ratio']:.2f}x (p={result['p_value']:.2g}), "
+                      f"p90 {low:.2f}x-{high:.2f}x")
+    return issues
+
+
+def print_comparison(comparison):
+    """Per-endpoint summary of a ``check_latency_regression`` result"""
+    if comparison['baseline_version'] is None:
+        print(f"📏 No baseline recorded yet for this environment; version {comparison['version']} "
+              f"{'recorded' if comparison['recorded'] else 'not recorded'}")
+        return
+    print(f"📏 Latency vs version {comparison['baseline_version']} "
+          f"({comparison['baseline_runs']} runs):")
+    icons = {'regressed': '❌', 'improved': '🚀', 'unchanged': '✅', 'insufficient data': '❔'}
+    for endpoint, result in comparison['endpoints'].items():
+        line = f"  {icons[result['status']]} {endpoint}: {result['status']}"
+        if result['p50_ratio'] is not None:
+            low, high = result['p90_ratio_interval']
+            line += (f", p50 {result['baseline']['p50']:.3f}s -> {result['current']['p50']:.3f}s "
+                     f"({result['p50_ratio']:.2f}x, p={result['p_value']:.2g}), "
+                     f"p90 ratio {low:.2f}x-{high:.2f}x")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Health check latency baselines')
+    parser.add_argument('--db', default='monitoring-history/baselines.db', help='Baseline database path')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    versions = commands.add_parser('versions', help='List recorded versions, most recent first')
+    versions.add_argument('--environment', required=True, choices=['staging', 'production'])
+
+    for name, description in (('record', 'Record a saved report as a baseline run'),
+                              ('compare', 'Compare a saved report with the baseline')):
+        command = commands.add_parser(name, help=description)
+        command.add_argument('report', help='health-report-*.json written with a baseline database')
+        command.add_argument('--app-version', required=True, help='Version the report was taken of')
+    compare = commands.choices['compare']
+    compare.add_argument('--baseline-version', help='Version to compare with (default: the latest other)')
+    compare.add_argument('--baseline-runs', type=int, default=DEFAULT_RUNS,
+                         help='Most recent runs of the baseline version to merge')
+    compare.add_argument('--alpha', type=float, default=DEFAULT_ALPHA, help='Significance level')
+    compare.add_argument('--min-slowdown', type=float, default=DEFAULT_MIN_SLOWDOWN,
+                         help='Smallest relative slowdown reported as a regression')
+    compare.add_argument('--min-increase', type=float, default=DEFAULT_MIN_INCREASE,
+                         help='Smallest slowdown in seconds reported as a regression')
+    compare.add_argument('--record', action='store_true', help='Record the report when it does not regress')
+    args = parser.parse_args()
+
+    if args.command == 'versions':
+        with BaselineStore(args.db) as store:
+            for row in store.versions(args.environment):
+                print(f"{row['version']}: {row['runs']} runs, {row['first_recorded']} - {row['last_recorded']}")
+        return
+
+    with open(args.report) as f:
+        report = json.load(f)
+    if 'endpoint_latency' not in report:
+        print(f"❌ {args.report} has no endpoint latency samples")
+        sys.exit(2)
+
+    if args.command == 'record':
+        with BaselineStore(args.db) as store:
+            store.record_run(report['environment'], args.app_version, report_endpoint_sketches(report),
+                             recorded_at=report.get('timestamp'))
+        print(f"🗄️ Recorded {args.report} as version {args.app_version}")
+        return
+
+    comparison = check_latency_regression(report, args.db, args.app_version,
+                                          baseline_version=args.baseline_version, runs=args.baseline_runs,
+                                          alpha=args.alpha, min_slowdown=args.min_slowdown,
+                                          min_increase=args.min_increase, record=args.record)
+    print_comparison(comparison)
+    for issue in regression_issues(comparison):
+        print(f"  - {issue}")
+    sys.exit(1 if comparison['regressions'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Health Monitoring Daemon
+Probes the application on an interval with jitter and keeps rolling
+aggregates (success rate, average and latency percentiles) over sliding
+time windows. The aggregates live in fixed-size ring buffers, so memory
+stays flat however long the daemon runs, and are served in Prometheus
+format at ``/metrics`` and as JSON at ``/status`` on the daemon's own port.
+"""
+
+import asyncio
+import random
+import time
+
+import aiohttp
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from adaptive import AdaptivePolicy, AdaptiveSession
+from http_pool import DEFAULT_KEEPALIVE, DEFAULT_POOL_SIZE, create_session, timed_get
+from quantile_sketch import QuantileSketch
+
+PROBE_ENDPOINTS = [
+    '/health',
+    '/api/info',
+    '/api/secure-data?user_id=123'
+]
+
+# Window name -> seconds; every window is served from the same ring of slots
+DEFAULT_WINDOWS = {'1m': 60, '5m': 300, '15m': 900}
+DEFAULT_SLOT_SECONDS = 5
+
+
+class Slot:
+    """Requests, errors and latencies recorded during one slot of time"""
+
+    __slots__ = ('epoch', 'requests', 'errors', 'latency')
+
+    def __init__(self):
+        self.reset(None)
+
+    def reset(self, epoch):
+        self.epoch = epoch
+        self.requests = 0
+        self.errors = 0
+        self.latency = QuantileSketch()
+
+
+class RollingWindows:
+    """Sliding-window aggregates backed by one ring buffer.
+
+    The ring holds enough ``slot_seconds`` slots for the longest window; a
+    slot is cleared when the ring wraps around to it, so each window is the
+    merge of its most recent slots and nothing older is ever kept.
+    """
+
+    def __init__(self, windows=None, slot_seconds=DEFAULT_SLOT_SECONDS):
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.slot_seconds = slot_seconds
+        size = max(int(-(-seconds // slot_seconds)) for seconds in self.windows.values())
+        self._ring = [Slot() for _ in range(size)]
+
+    def _slot(self, now):
+        epoch = int(now // self.slot_seconds)
+        slot = self._ring[epoch % len(self._ring)]
+        if slot.epoch != epoch:
+            slot.reset(epoch)
+        return slot
+
+    def record(self, now, seconds=None):
+        """Count one probe; ``seconds=None`` records a failed probe"""
+        slot = self._slot(now)
+        slot.requests += 1
+        if seconds is None:
+            slot.errors += 1
+        else:
+            slot.latency.add(seconds)
+
+    def aggregate(self, window, now):
+        """Success rate and latency over the last ``window`` (a name from ``windows``)"""
+        current = int(now // self.slot_seconds)
+        oldest = current - int(-(-self.windows[window] // self.slot_seconds)) + 1
+        requests = errors = 0
+        latency = QuantileSketch()
+        for slot in self._ring:
+            if slot.epoch is not None and oldest <= slot.epoch <= current:
+                requests += slot.requests
+                errors += slot.errors
+                latency.merge(slot.latency)
+        return {
+            'requests': requests,
+            'errors': errors,
+            'success_rate': (requests - errors) / requests * 100 if requests else None,
+            'avg_response_time': latency.mean,
+            'latency': latency.summary()
+        }
+
+
+class HealthMonitor:
+    """Probes every endpoint once per interval and evaluates the windows.
+
+    ``assess(performance)`` returns issue strings for a dict with
+    ``success_rate`` and ``avg_response_time``, the same fields the one-shot
+    performance test reports. ``adaptive`` (keyword arguments for
+    ``adaptive.AdaptivePolicy``) schedules the probes adaptively; its policy
+    keeps learning for as long as the daemon runs.
+    """
+
+    def __init__(self, base_url, endpoints=None, interval=5.0, jitter=0.2, timeout=5.0,
+                 windows=None, slot_seconds=DEFAULT_SLOT_SECONDS, assess=None,
+                 pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, seed=None, adaptive=None):
+        self.base_url = base_url
+        self.endpoints = list(endpoints or PROBE_ENDPOINTS)
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.assess = assess or (lambda performance: [])
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.windows = {endpoint: RollingWindows(windows, slot_seconds) for endpoint in self.endpoints}
+        self.overall = RollingWindows(windows, slot_seconds)
+        self.cycles = 0
+        self.policy = AdaptivePolicy(**dict({'max_timeout': timeout}, **adaptive)) if adaptive is not None else None
+        self.scheduling = None
+        self._random = random.Random(seed)
+        self._clock = time.monotonic
+
+    async def _probe(self, session, endpoint):
+        try:
+            response, _, timing = await timed_get(session, f"{self.base_url}{endpoint}", self.timeout)
+            seconds = timing.end - timing.start if response.status == 200 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            seconds = None
+        now = self._clock()
+        self.windows[endpoint].record(now, seconds)
+        self.overall.record(now, seconds)
+
+    async def probe_once(self, session):
+        """Probe every endpoint concurrently and record the outcomes"""
+        await asyncio.gather(*[self._probe(session, endpoint) for endpoint in self.endpoints])
+        self.cycles += 1
+
+    def next_delay(self):
+        """The interval scaled by a random factor in ``1 +/- jitter``, so
+        several daemons do not probe in lockstep"""
+        return self.interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    async def run(self, stop=None, cycles=None, on_cycle=None):
+        """Probe until ``stop`` is set or ``cycles`` probes have run, calling
+        ``on_cycle(monitor)`` after each round"""
+        stop = stop or asyncio.Event()
+        async with create_session(pool_size=self.pool_size, keepalive=self.keepalive) as session:
+            if self.policy is not None:
+                session = self.scheduling = AdaptiveSession(session, self.policy)
+            while not stop.is_set():
+                started = self._clock()
+                await self.probe_once(session)
+                if on_cycle is not None:
+                    on_cycle(self)
+                if cycles is not None and self.cycles >= cycles:
+                    break
+                delay = max(0.0, self.next_delay() - (self._clock() - started))
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            if self.scheduling is not None:
+                await self.scheduling.drain(0)
+
+    def snapshot(self):
+        """Every window's aggregates per endpoint, overall, and threshold issues"""
+        now = self._clock()
+        snapshot = {}
+        for window in self.overall.windows:
+            overall = self.overall.aggregate(window, now)
+            issues = self.assess(overall) if overall['requests'] else []
+            snapshot[window] = {
+                'overall': overall,
+                'endpoints': {endpoint: windows.aggregate(window, now)
+                              for endpoint, windows in self.windows.items()},
+                'issues': issues,
+                'status': ('healthy' if not issues else 'degraded') if overall['requests'] else 'unknown'
+            }
+        return snapshot
+
+    def collect(self):
+        """Prometheus collector interface: one gauge family per statistic"""
+        success = GaugeMetricFamily('health_check_success_ratio',
+                                    'Share of successful probes in the window',
+                                    labels=['endpoint', 'window'])
+        average = GaugeMetricFamily('health_check_latency_average_seconds',
+                                    'Average latency of successful probes in the window',
+                                    labels=['endpoint', 'window'])
+        quantiles = GaugeMetricFamily('health_check_latency_seconds',
+                                      'Latency quantiles of successful probes in the window',
+                                      labels=['endpoint', 'window', 'quantile'])
+        probes = GaugeMetricFamily('health_check_window_probes',
+                                   'Probes recorded in the window', labels=['endpoint', 'window'])
+        healthy = GaugeMetricFamily('health_check_window_healthy',
+                                    '1 when the window meets every threshold, 0 otherwise',
+                                    labels=['window'])
+
+        for window, result in self.snapshot().items():
+            series = dict(result['endpoints'], all=result['overall'])
+            for endpoint, stats in series.items():
+                labels = [endpoint, window]
+                probes.add_metric(labels, stats['requests'])
+                if stats['success_rate'] is not None:
+                    success.add_metric(labels, stats['success_rate'] / 100)
+                if stats['avg_response_time'] is not None:
+                    average.add_metric(labels, stats['avg_response_time'])
+                for name in ('p50', 'p90', 'p99'):
+                    value = stats['latency'][name]
+                    if value is not None:
+                        quantiles.add_metric(labels + [str(int(name[1:]) / 100)], value)
+            if result['status'] != 'unknown':
+                healthy.add_metric([window], 1 if result['status'] == 'healthy' else 0)
+
+        return [success, average, quantiles, probes, healthy]
+
+
+async def start_metrics_server(monitor, host='0.0.0.0', port=9105):
+    """Serve ``/metrics`` and ``/status`` for ``monitor``; returns the runner
+    and the bound port"""
+    registry = CollectorRegistry(auto_describe=False)
+    registry.register(monitor)
+
+    async def metrics(request):
+        return web.Response(body=generate_latest(registry), headers={'Content-Type': CONTENT_TYPE_LATEST})
+
+    async def status(request):
+        status = {'base_url': monitor.base_url, 'cycles': monitor.cycles, 'windows': monitor.snapshot()}
+        if monitor.scheduling is not None:
+            status['scheduling'] = monitor.scheduling.stats.to_dict(monitor.policy)
+        return web.json_response(status)
+
+    app = web.Application()
+    app.router.add_get('/metrics', metrics)
+    app.router.add_get('/status', status)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    return runner, runner.addresses[0][1]
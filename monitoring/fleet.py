@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Fleet Health Checks
+Runs the async health checks against many targets at once with bounded
+parallelism. Results are handed back as each target finishes and are
+aggregated into per-target and fleet-wide latency percentiles.
+
+Targets come from a file: one URL per line, a JSON list of URLs or
+``{"name", "url"}`` objects, or a Kubernetes ``Endpoints``/``EndpointSlice``
+object (``kubectl get endpoints my-app -o json``) as JSON or YAML.
+"""
+
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from async_checks import describe_error, run_health_checks
+from http_pool import DEFAULT_KEEPALIVE, DEFAULT_POOL_SIZE
+from quantile_sketch import QuantileSketch
+
+# Every target opens about five connections while it is being checked
+DEFAULT_CONCURRENCY = 100
+
+
+def _address_url(scheme, ip, port):
+    host = f"[{ip}]" if ':' in ip else ip
+    return f"{scheme}://{host}:{port}"
+
+
+def _pick_port(ports):
+    """The port named ``http`` if there is one, else the first"""
+    if not ports:
+        return 80
+    for port in ports:
+        if port.get('name') == 'http':
+            return port['port']
+    return ports[0]['port']
+
+
+def _endpoint_name(address, ip):
+    return (address.get('targetRef') or {}).get('name') or address.get('hostname') or ip
+
+
+def targets_from_data(data, scheme='http'):
+    """Targets from parsed JSON/YAML: URL lists, ``{"name", "url"}`` objects,
+    ``{"targets": [...]}``, Kubernetes lists, Endpoints and EndpointSlices.
+    Only ready Kubernetes addresses are returned."""
+    if data is None:
+        return []
+    if isinstance(data, str):
+        url = data.rstrip('/')
+        return [{'name': url, 'url': url}]
+    if isinstance(data, list):
+        return [target for item in data for target in targets_from_data(item, scheme)]
+    if not isinstance(data, dict):
+        raise ValueError(f"Unsupported target entry: {data!r}")
+
+    kind = data.get('kind', '')
+    if 'url' in data:
+        url = data['url'].rstrip('/')
+        return [{'name': data.get('name', url), 'url': url}]
+    if 'targets' in data:
+        return targets_from_data(data['targets'], scheme)
+    if kind.endswith('List') or 'items' in data:
+        return targets_from_data(data.get('items', []), scheme)
+
+    if kind == 'Endpoints':
+        targets = []
+        for subset in data.get('subsets') or []:
+            port = _pick_port(subset.get('ports'))
+            for address in subset.get('addresses') or []:
+                targets.append({'name': _endpoint_name(address, address['ip']),
+                                'url': _address_url(scheme, address['ip'], port)})
+        return targets
+
+    if kind == 'EndpointSlice':
+        targets = []
+        port = _pick_port(data.get('ports'))
+        for endpoint in data.get('endpoints') or []:
+            if (endpoint.get('conditions') or {}).get('ready') is False:
+                continue
+            for ip in endpoint.get('addresses') or []:
+                targets.append({'name': _endpoint_name(endpoint, ip),
+                                'url': _address_url(scheme, ip, port)})
+        return targets
+
+    raise ValueError(f"Unsupported target object: {kind or sorted(data)}")
+
+
+def load_targets(path, scheme='http'):
+    """Read targets from a text, JSON or YAML file; see ``targets_from_data``"""
+    with open(path) as f:
+        text = f.read()
+
+    if path.endswith(('.yaml', '.yml')):
+        import yaml
+        documents = [doc for doc in yaml.safe_load_all(text) if doc is not None]
+        return targets_from_data(documents, scheme)
+    if path.endswith('.json') or text.lstrip().startswith(('[', '{')):
+        return targets_from_data(json.loads(text), scheme)
+
+    lines = [line.split('#', 1)[0].strip() for line in text.splitlines()]
+    return targets_from_data([line for line in lines if line], scheme)
+
+
+async def check_target(target, limit, **options):
+    """Run every health check against one target once a slot is free"""
+    async with limit:
+        start = time.perf_counter()
+        try:
+            checks = await run_health_checks(target['url'], **options)
+            error = None
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
+            checks = None
+            error = describe_error(e)
+        elapsed = time.perf_counter() - start
+    return target, checks, error, elapsed
+
+
+async def iterate_fleet_checks(targets, concurrency=DEFAULT_CONCURRENCY, timeout=30, budget=None,
+                               pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, adaptive=None):
+    """Yield ``(target, checks, error, seconds)`` in completion order.
+
+    At most ``concurrency`` targets are checked at a time, and each one gets
+    its own ``budget`` (default ``timeout``), so a stuck replica costs one
+    budget instead of delaying the rest of the fleet.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    pending = [check_target(target, limit, timeout=timeout, budget=budget,
+                            pool_size=pool_size, keepalive=keepalive, adaptive=adaptive)
+               for target in targets]
+    for finished in asyncio.as_completed(pending):
+        yield await finished
+
+
+def collect_fleet_checks(targets, on_result, **options):
+    """Blocking entry point: call ``on_result(target, checks, error, seconds)``
+    for each target as it finishes"""
+    async def run():
+        async for result in iterate_fleet_checks(targets, **options):
+            on_result(*result)
+
+    asyncio.run(run())
+
+
+def target_latency(checks):
+    """Latency sketch of a target's performance probes (empty on error)"""
+    if checks is None:
+        return QuantileSketch()
+    return QuantileSketch.from_dict(checks['performance']['latency_sketch'])
+
+
+def fleet_status(status_counts):
+    """healthy when every target is, unhealthy when most targets are not"""
+    total = sum(status_counts.values())
+    healthy = status_counts.get('healthy', 0)
+    if healthy == total:
+        return 'healthy'
+    return 'unhealthy' if healthy < total / 2 else 'degraded'
+
+
+def summarize_fleet(results):
+    """Fleet-wide status counts and latency percentiles over every target's samples.
+
+    ``results`` are the per-target report entries, each with a ``status``,
+    its ``latency`` summary and the raw ``checks``.
+    """
+    fleet = QuantileSketch()
+    status_counts = {}
+    for result in results:
+        fleet.merge(target_latency(result['checks']))
+        status_counts[result['status']] = status_counts.get(result['status'], 0) + 1
+
+    with_latency = [r for r in results if r['latency']['p99'] is not None]
+    slowest = sorted(with_latency, key=lambda r: r['latency']['p99'], reverse=True)[:5]
+    return {
+        'overall_status': fleet_status(status_counts) if results else 'unhealthy',
+        'status_counts': status_counts,
+        'latency': fleet.summary(),
+        'latency_sketch': fleet.to_dict(),
+        'slowest_targets': [{'name': r['name'], 'url': r['url'], 'p99': r['latency']['p99']}
+                            for r in slowest]
+    }
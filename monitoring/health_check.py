@@ -5,16 +5,28 @@ Performs comprehensive health checks and reports status.
 """
 
 import argparse
+import asyncio
 import json
+import os
 import requests
+import signal
 import sys
 import time
 from datetime import datetime
 
+from async_checks import collect_health_checks, performance_summary
+from baseline import (DEFAULT_ALPHA, DEFAULT_MIN_INCREASE, DEFAULT_MIN_SLOWDOWN, DEFAULT_RUNS, DEFAULT_SAMPLES,
+                      check_latency_regression, collect_endpoint_latency, print_comparison, regression_issues)
+from daemon import HealthMonitor, start_metrics_server
+from fleet import DEFAULT_CONCURRENCY, collect_fleet_checks, load_targets, summarize_fleet, target_latency
+from http_pool import DEFAULT_KEEPALIVE, DEFAULT_POOL_SIZE, get_sync_session
+from load_generator import evaluate_load_thresholds, parse_endpoint_mix, run_load_test
+from quantile_sketch import QuantileSketch
+
 def check_application_health(base_url, timeout=30):
     """Check application health endpoint"""
     try:
-        response = requests.get(f"{base_url}/health", timeout=timeout)
+        response = get_sync_session().get(f"{base_url}/health", timeout=timeout)
         if response.status_code == 200:
             health_data = response.json()
             return {
@@ -45,7 +57,7 @@ def check_api_endpoints(base_url, timeout=30):
     results = {}
     for endpoint in endpoints:
         try:
-            response = requests.get(f"{base_url}{endpoint}", timeout=timeout)
+            response = get_sync_session().get(f"{base_url}{endpoint}", timeout=timeout)
             results[endpoint] = {
                 'status_code': response.status_code,
                 'response_time': response.elapsed.total_seconds(),
@@ -63,7 +75,7 @@ def check_api_endpoints(base_url, timeout=30):
 def check_security_headers(base_url, timeout=30):
     """Check for security headers"""
     try:
-        response = requests.get(base_url, timeout=timeout)
+        response = get_sync_session().get(base_url, timeout=timeout)
         headers = response.headers
         
         security_headers = {
@@ -90,51 +102,112 @@ def check_security_headers(base_url, timeout=30):
 
 def performance_test(base_url, iterations=10, timeout=30):
     """Perform basic performance testing"""
-    response_times = []
+    sketch = QuantileSketch()
     errors = 0
     
     for i in range(iterations):
         try:
             start_time = time.time()
-            response = requests.get(f"{base_url}/health", timeout=timeout)
+            response = get_sync_session().get(f"{base_url}/health", timeout=timeout)
             end_time = time.time()
             
             if response.status_code == 200:
-                response_times.append(end_time - start_time)
+                sketch.add(end_time - start_time)
             else:
                 errors += 1
         except requests.exceptions.RequestException:
             errors += 1
     
-    if response_times:
-        avg_response_time = sum(response_times) / len(response_times)
-        min_response_time = min(response_times)
-        max_response_time = max(response_times)
-        success_rate = (iterations - errors) / iterations * 100
-    else:
-        avg_response_time = None
-        min_response_time = None
-        max_response_time = None
-        success_rate = 0
-    
+    return performance_summary(sketch, iterations, errors)
+
+def run_sync_health_checks(base_url, timeout=30, pool_size=DEFAULT_POOL_SIZE,
+                           keepalive=DEFAULT_KEEPALIVE):
+    """Run every check one after another with blocking requests"""
+    get_sync_session(pool_size, keepalive)
     return {
-        'iterations': iterations,
-        'errors': errors,
-        'success_rate': success_rate,
-        'avg_response_time': avg_response_time,
-        'min_response_time': min_response_time,
-        'max_response_time': max_response_time
+        'application_health': check_application_health(base_url, timeout),
+        'api_endpoints': check_api_endpoints(base_url, timeout),
+        'security_headers': check_security_headers(base_url, timeout),
+        'performance': performance_test(base_url, timeout=timeout)
     }
 
-def generate_health_report(environment, base_url):
-    """Generate comprehensive health report"""
+def find_issues(checks):
+    """Issue strings for every check result that misses its threshold"""
+    issues = []
+    
+    if checks['application_health']['status'] != 'healthy':
+        issues.append('Application health check failed')
+    
+    # Check API endpoints
+    for endpoint, result in checks['api_endpoints'].items():
+        if result.get('status_code') != 200:
+            issues.append(f"API endpoint {endpoint} is not responding correctly")
+    
+    # Check security headers
+    if checks['security_headers'].get('security_score', 0) < 80:
+        issues.append('Security headers score is below threshold')
+    
+    # Check performance
+    issues.extend(performance_issues(checks['performance']))
+    
+    return issues
+
+def performance_issues(performance):
+    """Success rate and average latency thresholds, shared with the daemon's windows"""
+    issues = []
+    if performance['success_rate'] < 95:
+        issues.append('Success rate is below 95%')
+    
+    if performance['avg_response_time'] and performance['avg_response_time'] > 2.0:
+        issues.append('Average response time is above 2 seconds')
+    
+    return issues
+
+def overall_status(issues):
+    """healthy, degraded (up to two issues) or unhealthy"""
+    if not issues:
+        return 'healthy'
+    return 'degraded' if len(issues) <= 2 else 'unhealthy'
+
+def generate_health_report(environment, base_url, timeout=30, engine='async', budget=None,
+                           load_profile=None, load_thresholds=None,
+                           pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, adaptive=None,
+                           baseline=None, latency_samples=DEFAULT_SAMPLES):
+    """Generate comprehensive health report
+
+    When ``load_profile`` is given (keyword arguments for
+    ``load_generator.LoadGenerator``) a load test runs after the checks and
+    ``load_thresholds`` are evaluated against its results. ``adaptive``
+    (keyword arguments for ``adaptive.AdaptivePolicy``) enables adaptive
+    timeouts, retries and hedging in the async engine. ``baseline``
+    (keyword arguments for ``baseline.check_latency_regression``) samples
+    every endpoint ``latency_samples`` times and fails on a significant
+    latency regression against an earlier version.
+    """
     print(f"🏥 Running health checks for {environment} environment...")
     
     # Perform health checks
-    app_health = check_application_health(base_url)
-    api_checks = check_api_endpoints(base_url)
-    security_headers = check_security_headers(base_url)
-    performance = performance_test(base_url)
+    if engine == 'async':
+        checks = collect_health_checks(base_url, timeout=timeout, budget=budget,
+                                       pool_size=pool_size, keepalive=keepalive, adaptive=adaptive)
+    else:
+        checks = run_sync_health_checks(base_url, timeout, pool_size, keepalive)
+    
+    app_health = checks['application_health']
+    api_checks = checks['api_endpoints']
+    security_headers = checks['security_headers']
+    performance = checks['performance']
+    
+    load_test = None
+    if load_profile is not None:
+        print(f"🚦 Running {load_profile.get('mode', 'closed')}-loop load test...")
+        load_test = run_load_test(base_url, timeout=timeout, keepalive=keepalive, **load_profile)
+    
+    endpoint_latency = None
+    if baseline is not None:
+        print(f"📏 Sampling endpoint latency ({latency_samples} requests each)...")
+        endpoint_latency = collect_endpoint_latency(base_url, samples=latency_samples, timeout=timeout,
+                                                    pool_size=pool_size, keepalive=keepalive)
     
     # Compile report
     report = {
@@ -148,31 +221,32 @@ def generate_health_report(environment, base_url):
         'overall_status': 'healthy'  # Will be updated based on checks
     }
     
-    # Determine overall status
-    issues = []
+    if 'connection_setup' in checks:
+        report['connection_setup'] = checks['connection_setup']
     
-    if app_health['status'] != 'healthy':
-        issues.append('Application health check failed')
-        report['overall_status'] = 'unhealthy'
+    if 'scheduling' in checks:
+        report['scheduling'] = checks['scheduling']
     
-    # Check API endpoints
-    for endpoint, result in api_checks.items():
-        if result.get('status_code') != 200:
-            issues.append(f"API endpoint {endpoint} is not responding correctly")
+    if load_test is not None:
+        report['load_test'] = load_test
     
-    # Check security headers
-    if security_headers.get('security_score', 0) < 80:
-        issues.append('Security headers score is below threshold')
+    if endpoint_latency is not None:
+        report['endpoint_latency'] = endpoint_latency
     
-    # Check performance
-    if performance['success_rate'] < 95:
-        issues.append('Success rate is below 95%')
+    # Determine overall status
+    issues = find_issues(checks)
     
-    if performance['avg_response_time'] and performance['avg_response_time'] > 2.0:
-        issues.append('Average response time is above 2 seconds')
+    # Check load test
+    if load_test is not None:
+        issues.extend(evaluate_load_thresholds(load_test, load_thresholds or {}))
     
+    # Compare latency with the baseline version
+    if endpoint_latency is not None:
+        report['latency_baseline'] = check_latency_regression(report, **baseline)
+        issues.extend(regression_issues(report['latency_baseline']))
+    
+    report['overall_status'] = overall_status(issues)
     if issues:
-        report['overall_status'] = 'degraded' if len(issues) <= 2 else 'unhealthy'
         report['issues'] = issues
     
     # Save report
@@ -189,6 +263,36 @@ def generate_health_report(environment, base_url):
     
     if 'avg_response_time' in performance and performance['avg_response_time']:
         print(f"Average Response Time: {performance['avg_response_time']:.3f}s")
+        latency = performance['latency']
+        print(f"Response Time p50/p99/p99.9: {latency['p50']:.3f}s / {latency['p99']:.3f}s / "
+              f"{latency['p99.9']:.3f}s")
+    
+    if performance.get('avg_ttfb') is not None:
+        print(f"Average Time to First Byte: {performance['avg_ttfb']:.3f}s "
+              f"({performance['reused_connections']}/{performance['iterations']} reused connections)")
+    
+    setup = report.get('connection_setup', {})
+    if setup.get('tcp_connect') is not None:
+        tls = f", TLS {setup['tls_handshake']:.3f}s" if setup.get('tls_handshake') is not None else ''
+        print(f"Connection Setup: DNS {setup['dns']:.3f}s, TCP {setup['tcp_connect']:.3f}s{tls}")
+    
+    scheduling = report.get('scheduling')
+    if scheduling is not None:
+        saved = (f", {scheduling['hedge_wins']} won saving {scheduling['saved_latency']:.3f}s"
+                 if scheduling['hedges'] else '')
+        print(f"Scheduling: {scheduling['retries']} retries, {scheduling['timeouts']} timeouts, "
+              f"hedge rate {scheduling['hedge_rate']:.1f}%{saved}")
+    
+    if load_test is not None:
+        latency = load_test['latency']
+        print(f"Load Test: {load_test['requests']} requests, "
+              f"{load_test['throughput']:.1f} req/s, {load_test['error_rate']:.2f}% errors")
+        if latency['p50'] is not None:
+            print(f"Load Latency p50/p90/p99/p99.9: {latency['p50']:.3f}s / {latency['p90']:.3f}s / "
+                  f"{latency['p99']:.3f}s / {latency['p99.9']:.3f}s")
+    
+    if 'latency_baseline' in report:
+        print_comparison(report['latency_baseline'])
     
     if issues:
         print(f"\n⚠️ Issues Found:")
@@ -199,27 +303,264 @@ def generate_health_report(environment, base_url):
     
     return report
 
+def generate_fleet_report(environment, targets, timeout=30, budget=None,
+                          concurrency=DEFAULT_CONCURRENCY, pool_size=DEFAULT_POOL_SIZE,
+                          keepalive=DEFAULT_KEEPALIVE, adaptive=None):
+    """Check every target concurrently and aggregate one fleet report
+
+    Each target is printed as soon as its checks finish; the report keeps
+    the full per-target results next to fleet-wide percentiles.
+    """
+    print(f"🏥 Running health checks for {len(targets)} {environment} targets "
+          f"({concurrency} at a time)...")
+    icons = {'healthy': '✅', 'degraded': '⚠️', 'unhealthy': '❌', 'error': '❌'}
+    results = []
+
+    def on_result(target, checks, error, elapsed):
+        if checks is None:
+            status, issues, latency = 'error', [error], target_latency(None).summary()
+        else:
+            issues = find_issues(checks)
+            status = overall_status(issues)
+            latency = target_latency(checks).summary()
+        results.append({
+            'name': target['name'],
+            'url': target['url'],
+            'status': status,
+            'duration': elapsed,
+            'latency': latency,
+            'issues': issues,
+            'checks': checks
+        })
+        p50 = f"{latency['p50']:.3f}s" if latency['p50'] is not None else '-'
+        p99 = f"{latency['p99']:.3f}s" if latency['p99'] is not None else '-'
+        print(f"{icons[status]} {target['name']:<30} {status:<9} p50 {p50:<7} p99 {p99:<7} "
+              f"({elapsed:.2f}s)" + (f" {issues[0]}" if issues else ''))
+
+    start = time.perf_counter()
+    collect_fleet_checks(targets, on_result, concurrency=concurrency, timeout=timeout,
+                         budget=budget, pool_size=pool_size, keepalive=keepalive, adaptive=adaptive)
+    duration = time.perf_counter() - start
+
+    summary = summarize_fleet(results)
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'environment': environment,
+        'targets': len(targets),
+        'concurrency': concurrency,
+        'duration': duration,
+        **summary,
+        'results': results
+    }
+
+    report_filename = f"fleet-report-{environment}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(report_filename, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    latency = report['latency']
+    print(f"\n📊 Fleet Summary for {environment.upper()}")
+    print(f"Overall Status: {report['overall_status'].upper()}")
+    print("Targets: " + ', '.join(f"{count} {status}" for status, count in sorted(report['status_counts'].items()))
+          + f" in {duration:.2f}s")
+    if latency['p50'] is not None:
+        print(f"Fleet Latency p50/p90/p99/p99.9: {latency['p50']:.3f}s / {latency['p90']:.3f}s / "
+              f"{latency['p99']:.3f}s / {latency['p99.9']:.3f}s")
+    for target in report['slowest_targets']:
+        print(f"  slowest: {target['name']} p99 {target['p99']:.3f}s")
+
+    print(f"\n📄 Full report saved to: {report_filename}")
+
+    return report
+
+def run_health_daemon(environment, base_url, interval=5.0, jitter=0.2, timeout=30,
+                      metrics_host='0.0.0.0', metrics_port=9105, window='5m',
+                      pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, adaptive=None):
+    """Probe continuously until SIGINT/SIGTERM
+
+    Rolling-window aggregates are served on ``metrics_port``; every change
+    of ``window``'s status is printed as it happens.
+    """
+    monitor = HealthMonitor(base_url, interval=interval, jitter=jitter, timeout=timeout,
+                            assess=performance_issues, pool_size=pool_size, keepalive=keepalive,
+                            adaptive=adaptive)
+    if window not in monitor.overall.windows:
+        raise ValueError(f"Unknown window {window}; choose from {', '.join(monitor.overall.windows)}")
+    last_status = None
+
+    def on_cycle(monitor):
+        nonlocal last_status
+        result = monitor.snapshot()[window]
+        if result['status'] != last_status:
+            overall = result['overall']
+            print(f"[{datetime.utcnow().isoformat()}] {environment} {window} window "
+                  f"{result['status'].upper()}: {overall['success_rate']:.1f}% success over "
+                  f"{overall['requests']} probes" + ''.join(f"; {issue}" for issue in result['issues']))
+            last_status = result['status']
+
+    async def run():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        runner, port = await start_metrics_server(monitor, metrics_host, metrics_port)
+        print(f"🏥 Monitoring {base_url} every {interval:g}s; metrics on "
+              f"http://{metrics_host}:{port}/metrics and /status")
+        try:
+            await monitor.run(stop, on_cycle=on_cycle)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+    return monitor
+
 def main():
     parser = argparse.ArgumentParser(description='Health check script for DevSecOps application')
     parser.add_argument('--environment', required=True, choices=['staging', 'production'], 
                        help='Environment to check')
     parser.add_argument('--url', help='Base URL of the application')
+    parser.add_argument('--targets',
+                       help='File listing many base URLs (text, JSON or a Kubernetes Endpoints/EndpointSlice '
+                            'in JSON or YAML) to check as a fleet')
+    parser.add_argument('--target-scheme', choices=['http', 'https'], default='http',
+                       help='Scheme for addresses taken from Kubernetes endpoints')
+    parser.add_argument('--fleet-concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help='Targets checked at the same time in fleet mode')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Probe continuously and serve rolling-window metrics instead of writing one report')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between daemon probe rounds')
+    parser.add_argument('--jitter', type=float, default=0.2,
+                       help='Random spread of the daemon interval, as a fraction of it')
+    parser.add_argument('--metrics-port', type=int, default=9105, help='Port of the daemon metrics endpoint')
+    parser.add_argument('--window', default='5m', help='Daemon window (1m, 5m, 15m) whose status changes are printed')
     parser.add_argument('--timeout', type=int, default=30, help='Request timeout in seconds')
+    parser.add_argument('--engine', choices=['async', 'sync'], default='async',
+                       help='Run checks concurrently (async) or one after another (sync)')
+    parser.add_argument('--budget', type=float,
+                       help='Total time budget in seconds shared by all async checks (default: --timeout)')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Derive per-endpoint timeouts from observed latency and retry failures (async engine)')
+    parser.add_argument('--retries', type=int, default=2,
+                       help='Retries per request in adaptive mode, with exponential backoff and jitter')
+    parser.add_argument('--hedge', action='store_true',
+                       help='Send a second copy of requests slower than the endpoint p95 (implies --adaptive)')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                       help='Maximum pooled connections per host')
+    parser.add_argument('--keepalive', type=float, default=DEFAULT_KEEPALIVE,
+                       help='Seconds to keep idle connections open (0 disables keep-alive)')
+    parser.add_argument('--load', action='store_true', help='Run a concurrent load test after the checks')
+    parser.add_argument('--load-mode', choices=['closed', 'open'], default='closed',
+                       help='closed: fixed number of busy clients, open: fixed arrival rate')
+    parser.add_argument('--load-concurrency', type=int, default=10, help='Concurrent in-flight requests')
+    parser.add_argument('--load-rate', type=float, help='Target requests per second (required for open-loop)')
+    parser.add_argument('--load-duration', type=float, default=10.0, help='Load test duration in seconds')
+    parser.add_argument('--load-endpoint', action='append', default=[],
+                       help='Weighted /api/* endpoint, e.g. /api/info:3 (repeatable)')
+    parser.add_argument('--max-p50', type=float, help='Fail if load test p50 latency (s) exceeds this')
+    parser.add_argument('--max-p90', type=float, help='Fail if load test p90 latency (s) exceeds this')
+    parser.add_argument('--max-p99', type=float, help='Fail if load test p99 latency (s) exceeds this')
+    parser.add_argument('--max-p999', type=float, help='Fail if load test p99.9 latency (s) exceeds this')
+    parser.add_argument('--max-error-rate', type=float, help='Fail if load test error rate (%%) exceeds this')
+    parser.add_argument('--min-throughput', type=float, help='Fail if load test throughput (req/s) is below this')
+    parser.add_argument('--baseline-db',
+                       help='SQLite database of latency baselines; fails on a regression against an earlier version')
+    parser.add_argument('--app-version', default=os.environ.get('APP_VERSION'),
+                       help='Version being checked, recorded as a baseline when it does not regress '
+                            '(default: $APP_VERSION)')
+    parser.add_argument('--baseline-version',
+                       help='Version to compare with (default: the most recently recorded other version)')
+    parser.add_argument('--baseline-runs', type=int, default=DEFAULT_RUNS,
+                       help='Most recent runs of the baseline version to compare with')
+    parser.add_argument('--latency-samples', type=int, default=DEFAULT_SAMPLES,
+                       help='Requests timed per endpoint for the baseline comparison')
+    parser.add_argument('--regression-alpha', type=float, default=DEFAULT_ALPHA,
+                       help='Significance level of the latency regression tests')
+    parser.add_argument('--min-slowdown', type=float, default=DEFAULT_MIN_SLOWDOWN,
+                       help='Smallest relative slowdown that counts as a regression (0.1 = 10%%)')
+    parser.add_argument('--min-increase', type=float, default=DEFAULT_MIN_INCREASE,
+                       help='Smallest slowdown in seconds that counts as a regression')
     
     args = parser.parse_args()
     
-    # Determine base URL
-    if args.url:
-        base_url = args.url
+    if args.daemon and (args.targets or args.load or args.engine == 'sync'):
+        parser.error('--daemon cannot be combined with --targets, --load or --engine sync')
+    
+    baseline = None
+    if args.baseline_db:
+        if args.daemon or args.targets:
+            parser.error('--baseline-db cannot be combined with --daemon or --targets')
+        if not args.app_version:
+            parser.error('--baseline-db needs --app-version or $APP_VERSION')
+        baseline = {
+            'store_path': args.baseline_db,
+            'version': args.app_version,
+            'baseline_version': args.baseline_version,
+            'runs': args.baseline_runs,
+            'alpha': args.regression_alpha,
+            'min_slowdown': args.min_slowdown,
+            'min_increase': args.min_increase
+        }
+    
+    adaptive = None
+    if args.adaptive or args.hedge:
+        if args.engine == 'sync':
+            parser.error('--adaptive and --hedge need the async engine')
+        adaptive = {'retries': args.retries, 'hedge': args.hedge}
+    
+    if args.targets:
+        # Fleet mode: every target gets the full set of async checks
+        if args.url or args.load or args.engine == 'sync':
+            parser.error('--targets cannot be combined with --url, --load or --engine sync')
+        targets = load_targets(args.targets, scheme=args.target_scheme)
+        if not targets:
+            parser.error(f"No targets found in {args.targets}")
+        report = generate_fleet_report(args.environment, targets, timeout=args.timeout,
+                                       budget=args.budget, concurrency=args.fleet_concurrency,
+                                       pool_size=args.pool_size, keepalive=args.keepalive,
+                                       adaptive=adaptive)
     else:
-        # Default URLs based on environment
-        if args.environment == 'staging':
-            base_url = 'http://staging.company.com'  # Update with actual staging URL
+        # Determine base URL
+        if args.url:
+            base_url = args.url
         else:
-            base_url = 'https://production.company.com'  # Update with actual production URL
+            # Default URLs based on environment
+            if args.environment == 'staging':
+                base_url = 'http://staging.company.com'  # Update with actual staging URL
+            else:
+                base_url = 'https://production.company.com'  # Update with actual production URL
+    
+        if args.daemon:
+            run_health_daemon(args.environment, base_url, interval=args.interval, jitter=args.jitter,
+                              timeout=args.timeout, metrics_port=args.metrics_port, window=args.window,
+                              pool_size=args.pool_size, keepalive=args.keepalive, adaptive=adaptive)
+            return
+    
+        # Load test profile and gates
+        load_profile = None
+        load_thresholds = None
+        if args.load:
+            load_profile = {
+                'mode': args.load_mode,
+                'concurrency': args.load_concurrency,
+                'rate': args.load_rate,
+                'duration': args.load_duration,
+                'endpoints': parse_endpoint_mix(args.load_endpoint) or None
+            }
+            load_thresholds = {
+                'p50': args.max_p50,
+                'p90': args.max_p90,
+                'p99': args.max_p99,
+                'p99.9': args.max_p999,
+                'error_rate': args.max_error_rate,
+                'min_throughput': args.min_throughput
+            }
     
-    # Generate health report
-    report = generate_health_report(args.environment, base_url)
+        # Generate health report
+        report = generate_health_report(args.environment, base_url, timeout=args.timeout,
+                                        engine=args.engine, budget=args.budget,
+                                        load_profile=load_profile, load_thresholds=load_thresholds,
+                                        pool_size=args.pool_size, keepalive=args.keepalive,
+                                        adaptive=adaptive, baseline=baseline,
+                                        latency_samples=args.latency_samples)
     
     # Exit with appropriate code
     if report['overall_status'] == 'healthy':
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+HTTP Connection Pool
+Shared keep-alive sessions for the health checks plus per-request phase
+timing, so reported latency separates connection setup from what the
+application itself costs.
+"""
+
+import asyncio
+import socket
+import ssl
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_KEEPALIVE = 30.0
+
+
+class RequestTiming:
+    """Phase timestamps for one request, filled in by the trace hooks"""
+
+    def __init__(self):
+        self.start = None
+        self.queued = 0.0
+        self.dns = 0.0
+        self.connect = 0.0
+        self.reused = False
+        self.connection_ready = None
+        self.headers_received = None
+        self.end = None
+        self._mark = None
+        self._dns_mark = None
+
+    def to_dict(self):
+        """Phase durations in seconds; ``connect`` includes TLS for https"""
+        ready = self.connection_ready or self.start
+        return {
+            'queued': self.queued,
+            'dns': self.dns,
+            'connect': self.connect,
+            'ttfb': self.headers_received - ready if self.headers_received else None,
+            'total': self.end - self.start if self.end else None,
+            'reused_connection': self.reused
+        }
+
+
+def _timing(trace_config_ctx):
+    return trace_config_ctx.trace_request_ctx
+
+
+def _now():
+    return time.perf_counter()
+
+
+async def _on_request_start(session, ctx, params):
+    timing = _timing(ctx)
+    if timing is not None:
+        timing.start = _now()
+        timing.connection_ready = timing.start
+
+
+async def _on_queued_start(session, ctx, params):
+    if _timing(ctx) is not None:
+        _timing(ctx)._mark = _now()
+
+
+async def _on_queued_end(session, ctx, params):
+    timing = _timing(ctx)
+    if timing is not None:
+        timing.queued += _now() - timing._mark
+        timing.connection_ready = _now()
+
+
+async def _on_dns_start(session, ctx, params):
+    if _timing(ctx) is not None:
+        _timing(ctx)._dns_mark = _now()
+
+
+async def _on_dns_end(session, ctx, params):
+    timing = _timing(ctx)
+    if timing is not None:
+        timing.dns += _now() - timing._dns_mark
+
+
+async def _on_create_start(session, ctx, params):
+    if _timing(ctx) is not None:
+        _timing(ctx)._mark = _now()
+
+
+async def _on_create_end(session, ctx, params):
+    timing = _timing(ctx)
+    if timing is not None:
+        # Connection creation wraps DNS resolution; report it separately
+        timing.connect += _now() - timing._mark - timing.dns
+        timing.connection_ready = _now()
+
+
+async def _on_reuseconn(session, ctx, params):
+    timing = _timing(ctx)
+    if timing is not None:
+        timing.reused = True
+        timing.connection_ready = _now()
+
+
+async def _on_request_end(session, ctx, params):
+    if _timing(ctx) is not None:
+        _timing(ctx).headers_received = _now()
+
+
+def timing_trace_config():
+    """aiohttp trace hooks that populate a ``RequestTiming`` per request"""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_queued_start.append(_on_queued_start)
+    trace_config.on_connection_queued_end.append(_on_queued_end)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_connection_create_start.append(_on_create_start)
+    trace_config.on_connection_create_end.append(_on_create_end)
+    trace_config.on_connection_reuseconn.append(_on_reuseconn)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE, keepalive=DEFAULT_KEEPALIVE, trace=True):
+    """Pooled aiohttp session; ``keepalive=0`` closes connections after each request"""
+    connector = aiohttp.TCPConnector(
+        limit=pool_size,
+        limit_per_host=pool_size,
+        keepalive_timeout=keepalive if keepalive else None,
+        force_close=not keepalive
+    )
+    trace_configs = [timing_trace_config()] if trace else None
+    return aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
+
+
+async def timed_get(session, url, timeout):
+    """GET ``url`` reading the full body; returns (response, body, RequestTiming)"""
+    timing = RequestTiming()
+    async with session.get(url, timeout=timeout, trace_request_ctx=timing) as response:
+        body = await response.read()
+    timing.end = _now()
+    return response, body, timing
+
+
+async def measure_connection_setup(base_url, timeout=10):
+    """Time DNS, TCP connect and TLS handshake of one fresh connection.
+
+    aiohttp reports TCP and TLS setup as a single phase, so this probe opens
+    a separate connection to split them.
+    """
+    parts = urlsplit(base_url)
+    host = parts.hostname
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    loop = asyncio.get_running_loop()
+    result = {'dns': None, 'tcp_connect': None, 'tls_handshake': None}
+
+    try:
+        start = _now()
+        addresses = await asyncio.wait_for(
+            loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout)
+        result['dns'] = _now() - start
+        family, _, _, _, address = addresses[0]
+
+        start = _now()
+        transport, protocol = await asyncio.wait_for(
+            loop.create_connection(asyncio.Protocol, host=address[0], port=address[1]), timeout)
+        result['tcp_connect'] = _now() - start
+
+        try:
+            if parts.scheme == 'https':
+                start = _now()
+                transport = await asyncio.wait_for(
+                    loop.start_tls(transport, protocol, ssl.create_default_context(),
+                                   server_hostname=host), timeout)
+                result['tls_handshake'] = _now() - start
+        finally:
+            transport.close()
+    except (OSError, asyncio.TimeoutError, ssl.SSLError) as e:
+        result['error'] = str(e) or e.__class__.__name__
+
+    return result
+
+
+_sync_session = None
+_sync_settings = None
+
+
+def get_sync_session(pool_size=None, keepalive=None):
+    """Shared keep-alive ``requests`` session for the blocking checks.
+
+    Called without arguments it returns the current session; passing
+    settings that differ from the current ones rebuilds it. ``requests`` has
+    no idle timeout, so ``keepalive`` only switches reuse on or off:
+    ``keepalive=0`` sends ``Connection: close`` on every request.
+
+    The connect/TLS/TTFB phase split is only recorded by the async engine;
+    the blocking checks report total response time.
+    """
+    global _sync_session, _sync_settings
+    if _sync_settings is None:
+        settings = (DEFAULT_POOL_SIZE, bool(DEFAULT_KEEPALIVE))
+    else:
+        settings = _sync_settings
+    settings = (pool_size if pool_size is not None else settings[0],
+                bool(keepalive) if keepalive is not None else settings[1])
+
+    if _sync_session is None or settings != _sync_settings:
+        if _sync_session is not None:
+            _sync_session.close()
+        size, reuse = settings
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not reuse:
+            session.headers['Connection'] = 'close'
+        _sync_session = session
+        _sync_settings = settings
+    return _sync_session
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Load Generator
+Drives concurrent traffic against the application's /api/* routes and
+reports tail latency, throughput and an error breakdown.
+
+Two traffic models are supported:
+
+* closed-loop: ``concurrency`` workers send back-to-back requests, optionally
+  paced to a shared target rate.
+* open-loop: requests are scheduled at a fixed ``rate`` regardless of how fast
+  earlier ones complete. Latency is measured from the scheduled send time so
+  queueing behind a slow server is not hidden (coordinated omission).
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+
+import aiohttp
+
+from http_pool import DEFAULT_KEEPALIVE, create_session
+from quantile_sketch import QuantileSketch
+
+DEFAULT_ENDPOINT_MIX = {
+    '/api/info': 1,
+    '/api/secure-data?user_id=123': 1
+}
+
+
+class LoadResult:
+    """Aggregated outcome of one load run"""
+
+    def __init__(self, endpoints):
+        self.latency = QuantileSketch()
+        self.endpoints = {path: QuantileSketch() for path in endpoints}
+        self.endpoint_errors = Counter()
+        self.errors = Counter()
+        self.requests = 0
+
+    def record_success(self, path, seconds):
+        self.requests += 1
+        self.latency.add(seconds)
+        self.endpoints[path].add(seconds)
+
+    def record_error(self, path, error):
+        self.requests += 1
+        self.errors[error] += 1
+        self.endpoint_errors[path] += 1
+
+
+def parse_endpoint_mix(specs):
+    """Turn ``['/api/info:3', '/api/secure-data?user_id=1']`` into a weight map"""
+    mix = {}
+    for spec in specs:
+        path, _, weight = spec.rpartition(':') if ':' in spec else (spec, '', '')
+        if not path.startswith('/api/'):
+            raise ValueError(f"Load endpoints must be /api/* routes: {path}")
+        mix[path] = float(weight) if weight else 1.0
+    return mix
+
+
+class LoadGenerator:
+    """Issue requests according to a traffic model and collect the results"""
+
+    def __init__(self, base_url, concurrency=10, rate=None, duration=10.0,
+                 mode='closed', endpoints=None, timeout=30, seed=None,
+                 keepalive=DEFAULT_KEEPALIVE):
+        if mode not in ('closed', 'open'):
+            raise ValueError(f"Unknown load mode: {mode}")
+        if mode == 'open' and not rate:
+            raise ValueError('Open-loop load requires a request rate')
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.mode = mode
+        self.mix = endpoints or dict(DEFAULT_ENDPOINT_MIX)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.keepalive = keepalive
+        self._paths = list(self.mix)
+        self._weights = list(self.mix.values())
+        self._random = random.Random(seed)
+        self._next_slot = None
+
+    def _choose_path(self):
+        return self._random.choices(self._paths, weights=self._weights)[0]
+
+    async def _request(self, session, result, path, started):
+        try:
+            async with session.get(f"{self.base_url}{path}", timeout=self.timeout) as response:
+                await response.read()
+                status = response.status
+        except asyncio.TimeoutError:
+            result.record_error(path, 'Timeout')
+            return
+        except aiohttp.ClientError as e:
+            result.record_error(path, e.__class__.__name__)
+            return
+
+        if status >= 400:
+            result.record_error(path, f"HTTP {status}")
+        else:
+            result.record_success(path, time.monotonic() - started)
+
+    async def _pace(self):
+        """Wait for this worker's slot when a closed-loop rate is set"""
+        if not self.rate:
+            return
+        now = time.monotonic()
+        slot = max(self._next_slot or now, now)
+        self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _closed_loop(self, session, result, stop_at):
+        async def worker():
+            while True:
+                await self._pace()
+                if time.monotonic() >= stop_at:
+                    return
+                await self._request(session, result, self._choose_path(), time.monotonic())
+
+        await asyncio.gather(*[worker() for _ in range(self.concurrency)])
+
+    async def _open_loop(self, session, result, start, stop_at):
+        interval = 1 / self.rate
+        in_flight = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async def issue(path, scheduled):
+            async with in_flight:
+                await self._request(session, result, path, scheduled)
+
+        for n in range(int(self.duration * self.rate)):
+            scheduled = start + n * interval
+            if scheduled >= stop_at:
+                break
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.ensure_future(issue(self._choose_path(), scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run(self):
+        """Run the configured load and return the report section"""
+        result = LoadResult(self._paths)
+        session = create_session(pool_size=self.concurrency, keepalive=self.keepalive, trace=False)
+
+        async with session:
+            start = time.monotonic()
+            stop_at = start + self.duration
+            if self.mode == 'open':
+                await self._open_loop(session, result, start, stop_at)
+            else:
+                await self._closed_loop(session, result, stop_at)
+            elapsed = time.monotonic() - start
+
+        return self._report(result, elapsed)
+
+    def _report(self, result, elapsed):
+        errors = sum(result.errors.values())
+        return {
+            'mode': self.mode,
+            'concurrency': self.concurrency,
+            'target_rate': self.rate,
+            'duration': elapsed,
+            'requests': result.requests,
+            'successes': result.requests - errors,
+            'errors': errors,
+            'error_rate': errors / result.requests * 100 if result.requests else 0,
+            'throughput': result.requests / elapsed if elapsed else 0,
+            'latency': result.latency.summary(),
+            'errors_by_type': dict(result.errors),
+            'endpoints': {
+                path: {
+                    'weight': self.mix[path],
+                    'requests': sketch.count + result.endpoint_errors[path],
+                    'errors': result.endpoint_errors[path],
+                    'latency': sketch.summary()
+                }
+                for path, sketch in result.endpoints.items()
+            },
+            'latency_sketch': result.latency.to_dict()
+        }
+
+
+def run_load_test(base_url, **profile):
+    """Blocking entry point: run a load profile and return its report"""
+    return asyncio.run(LoadGenerator(base_url, **profile).run())
+
+
+def evaluate_load_thresholds(load_report, thresholds):
+    """Return issue strings for every threshold the load report violates.
+
+    ``thresholds`` may contain latency limits in seconds keyed by percentile
+    name (``p50``, ``p90``, ``p99``, ``p99.9``), ``error_rate`` in percent and
+    ``min_throughput`` in requests per second.
+    """
+    issues = []
+    latency = load_report['latency']
+
+    for name in ('p50', 'p90', 'p99', 'p99.9'):
+        limit = thresholds.get(name)
+        if limit is None:
+            continue
+        observed = latency.get(name)
+        if observed is None:
+            issues.append(f"Load test recorded no successful requests for {name}")
+        elif observed > limit:
+            issues.append(f"Load test {name} latency {observed:.3f}s is above {limit:.3f}s")
+
+    max_error_rate = thresholds.get('error_rate')
+    if max_error_rate is not None and load_report['error_rate'] > max_error_rate:
+        issues.append(f"Load test error rate {load_report['error_rate']:.2f}% "
+                      f"is above {max_error_rate:.2f}%")
+
+    min_throughput = thresholds.get('min_throughput')
+    if min_throughput is not None and load_report['throughput'] < min_throughput:
+        issues.append(f"Load test throughput {load_report['throughput']:.1f} req/s "
+                      f"is below {min_throughput:.1f} req/s")
+
+    return issues
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Quantile Sketch
+DDSketch-style streaming quantiles for health-check latency. Values fall
+into logarithmic bins whose width grows with the value, so every quantile
+is within ``relative_accuracy`` (1% by default) of the true sample, however
+far into the tail. The bin count is capped, which keeps memory constant.
+
+Sketches with the same accuracy merge exactly. They serialize into the JSON
+reports, so latency from several targets, runs or days can be combined
+later. Run this file on saved reports to do that:
+
+    python monitoring/quantile_sketch.py health-report-production-*.json
+"""
+
+import argparse
+import json
+import math
+
+REPORTED_PERCENTILES = [50, 90, 99, 99.9]
+
+# Latencies at or below this many seconds are counted as zero
+MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """Mergeable relative-error quantile sketch.
+
+    A value ``x`` is counted in bin ``ceil(log(x) / log(gamma))`` with
+    ``gamma = (1 + a) / (1 - a)``, and a bin reports the value in its middle,
+    so every estimate is within ``a`` of a value in that bin. When more than
+    ``max_bins`` bins are in use the lowest ones are folded together: only
+    the fastest samples lose precision, and the tail quantiles keep their
+    guarantee. The default 2048 bins span 1 ns to far beyond any timeout, so
+    in practice latency sketches never fold.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_bins=2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative_accuracy must be between 0 and 1')
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key):
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _fold(self):
+        """Fold the lowest bins together until ``max_bins`` remain"""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        folded = sum(self.bins.pop(key) for key in keys[:excess])
+        self.bins[keys[excess]] += folded
+
+    def add(self, value):
+        """Record one latency in seconds"""
+        if value <= MIN_VALUE:
+            self.zero_count += 1
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + 1
+            if len(self.bins) > self.max_bins:
+                self._fold()
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add every sample of ``other`` into this sketch"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('Cannot merge sketches with different accuracy')
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._fold()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    def percentile(self, percent):
+        """Latency in seconds at ``percent`` (0-100), or None if empty"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        if rank <= self.zero_count:
+            return self.min
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen >= rank:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+
+    def histogram(self):
+        """``(value, count)`` pairs in ascending order, zero bin first.
+
+        Values are bin midpoints, so sketches of the same accuracy report
+        identical values for the same bin and can be compared bin by bin.
+        """
+        pairs = [(0.0, self.zero_count)] if self.zero_count else []
+        pairs.extend((self._value(key), self.bins[key]) for key in sorted(self.bins))
+        return pairs
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def summary(self):
+        """Percentiles plus min/mean/max, in seconds"""
+        summary = {f"p{p:g}": self.percentile(p) for p in REPORTED_PERCENTILES}
+        summary.update({'min': self.min, 'mean': self.mean, 'max': self.max})
+        return summary
+
+    def to_dict(self):
+        """Serializable form; bins are ``[key, count]`` pairs"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_bins': self.max_bins,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'zero_count': self.zero_count,
+            'bins': [[key, self.bins[key]] for key in sorted(self.bins)]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch written by ``to_dict``"""
+        sketch = cls(data['relative_accuracy'], data['max_bins'])
+        sketch.bins = {key: count for key, count in data['bins']}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.sum = data['sum']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+
+def report_sketch(report):
+    """The latency sketch of a health or fleet report"""
+    if 'results' in report:
+        return QuantileSketch.from_dict(report['latency_sketch'])
+    return QuantileSketch.from_dict(report['performance']['latency_sketch'])
+
+
+def combine_reports(paths):
+    """Merge the latency sketches of saved health and fleet reports"""
+    combined = QuantileSketch()
+    for path in paths:
+        with open(path) as f:
+            combined.merge(report_sketch(json.load(f)))
+    return combined
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Combine the latency of saved health reports')
+    parser.add_argument('reports', nargs='+', help='health-report-*.json or fleet-report-*.json files')
+    parser.add_argument('--output', help='Write the combined sketch and summary to this JSON file')
+    args = parser.parse_args()
+
+    combined = combine_reports(args.reports)
+    summary = combined.summary()
+    print(f"📊 {combined.count} samples from {len(args.reports)} reports")
+    if combined.count:
+        print(f"Latency p50/p90/p99/p99.9: {summary['p50']:.3f}s / {summary['p90']:.3f}s / "
+              f"{summary['p99']:.3f}s / {summary['p99.9']:.3f}s (max {summary['max']:.3f}s)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'reports': args.reports, 'latency': summary,
+                       'latency_sketch': combined.to_dict()}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Normalized Findings
+Turns Bandit, Safety, Trivy and ZAP reports into one flat record shape so
+findings can be stored, compared and rendered independently of the tool.
+"""
+
+import hashlib
+import json
+import re
+
+try:
+    import ijson
+except ImportError:  # only needed to stream large Trivy reports
+    ijson = None
+
+FINDING_FIELDS = ('tool', 'rule_id', 'package', 'location', 'severity', 'title', 'context')
+
+SEVERITY_ORDER = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'INFO', 'UNKNOWN']
+
+REPORT_FILES = {
+    'bandit': 'bandit-report.json',
+    'safety': 'safety-report.json',
+    'trivy': 'trivy-report.json',
+    'zap': 'zap-report.json'
+}
+
+_CODE_LINE_NUMBER = re.compile(r'^\s*\d+\s?')
+
+
+def make_finding(tool, rule_id, package='', location='', severity='UNKNOWN', title='', context=''):
+    severity = (severity or 'UNKNOWN').upper()
+    if severity == 'INFORMATIONAL':
+        severity = 'INFO'
+    if severity not in SEVERITY_ORDER:
+        severity = 'UNKNOWN'
+    return {
+        'tool': tool,
+        'rule_id': str(rule_id or ''),
+        'package': package or '',
+        'location': location or '',
+        'severity': severity,
+        'title': title or '',
+        'context': context or ''
+    }
+
+
+def fingerprint(finding):
+    """Stable identity of a finding across builds.
+
+    Covers tool, rule/CVE, package, location and context (the flagged source
+    line for Bandit), but not line numbers or severity, so a finding keeps its
+    identity when unrelated code moves it or its rating is revised.
+    """
+    key = '\0'.join((finding['tool'], finding['rule_id'], finding['package'],
+                     finding['location'], finding['context']))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _load(file_path):
+    try:
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _bandit_context(code):
+    """Flagged source line from Bandit's numbered code excerpt, whitespace-normalized"""
+    lines = [_CODE_LINE_NUMBER.sub('', line).strip() for line in (code or '').splitlines()]
+    lines = [line for line in lines if line]
+    return ' '.join(lines[len(lines) // 2].split()) if lines else ''
+
+
+def iter_bandit_findings(file_path=REPORT_FILES['bandit']):
+    report = _load(file_path) or {}
+    for result in report.get('results', []):
+        yield make_finding(
+            'bandit', result.get('test_id'),
+            location=result.get('filename'),
+            severity=result.get('issue_severity'),
+            title=result.get('issue_text'),
+            context=_bandit_context(result.get('code'))
+        )
+
+
+def iter_safety_findings(file_path=REPORT_FILES['safety']):
+    report = _load(file_path)
+    if isinstance(report, dict):
+        # safety >= 2.0 --json: {"vulnerabilities": [{...}]}
+        for vuln in report.get('vulnerabilities', []):
+            severity = vuln.get('severity')
+            if isinstance(severity, dict):
+                severity = (severity.get('cvssv3') or {}).get('base_severity')
+            yield make_finding(
+                'safety', vuln.get('CVE') or vuln.get('vulnerability_id'),
+                package=vuln.get('package_name'),
+                location=vuln.get('analyzed_version'),
+                severity=severity,
+                title=(vuln.get('advisory') or '')[:200]
+            )
+    elif isinstance(report, list):
+        # legacy --json: [package, affected, installed, advisory, id, ...]
+        for vuln in report:
+            if isinstance(vuln, list) and len(vuln) >= 5:
+                yield make_finding('safety', vuln[4], package=vuln[0], location=vuln[2],
+                                   title=str(vuln[3])[:200])
+
+
+def _stream_trivy_vulnerabilities(file_path):
+    """Yield Trivy vulnerabilities tagged with their Target without loading the file.
+
+    Trivy writes ``Target`` before ``Vulnerabilities`` in every result, so
+    the current target is known by the time its vulnerabilities stream past.
+    """
+    item_prefix = 'Results.item.Vulnerabilities.item'
+    target = None
+    builder = None
+    try:
+        with open(file_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    if prefix == item_prefix and event == 'end_map':
+                        vuln = builder.value
+                        vuln['Target'] = target
+                        yield vuln
+                        builder = None
+                    else:
+                        builder.event(event, value)
+                elif prefix == item_prefix and event == 'start_map':
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == 'Results.item.Target':
+                    target = value
+    except FileNotFoundError:
+        return
+
+
+def iter_trivy_findings(file_path=REPORT_FILES['trivy'], stream=False):
+    """Trivy findings, read incrementally with ijson when ``stream`` is set"""
+    if stream and ijson is not None:
+        vulnerabilities = _stream_trivy_vulnerabilities(file_path)
+    else:
+        report = _load(file_path) or {}
+        vulnerabilities = (dict(vuln, Target=result.get('Target'))
+                           for result in report.get('Results') or []
+                           for vuln in result.get('Vulnerabilities') or [])
+    for vuln in vulnerabilities:
+        yield make_finding(
+            'trivy', vuln.get('VulnerabilityID'),
+            package=f"{vuln.get('PkgName', '')}@{vuln.get('InstalledVersion', '')}",
+            location=vuln.get('Target'),
+            severity=vuln.get('Severity'),
+            title=vuln.get('Title')
+        )
+
+
+def iter_zap_findings(file_path=REPORT_FILES['zap']):
+    report = _load(file_path) or {}
+    for site in report.get('site') or []:
+        for alert in site.get('alerts', []):
+            yield make_finding(
+                'zap', alert.get('pluginid'),
+                location=site.get('@name'),
+                severity=alert.get('riskdesc', '').split(' ')[0],
+                title=alert.get('alert') or alert.get('name')
+            )
+
+
+FINDING_ITERATORS = {
+    'bandit': iter_bandit_findings,
+    'safety': iter_safety_findings,
+    'trivy': iter_trivy_findings,
+    'zap': iter_zap_findings
+}
+
+
+def iter_findings(tool, stream_trivy=False):
+    """Normalized findings of one tool from its report in the working directory"""
+    if tool == 'trivy':
+        return iter_trivy_findings(stream=stream_trivy)
+    return FINDING_ITERATORS[tool]()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Findings Store
+Keeps normalized findings from every build in a local SQLite database and
+answers trend and diff questions across builds from the command line.
+
+Each distinct finding is stored once; builds only hold links to finding ids
+plus precomputed per-severity counts, so the database grows with the number
+of distinct findings rather than builds x findings, and trend queries never
+scan the link table.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+from findings import FINDING_FIELDS, SEVERITY_ORDER, fingerprint
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    build TEXT NOT NULL UNIQUE,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    tool TEXT NOT NULL,
+    rule_id TEXT NOT NULL,
+    package TEXT NOT NULL,
+    location TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    title TEXT NOT NULL,
+    context TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_rule ON findings (rule_id);
+CREATE INDEX IF NOT EXISTS findings_package ON findings (package);
+CREATE INDEX IF NOT EXISTS findings_severity ON findings (severity);
+CREATE TABLE IF NOT EXISTS build_findings (
+    build_id INTEGER NOT NULL,
+    finding_id INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    PRIMARY KEY (build_id, finding_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS build_findings_finding ON build_findings (finding_id, build_id);
+CREATE TABLE IF NOT EXISTS build_inputs (
+    build_id INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (build_id, tool)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS build_counts (
+    build_id INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (build_id, tool, severity)
+) WITHOUT ROWID;
+"""
+
+BATCH_SIZE = 5000
+
+
+class FindingsStore:
+    """SQLite-backed history of normalized findings per build"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        self.db.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _build_id(self, build):
+        row = self.db.execute('SELECT id FROM builds WHERE build = ?', (build,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown build: {build}")
+        return row['id']
+
+    def _previous_digest(self, tool, before_id):
+        return self.db.execute(
+            'SELECT build_id, digest FROM build_inputs WHERE tool = ? AND build_id < ? '
+            'ORDER BY build_id DESC LIMIT 1', (tool, before_id)).fetchone()
+
+    def _insert_findings(self, build_id, tool, findings):
+        batch = []
+
+        def flush():
+            # Severity and title are not part of the fingerprint: a re-rated
+            # finding keeps its id and counts at its latest severity from
+            # this build on, while earlier builds keep their stored counts
+            self.db.executemany(
+                'INSERT INTO findings (fingerprint, tool, rule_id, package, location, '
+                'severity, title, context) VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (fingerprint) DO UPDATE SET severity = excluded.severity, title = excluded.title',
+                [(fp, *(finding[field] for field in FINDING_FIELDS)) for fp, finding in batch])
+            self.db.executemany(
+                'INSERT OR IGNORE INTO build_findings (build_id, finding_id, tool) '
+                'SELECT ?, id, tool FROM findings WHERE fingerprint = ?',
+                [(build_id, fp) for fp, _ in batch])
+            batch.clear()
+
+        for finding in findings:
+            batch.append((fingerprint(finding), finding))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+
+    def record_build(self, build, findings_by_tool, digests=None, recorded_at=None):
+        """Append one build's findings.
+
+        ``findings_by_tool`` maps a tool name to a callable returning that
+        tool's findings. When ``digests`` shows a tool's input is identical to
+        the last build that recorded it, its links are copied instead and the
+        callable is never invoked. Recording an existing build replaces it.
+        """
+        digests = digests or {}
+        recorded_at = recorded_at or datetime.utcnow().isoformat()
+
+        with self.db:
+            existing = self.db.execute('SELECT id FROM builds WHERE build = ?', (build,)).fetchone()
+            if existing is not None:
+                self._delete_build(existing['id'])
+            build_id = self.db.execute('INSERT INTO builds (build, recorded_at) VALUES (?, ?)',
+                                       (build, recorded_at)).lastrowid
+
+            for tool, load_findings in findings_by_tool.items():
+                digest = digests.get(tool)
+                previous = self._previous_digest(tool, build_id) if digest else None
+                if previous is not None and previous['digest'] == digest:
+                    self.db.execute(
+                        'INSERT INTO build_findings (build_id, finding_id, tool) '
+                        'SELECT ?, finding_id, tool FROM build_findings WHERE build_id = ? AND tool = ?',
+                        (build_id, previous['build_id'], tool))
+                else:
+                    self._insert_findings(build_id, tool, load_findings())
+                if digest:
+                    self.db.execute('INSERT INTO build_inputs (build_id, tool, digest) VALUES (?, ?, ?)',
+                                    (build_id, tool, digest))
+
+            self.db.execute(
+                'INSERT INTO build_counts (build_id, tool, severity, count) '
+                'SELECT bf.build_id, bf.tool, f.severity, COUNT(*) FROM build_findings bf '
+                'JOIN findings f ON f.id = bf.finding_id WHERE bf.build_id = ? '
+                'GROUP BY bf.tool, f.severity', (build_id,))
+        return build_id
+
+    def _delete_build(self, build_id):
+        for table in ('build_findings', 'build_inputs', 'build_counts'):
+            self.db.execute(f'DELETE FROM {table} WHERE build_id = ?', (build_id,))
+        self.db.execute('DELETE FROM builds WHERE id = ?', (build_id,))
+
+    def builds(self, limit=None):
+        query = 'SELECT build, recorded_at FROM builds ORDER BY id DESC'
+        rows = self.db.execute(query + (' LIMIT ?' if limit else ''), (limit,) if limit else ())
+        return [dict(row) for row in rows]
+
+    def first_seen(self, rule_id):
+        """First and last build of every finding matching a rule or CVE id"""
+        rows = self.db.execute(
+            'SELECT f.tool, f.rule_id, f.package, f.location, f.severity, '
+            'fb.build AS first_build, fb.recorded_at AS first_seen_at, '
+            'lb.build AS last_build, lb.recorded_at AS last_seen_at, x.builds '
+            'FROM (SELECT finding_id, MIN(build_id) AS first_id, MAX(build_id) AS last_id, '
+            '      COUNT(*) AS builds FROM build_findings '
+            '      WHERE finding_id IN (SELECT id FROM findings WHERE rule_id = ?) '
+            '      GROUP BY finding_id) x '
+            'JOIN findings f ON f.id = x.finding_id '
+            'JOIN builds fb ON fb.id = x.first_id '
+            'JOIN builds lb ON lb.id = x.last_id '
+            'ORDER BY x.first_id', (rule_id,))
+        return [dict(row) for row in rows]
+
+    def trend(self, tool=None, severity=None, limit=None):
+        """Per-build finding counts by severity, oldest first"""
+        conditions, params = [], []
+        if tool:
+            conditions.append('c.tool = ?')
+            params.append(tool)
+        if severity:
+            conditions.append('c.severity = ?')
+            params.append(severity.upper())
+        where = f"AND {' AND '.join(conditions)}" if conditions else ''
+        columns = ', '.join(
+            f"COALESCE(SUM(CASE WHEN c.severity = '{s}' THEN c.count END), 0) AS {s.lower()}"
+            for s in SEVERITY_ORDER)
+        query = (f'SELECT b.build, b.recorded_at, {columns}, COALESCE(SUM(c.count), 0) AS total '
+                 f'FROM builds b LEFT JOIN build_counts c ON c.build_id = b.id {where} '
+                 f'GROUP BY b.id ORDER BY b.id DESC')
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return [dict(row) for row in reversed(self.db.execute(query, params).fetchall())]
+
+    def diff(self, old_build, new_build):
+        """Findings introduced and fixed between two builds"""
+        old_id, new_id = self._build_id(old_build), self._build_id(new_build)
+        query = ('SELECT f.tool, f.rule_id, f.package, f.location, f.severity, f.title '
+                 'FROM build_findings bf JOIN findings f ON f.id = bf.finding_id '
+                 'WHERE bf.build_id = ? AND NOT EXISTS (SELECT 1 FROM build_findings o '
+                 'WHERE o.build_id = ? AND o.finding_id = bf.finding_id) '
+                 'ORDER BY f.tool, f.severity, f.rule_id')
+        return {
+            'new': [dict(row) for row in self.db.execute(query, (new_id, old_id))],
+            'fixed': [dict(row) for row in self.db.execute(query, (old_id, new_id))]
+        }
+
+    def package_history(self, package):
+        """Builds in which each finding of a package was present.
+
+        Trivy packages are stored as ``name@version``; a bare name matches
+        every version through an index range scan.
+        """
+        rows = self.db.execute(
+            'SELECT f.tool, f.rule_id, f.package, f.severity, fb.build AS first_build, '
+            'lb.build AS last_build, x.builds '
+            'FROM (SELECT bf.finding_id, MIN(bf.build_id) AS first_id, MAX(bf.build_id) AS last_id, '
+            '      COUNT(*) AS builds FROM findings f JOIN build_findings bf ON bf.finding_id = f.id '
+            '      WHERE f.package = ? OR (f.package >= ? AND f.package < ?) '
+            '      GROUP BY bf.finding_id) x '
+            'JOIN findings f ON f.id = x.finding_id '
+            'JOIN builds fb ON fb.id = x.first_id '
+            'JOIN builds lb ON lb.id = x.last_id '
+            'ORDER BY f.package, f.rule_id', (package, f"{package}@", f"{package}A"))
+        return [dict(row) for row in rows]
+
+
+def print_rows(rows, as_json=False):
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        print('No results.')
+        return
+    columns = list(rows[0])
+    widths = [max(len(str(column)), *(len(str(row[column])) for row in rows)) for column in columns]
+    print('  '.join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print('  '.join(str(row[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the security findings history')
+    parser.add_argument('--db', default='security-history/findings.db', help='Findings database path')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    builds = commands.add_parser('builds', help='List recorded builds, newest first')
+    builds.add_argument('--last', type=int, help='Only the most recent N builds')
+
+    first_seen = commands.add_parser('first-seen', help='When a CVE or rule id first appeared')
+    first_seen.add_argument('rule_id')
+
+    trend = commands.add_parser('trend', help='Finding counts per build by severity')
+    trend.add_argument('--tool', choices=['bandit', 'safety', 'trivy', 'zap'])
+    trend.add_argument('--severity', choices=[s.lower() for s in SEVERITY_ORDER])
+    trend.add_argument('--last', type=int, help='Only the most recent N builds')
+
+    diff = commands.add_parser('diff', help='Findings new in and fixed by a build')
+    diff.add_argument('old_build')
+    diff.add_argument('new_build')
+
+    package = commands.add_parser('package', help='History of findings for a package')
+    package.add_argument('name')
+
+    args = parser.parse_args()
+
+    with FindingsStore(args.db) as store:
+        if args.command == 'builds':
+            print_rows(store.builds(limit=args.last), args.json)
+        elif args.command == 'first-seen':
+            print_rows(store.first_seen(args.rule_id), args.json)
+        elif args.command == 'trend':
+            print_rows(store.trend(tool=args.tool, severity=args.severity, limit=args.last), args.json)
+        elif args.command == 'diff':
+            try:
+                changes = store.diff(args.old_build, args.new_build)
+            except KeyError as e:
+                print(f"❌ {e.args[0]}")
+                sys.exit(2)
+            if args.json:
+                print(json.dumps(changes, indent=2))
+            else:
+                print(f"🆕 New in {args.new_build}: {len(changes['new'])}")
+                print_rows(changes['new'])
+                print(f"\n✅ Fixed since {args.old_build}: {len(changes['fixed'])}")
+                print_rows(changes['fixed'])
+        elif args.command == 'package':
+            print_rows(store.package_history(args.name), args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,51 @@ Security Report Generator
 Consolidates security scan results from various tools into a unified report.
 """
 
+import argparse
+import hashlib
 import json
+import multiprocessing
 import os
+import queue
 import sys
 from datetime import datetime
+from functools import partial
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
+from findings import FINDING_FIELDS, iter_findings
+from findings_store import FindingsStore
+from html_report import PAGE_SIZE, render_findings, render_report, write_report
+from report_cache import ReportCache, file_digest
+from report_diff import load_snapshot, stream_delta
+
+try:
+    import ijson
+except ImportError:  # streaming Trivy parsing is optional
+    ijson = None
+
+# Files each parser reads; a change to any of them invalidates its cached result
+PARSER_INPUTS = {
+    'bandit': ['bandit-report.json'],
+    'safety': ['safety-report.json'],
+    'trivy': ['trivy-report.json'],
+    'zap': ['zap-report.json']
+}
+
+# Plain-text tool output embedded in the HTML report
+RAW_REPORTS = {
+    'bandit': 'bandit-report.txt',
+    'safety': 'safety-report.txt',
+    'trivy': 'trivy-report.txt'
+}
+
+DEFAULT_CACHE_DIR = '.security-report-cache'
+
+FINDINGS_SNAPSHOT = 'security-reports/security-findings.json'
+
+# Trivy reports above this size are parsed incrementally when ijson is available
+TRIVY_STREAM_THRESHOLD = 64 * 1024 * 1024
+
 def load_json_report(file_path):
     """Load JSON report file if it exists"""
     try:
@@ -18,93 +57,32 @@ def load_json_report(file_path):
     except (FileNotFoundError, json.JSONDecodeError):
         return None
 
-def load_text_report(file_path):
-    """Load text report file if it exists"""
-    try:
-        with open(file_path, 'r') as f:
-            return f.read()
-    except FileNotFoundError:
-        return None
+def iter_trivy_vulnerabilities(file_path='trivy-report.json'):
+    """Yield Trivy vulnerability records one at a time.
 
-def generate_html_report(security_data):
-    """Generate HTML security report"""
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Security Report - DevSecOps Pipeline</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; }}
-            .header {{ background-color: #f8f9fa; padding: 20px; border-radius: 5px; }}
-            .section {{ margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-            .critical {{ background-color: #f8d7da; color: #721c24; }}
-            .high {{ background-color: #fff3cd; color: #856404; }}
-            .medium {{ background-color: #d4edda; color: #155724; }}
-            .low {{ background-color: #cce7ff; color: #004085; }}
-            .summary {{ background-color: #e9ecef; padding: 10px; border-radius: 3px; }}
-            pre {{ background-color: #f8f9fa; padding: 10px; border-radius: 3px; overflow-x: auto; }}
-            .timestamp {{ color: #6c757d; font-size: 0.9em; }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🛡️ DevSecOps Security Report</h1>
-            <p class="timestamp">Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-        </div>
-        
-        <div class="section summary">
-            <h2>📊 Executive Summary</h2>
-            <ul>
-                <li><strong>Total Vulnerabilities:</strong> {security_data['summary']['total_vulnerabilities']}</li>
-                <li><strong>Critical:</strong> {security_data['summary']['critical']}</li>
-                <li><strong>High:</strong> {security_data['summary']['high']}</li>
-                <li><strong>Medium:</strong> {security_data['summary']['medium']}</li>
-                <li><strong>Low:</strong> {security_data['summary']['low']}</li>
-            </ul>
-        </div>
-        
-        <div class="section">
-            <h2>🔍 Static Application Security Testing (SAST)</h2>
-            <h3>Bandit Results</h3>
-            {security_data['sast']['bandit_html']}
-        </div>
-        
-        <div class="section">
-            <h2>📦 Dependency Security Analysis</h2>
-            <h3>Safety Check Results</h3>
-            {security_data['dependencies']['safety_html']}
-            
-            <h3>OWASP Dependency Check</h3>
-            {security_data['dependencies']['owasp_html']}
-        </div>
-        
-        <div class="section">
-            <h2>🐳 Container Security</h2>
-            <h3>Trivy Scan Results</h3>
-            {security_data['container']['trivy_html']}
-        </div>
-        
-        <div class="section">
-            <h2>🎯 Dynamic Application Security Testing (DAST)</h2>
-            <h3>OWASP ZAP Results</h3>
-            {security_data['dast']['zap_html']}
-        </div>
-        
-        <div class="section">
-            <h2>📋 Recommendations</h2>
-            <ul>
-                {security_data['recommendations']}
-            </ul>
-        </div>
-    </body>
-    </html>
+    The report is read incrementally with ijson, so memory use does not
+    depend on the size of the file.
     """
-    return html_content
+    if ijson is None:
+        raise RuntimeError('Streaming Trivy parsing requires the ijson package')
+    
+    with open(file_path, 'rb') as f:
+        yield from ijson.items(f, 'Results.item.Vulnerabilities.item', use_float=True)
+
+def use_trivy_streaming(file_path, stream):
+    """Decide whether to stream: 'always', 'never' or 'auto' (large files, ijson installed)"""
+    if stream == 'always':
+        return True
+    if stream == 'never' or ijson is None:
+        return False
+    try:
+        return os.path.getsize(file_path) > TRIVY_STREAM_THRESHOLD
+    except OSError:
+        return False
 
 def parse_bandit_report():
     """Parse Bandit security scan results"""
     bandit_json = load_json_report('bandit-report.json')
-    bandit_text = load_text_report('bandit-report.txt')
     
     if bandit_json:
         results = bandit_json.get('results', [])
@@ -118,9 +96,6 @@ def parse_bandit_report():
         html = f"<div class='summary'>Found {summary['total']} issues: "
         html += f"High: {summary['high']}, Medium: {summary['medium']}, Low: {summary['low']}</div>"
         
-        if bandit_text:
-            html += f"<pre>{bandit_text[:2000]}{'...' if len(bandit_text) > 2000 else ''}</pre>"
-        
         return {'summary': summary, 'html': html}
     
     return {'summary': {'total': 0, 'high': 0, 'medium': 0, 'low': 0}, 'html': '<p>No Bandit report found.</p>'}
@@ -128,7 +103,6 @@ def parse_bandit_report():
 def parse_safety_report():
     """Parse Safety dependency check results"""
     safety_json = load_json_report('safety-report.json')
-    safety_text = load_text_report('safety-report.txt')
     
     if safety_json:
         vulnerabilities = safety_json if isinstance(safety_json, list) else []
@@ -136,31 +110,43 @@ def parse_safety_report():
         
         html = f"<div class='summary'>Found {summary['total']} vulnerable dependencies</div>"
         
-        if safety_text:
-            html += f"<pre>{safety_text[:1500]}{'...' if len(safety_text) > 1500 else ''}</pre>"
-        
         return {'summary': summary, 'html': html}
     
     return {'summary': {'total': 0}, 'html': '<p>No Safety report found.</p>'}
 
-def parse_trivy_report():
+def count_trivy_severities(vulnerabilities):
+    """Count vulnerabilities by severity from any iterable of Trivy records"""
+    total_vulns = 0
+    severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+    
+    for vuln in vulnerabilities:
+        total_vulns += 1
+        severity = vuln.get('Severity', 'UNKNOWN')
+        if severity in severity_counts:
+            severity_counts[severity] += 1
+    
+    return total_vulns, severity_counts
+
+def parse_trivy_report(stream='auto'):
     """Parse Trivy container scan results"""
-    trivy_json = load_json_report('trivy-report.json')
-    trivy_text = load_text_report('trivy-report.txt')
+    counts = None
     
-    if trivy_json:
-        results = trivy_json.get('Results', [])
-        total_vulns = 0
-        severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-        
-        for result in results:
-            vulnerabilities = result.get('Vulnerabilities', [])
-            total_vulns += len(vulnerabilities)
-            
-            for vuln in vulnerabilities:
-                severity = vuln.get('Severity', 'UNKNOWN')
-                if severity in severity_counts:
-                    severity_counts[severity] += 1
+    if use_trivy_streaming('trivy-report.json', stream):
+        if os.path.exists('trivy-report.json'):
+            try:
+                counts = count_trivy_severities(iter_trivy_vulnerabilities('trivy-report.json'))
+            except ijson.JSONError:
+                counts = None
+    else:
+        trivy_json = load_json_report('trivy-report.json')
+        if trivy_json:
+            counts = count_trivy_severities(
+                vuln for result in trivy_json.get('Results') or []
+                for vuln in result.get('Vulnerabilities') or []
+            )
+    
+    if counts:
+        total_vulns, severity_counts = counts
         
         summary = {
             'total': total_vulns,
@@ -174,9 +160,6 @@ def parse_trivy_report():
         html += f"Critical: {summary['critical']}, High: {summary['high']}, "
         html += f"Medium: {summary['medium']}, Low: {summary['low']}</div>"
         
-        if trivy_text:
-            html += f"<pre>{trivy_text[:2000]}{'...' if len(trivy_text) > 2000 else ''}</pre>"
-        
         return {'summary': summary, 'html': html}
     
     return {'summary': {'total': 0, 'critical': 0, 'high': 0, 'medium': 0, 'low': 0}, 'html': '<p>No Trivy report found.</p>'}
@@ -239,6 +222,16 @@ def generate_recommendations(security_data):
     if security_data['container']['summary']['total'] > 10:
         recommendations.append("🐳 Review and update base container images")
     
+    # Changes since the baseline build
+    delta = security_data.get('delta')
+    if delta:
+        if delta['new']['total'] > 0:
+            recommendations.append(
+                f"🆕 Triage {delta['new']['total']} findings introduced since the baseline "
+                f"({delta['new']['critical']} critical, {delta['new']['high']} high)")
+        if delta['fixed']['total'] > 0:
+            recommendations.append(f"✅ {delta['fixed']['total']} findings were fixed since the baseline")
+    
     # General recommendations
     recommendations.extend([
         "🔄 Implement regular security scanning in CI/CD pipeline",
@@ -249,8 +242,204 @@ def generate_recommendations(security_data):
     
     return '\n'.join([f"<li>{rec}</li>" for rec in recommendations])
 
+def skipped_result(name):
+    """Placeholder for a parser that did not run"""
+    empty = {
+        'bandit': {'total': 0, 'high': 0, 'medium': 0, 'low': 0},
+        'safety': {'total': 0},
+        'trivy': {'total': 0, 'critical': 0, 'high': 0, 'medium': 0, 'low': 0},
+        'zap': {'total': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0}
+    }
+    return {
+        'summary': dict(empty[name]),
+        'html': '<p>Skipped: the security gate had already failed.</p>',
+        'skipped': True
+    }
+
+def calculate_summary(results):
+    """Overall counts from the per-tool results (missing tools count as zero)"""
+    def count(name, key):
+        return results[name]['summary'].get(key, 0) if name in results else 0
+    
+    return {
+        'total_vulnerabilities': sum(count(name, 'total') for name in ('bandit', 'safety', 'trivy', 'zap')),
+        'critical': count('trivy', 'critical'),
+        'high': count('bandit', 'high') + count('trivy', 'high') + count('zap', 'high'),
+        'medium': count('bandit', 'medium') + count('trivy', 'medium') + count('zap', 'medium'),
+        'low': count('bandit', 'low') + count('trivy', 'low') + count('zap', 'low')
+    }
+
+def gate_decision(summary):
+    """Return (exit_code, message) for the build based on the overall summary"""
+    if summary['critical'] > 0:
+        return 1, "❌ Critical vulnerabilities found - failing build"
+    if summary['high'] > 10:
+        return 1, "⚠️ Too many high severity vulnerabilities - consider failing build"
+    return 0, "✅ Security scan completed within acceptable limits"
+
+def run_parsers(parsers, executor='process', jobs=None, short_circuit=False, results=None):
+    """Run report parsers concurrently and return (results, skipped names).
+
+    ``parsers`` maps a tool name to a picklable callable. Parsers run on a
+    process pool (JSON decoding is CPU bound) or a thread pool. With
+    ``short_circuit`` the remaining parsers are abandoned as soon as the
+    results collected so far already fail the gate; counts only grow as more
+    reports arrive, so the decision cannot change. ``results`` may hold
+    results already known (e.g. from the cache); they count towards the gate.
+    """
+    results = dict(results or {})
+    pending = [name for name in parsers if name not in results]
+    
+    def gate_failed():
+        return short_circuit and gate_decision(calculate_summary(results))[0] != 0
+    
+    if not pending or gate_failed():
+        return results, pending
+    
+    if executor == 'serial':
+        for name in pending:
+            results[name] = parsers[name]()
+            if gate_failed():
+                break
+        return results, [name for name in parsers if name not in results]
+    
+    pool_class = multiprocessing.Pool if executor == 'process' else ThreadPool
+    pool = pool_class(jobs or len(pending))
+    completed = queue.Queue()
+    
+    try:
+        for name in pending:
+            pool.apply_async(
+                parsers[name],
+                callback=lambda result, name=name: completed.put((name, result, None)),
+                error_callback=lambda error, name=name: completed.put((name, None, error))
+            )
+        
+        while len(results) < len(parsers):
+            name, result, error = completed.get()
+            if error is not None:
+                raise error
+            results[name] = result
+            if gate_failed():
+                break
+    finally:
+        # Stops parsers still running after a short circuit. Thread workers
+        # cannot be killed, so abandoned ones are left to finish as daemons.
+        pool.terminate()
+        if executor == 'process' or len(results) == len(parsers):
+            pool.join()
+    
+    return results, [name for name in parsers if name not in results]
+
+def consolidate_security_data(results, delta=None):
+    """Merge per-tool parser results into the report structure"""
+    security_data = {
+        'summary': calculate_summary(results),
+        'sast': {
+            'bandit_html': results['bandit']['html']
+        },
+        'dependencies': {
+            'safety': results['safety'],
+            'safety_html': results['safety']['html'],
+            'owasp_html': '<p>OWASP Dependency Check results integrated in Jenkins.</p>'
+        },
+        'container': results['trivy'],
+        'dast': results['zap'],
+        'recommendations': ''
+    }
+    if delta is not None:
+        security_data['delta'] = delta
+    
+    # Generate recommendations
+    security_data['recommendations'] = generate_recommendations(security_data)
+    
+    return security_data
+
+def cached_findings(cache, tool, key, load):
+    """A tool's findings, read from the cache rows or parsed once and stored"""
+    rows = cache.rows(tool, key, lambda: ([finding[field] for field in FINDING_FIELDS] for finding in load()))
+    return (dict(zip(FINDING_FIELDS, row)) for row in rows)
+
+def finding_loaders(tools, stream_trivy='auto', cache=None, keys=None):
+    """Callables returning a generator over each tool's findings.
+
+    With a cache, a report's normalized findings are stored the first time
+    it is parsed, keyed by its content, and every later reader (the delta,
+    the history store, the findings tables, the next builds) reads them
+    back, so each report is parsed at most once.
+    """
+    stream = use_trivy_streaming(PARSER_INPUTS['trivy'][0], stream_trivy)
+    loaders = {tool: partial(iter_findings, tool, stream_trivy=stream) for tool in tools}
+    if cache is None:
+        return loaders
+    version = file_digest(Path(__file__).with_name('findings.py'))
+    for tool in tools:
+        key = hashlib.sha256(f"{keys[tool]}\0{version}".encode()).hexdigest()
+        loaders[tool] = partial(cached_findings, cache, tool, key, loaders[tool])
+    return loaders
+
+def findings_tables(tools, stream_trivy='auto', page_size=PAGE_SIZE, cache=None, keys=None):
+    """Callables yielding each tool's HTML findings table.
+
+    With a cache, a table is rendered once per report content (and renderer
+    version) and streamed back from disk on later builds, so an unchanged
+    report is neither parsed nor rendered again.
+    """
+    loaders = finding_loaders(tools, stream_trivy, cache, keys)
+    tables = {}
+    renderer = ''
+    if cache is not None:
+        renderer = ''.join(file_digest(Path(__file__).with_name(module))
+                           for module in ('findings.py', 'html_report.py'))
+    for tool in tools:
+        render = partial(lambda load: render_findings(load(), page_size), loaders[tool])
+        if cache is None:
+            tables[tool] = render
+        else:
+            key = hashlib.sha256(f"{keys[tool]}\0{page_size}\0{renderer}".encode()).hexdigest()
+            tables[tool] = partial(cache.fragment, tool, key, render)
+    return tables
+
+def record_findings_history(store_path, build_id, tools, stream_trivy='auto', cache=None, keys=None):
+    """Append this build's normalized findings to the history store"""
+    findings_by_tool = finding_loaders(tools, stream_trivy, cache, keys)
+    digests = {tool: file_digest(PARSER_INPUTS[tool][0]) for tool in tools}
+    
+    with FindingsStore(store_path) as store:
+        store.record_build(build_id, findings_by_tool, digests=digests)
+    print(f"🗄️ Recorded findings for build {build_id} in {store_path}")
+
 def main():
     """Main function to generate security report"""
+    parser = argparse.ArgumentParser(description='Consolidate security scan results into one report')
+    parser.add_argument('--stream-trivy', choices=['auto', 'always', 'never'], default='auto',
+                        help='Parse trivy-report.json incrementally (auto: when larger than 64 MB)')
+    parser.add_argument('--executor', choices=['process', 'thread', 'serial'], default='process',
+                        help='Run the report parsers on a process pool, a thread pool or one after another')
+    parser.add_argument('--jobs', type=int, help='Parser pool size (default: one per parser)')
+    parser.add_argument('--short-circuit', action='store_true',
+                        help='Stop waiting for remaining parsers once the gate has already failed '
+                             '(absolute gate only)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Directory for parsed results keyed by input file hashes')
+    parser.add_argument('--no-cache', action='store_true', help='Parse every report from scratch')
+    parser.add_argument('--invalidate-cache', action='store_true',
+                        help='Clear the cache before parsing (results are cached again afterwards)')
+    parser.add_argument('--baseline', help='Findings snapshot of a previous build to diff against')
+    parser.add_argument('--write-findings', action='store_true',
+                        help=f'Write this build\'s findings snapshot to {FINDINGS_SNAPSHOT} '
+                             '(implied by --baseline)')
+    parser.add_argument('--gate', choices=['absolute', 'delta'], default='absolute',
+                        help='Fail on all findings (absolute) or only on findings new since --baseline (delta)')
+    parser.add_argument('--store', help='Append normalized findings to this SQLite history database')
+    parser.add_argument('--build-id', default=os.environ.get('BUILD_NUMBER'),
+                        help='Build identifier for the history store (default: $BUILD_NUMBER or a timestamp)')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE,
+                        help='Findings per collapsible table page in the HTML report')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Leave the per-finding tables out of the HTML report')
+    args = parser.parse_args()
+    
     # Set UTF-8 encoding for Windows compatibility
     if sys.platform.startswith('win'):
         import io
@@ -263,80 +452,101 @@ def main():
     os.makedirs('security-reports', exist_ok=True)
     
     # Parse individual security tool reports
-    bandit_data = parse_bandit_report()
-    safety_data = parse_safety_report()
-    trivy_data = parse_trivy_report()
-    zap_data = parse_zap_report()
-    
-    # Calculate overall summary
-    total_vulnerabilities = (
-        bandit_data['summary']['total'] +
-        safety_data['summary']['total'] +
-        trivy_data['summary']['total'] +
-        zap_data['summary']['total']
-    )
-    
-    total_critical = trivy_data['summary']['critical']
-    total_high = (bandit_data['summary']['high'] + 
-                 trivy_data['summary']['high'] + 
-                 zap_data['summary']['high'])
-    total_medium = (bandit_data['summary']['medium'] + 
-                   trivy_data['summary']['medium'] + 
-                   zap_data['summary']['medium'])
-    total_low = (bandit_data['summary']['low'] + 
-                trivy_data['summary']['low'] + 
-                zap_data['summary']['low'])
-    
-    # Consolidate security data
-    security_data = {
-        'summary': {
-            'total_vulnerabilities': total_vulnerabilities,
-            'critical': total_critical,
-            'high': total_high,
-            'medium': total_medium,
-            'low': total_low
-        },
-        'sast': {
-            'bandit_html': bandit_data['html']
-        },
-        'dependencies': {
-            'safety': safety_data,
-            'safety_html': safety_data['html'],
-            'owasp_html': '<p>OWASP Dependency Check results integrated in Jenkins.</p>'
-        },
-        'container': trivy_data,
-        'dast': zap_data,
-        'recommendations': ''
+    parsers = {
+        'bandit': parse_bandit_report,
+        'safety': parse_safety_report,
+        'trivy': partial(parse_trivy_report, stream=args.stream_trivy),
+        'zap': parse_zap_report
     }
+    cache = None
+    cached_results = {}
+    keys = {}
+    if not args.no_cache:
+        cache = ReportCache(args.cache_dir, code_version=file_digest(__file__))
+        if args.invalidate_cache:
+            cache.clear()
+        for name in parsers:
+            keys[name] = cache.key(name, PARSER_INPUTS[name])
+            result = cache.get(name, keys[name])
+            if result is not None:
+                cached_results[name] = result
+        if cache.hits:
+            print(f"♻️ Reusing cached results for unchanged reports: {', '.join(cache.hits)}")
     
-    # Generate recommendations
-    security_data['recommendations'] = generate_recommendations(security_data)
+    # The short circuit judges absolute counts; under the delta gate old
+    # findings must not stop the tools that may hold the new ones
+    short_circuit = args.short_circuit and args.gate == 'absolute'
+    if args.short_circuit and not short_circuit:
+        print("⚠️ --short-circuit has no effect with --gate delta")
+    
+    results, skipped = run_parsers(parsers, executor=args.executor, jobs=args.jobs,
+                                   short_circuit=short_circuit, results=cached_results)
+    
+    if cache is not None:
+        for name, result in results.items():
+            if name not in cached_results:
+                cache.put(name, keys[name], result)
+    
+    for name in skipped:
+        results[name] = skipped_result(name)
+    
+    parsed_tools = [name for name in parsers if name not in skipped]
     
-    # Generate HTML report
-    html_report = generate_html_report(security_data)
+    # Snapshot this build's findings and diff them against the baseline build
+    delta = None
+    if args.baseline or args.write_findings or args.gate == 'delta':
+        baseline = None
+        if args.baseline or args.gate == 'delta':
+            baseline = {}
+            if args.baseline and os.path.exists(args.baseline):
+                baseline = load_snapshot(args.baseline)
+            else:
+                print("⚠️ No baseline findings snapshot found - treating every finding as new")
+        loaders = finding_loaders(parsed_tools, args.stream_trivy, cache, keys)
+        delta = stream_delta((finding for load in loaders.values() for finding in load()),
+                             baseline, FINDINGS_SNAPSHOT, args.baseline)
     
-    # Write HTML report
-    with open('security-reports/security-summary.html', 'w') as f:
-        f.write(html_report)
+    # Record findings history (tools whose report is unchanged are not read)
+    if args.store:
+        record_findings_history(args.store, args.build_id or datetime.utcnow().strftime('%Y%m%d%H%M%S'),
+                                parsed_tools, args.stream_trivy, cache, keys)
+    
+    # Consolidate security data
+    security_data = consolidate_security_data(results, delta)
+    if skipped:
+        security_data['skipped_parsers'] = skipped
+    summary = security_data['summary']
+    
+    # Write HTML report, streaming full findings tables from the tool reports
+    findings_html = {}
+    if not args.summary_only:
+        findings_html = findings_tables(parsed_tools, args.stream_trivy, args.page_size, cache, keys)
+    write_report('security-reports/security-summary.html',
+                 render_report(security_data, findings_html, RAW_REPORTS))
     
     # Generate JSON summary
     with open('security-reports/security-summary.json', 'w') as f:
         json.dump(security_data, f, indent=2)
     
     print(f"✅ Security report generated successfully!")
-    print(f"📊 Total vulnerabilities found: {total_vulnerabilities}")
-    print(f"🚨 Critical: {total_critical}, High: {total_high}, Medium: {total_medium}, Low: {total_low}")
+    if skipped:
+        print(f"⏭️ Skipped after gate failure: {', '.join(skipped)}")
+    print(f"📊 Total vulnerabilities found: {summary['total_vulnerabilities']}")
+    print(f"🚨 Critical: {summary['critical']}, High: {summary['high']}, "
+          f"Medium: {summary['medium']}, Low: {summary['low']}")
+    
+    if delta is not None:
+        print(f"🔀 Since baseline: {delta['new']['total']} new "
+              f"(Critical: {delta['new']['critical']}, High: {delta['new']['high']}), "
+              f"{delta['fixed']['total']} fixed")
     
     # Set exit code based on critical/high vulnerabilities
-    if total_critical > 0:
-        print("❌ Critical vulnerabilities found - failing build")
-        sys.exit(1)
-    elif total_high > 10:
-        print("⚠️ Too many high severity vulnerabilities - consider failing build")
-        sys.exit(1)
+    if args.gate == 'delta':
+        exit_code, message = gate_decision(delta['new'])
     else:
-        print("✅ Security scan completed within acceptable limits")
-        sys.exit(0)
+        exit_code, message = gate_decision(summary)
+    print(message)
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+HTML Security Report
+Renders the consolidated report as a stream of chunks so every finding and
+the complete raw tool output can be included while memory use stays bounded
+by one table page, whatever the size of the scanned reports.
+"""
+
+from datetime import datetime
+from functools import partial
+from html import escape
+
+# Findings per collapsible table page
+PAGE_SIZE = 1000
+
+# Characters of raw tool output read and escaped at a time
+TEXT_CHUNK_SIZE = 64 * 1024
+
+FINDING_COLUMNS = (('severity', 'Severity'), ('rule_id', 'Rule'), ('package', 'Package'),
+                   ('location', 'Location'), ('title', 'Title'))
+
+DELTA_COLUMNS = (('severity', 'Severity'), ('tool', 'Tool')) + FINDING_COLUMNS[1:]
+
+# (heading, [(subheading, tool)]) in page order; None marks static content
+SECTIONS = [
+    ('🔍 Static Application Security Testing (SAST)', [('Bandit Results', 'bandit')]),
+    ('📦 Dependency Security Analysis', [('Safety Check Results', 'safety'),
+                                        ('OWASP Dependency Check', None)]),
+    ('🐳 Container Security', [('Trivy Scan Results', 'trivy')]),
+    ('🎯 Dynamic Application Security Testing (DAST)', [('OWASP ZAP Results', 'zap')])
+]
+
+STYLE = """
+            body { font-family: Arial, sans-serif; margin: 20px; }
+            .header { background-color: #f8f9fa; padding: 20px; border-radius: 5px; }
+            .section { margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }
+            .critical { background-color: #f8d7da; color: #721c24; }
+            .high { background-color: #fff3cd; color: #856404; }
+            .medium { background-color: #d4edda; color: #155724; }
+            .low { background-color: #cce7ff; color: #004085; }
+            .summary { background-color: #e9ecef; padding: 10px; border-radius: 3px; }
+            pre { background-color: #f8f9fa; padding: 10px; border-radius: 3px; overflow-x: auto; }
+            .timestamp { color: #6c757d; font-size: 0.9em; }
+            details { margin: 8px 0; }
+            summary { cursor: pointer; font-weight: bold; }
+            table { border-collapse: collapse; width: 100%; }
+            th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: left; font-size: 0.9em; }
+"""
+
+
+def finding_row(finding, columns=FINDING_COLUMNS):
+    cells = ''.join(f"<td>{escape(finding[field])}</td>" for field, _ in columns)
+    return f"<tr class='{finding['severity'].lower()}'>{cells}</tr>"
+
+
+def table_header(columns=FINDING_COLUMNS):
+    return '<tr>' + ''.join(f"<th>{label}</th>" for _, label in columns) + '</tr>'
+
+
+def render_findings(findings, page_size=PAGE_SIZE):
+    """Findings table split into collapsible pages of ``page_size`` rows.
+
+    Only the rows of the current page are held while rendering; ``findings``
+    may be a generator reading straight from the tool report.
+    """
+    header = table_header()
+    page = []
+    total = 0
+
+    def flush(first):
+        return (f"<details{' open' if first else ''}><summary>Findings {total - len(page) + 1}"
+                f"&ndash;{total}</summary><table>{header}{''.join(page)}</table></details>\n")
+
+    yield "<details class='findings'><summary>All findings</summary>\n"
+    for finding in findings:
+        page.append(finding_row(finding))
+        total += 1
+        if len(page) == page_size:
+            yield flush(total == page_size)
+            page = []
+    if page:
+        yield flush(total == len(page))
+    if total == 0:
+        yield '<p>No findings.</p>'
+    yield f"<p>{total} findings in total.</p></details>\n"
+
+
+def render_raw_text(file_path, chunk_size=TEXT_CHUNK_SIZE):
+    """Complete raw tool output as an escaped, collapsed ``<pre>`` block"""
+    try:
+        f = open(file_path, 'r', errors='replace')
+    except FileNotFoundError:
+        return
+    with f:
+        yield f"<details><summary>Raw output ({escape(file_path)})</summary><pre>"
+        for chunk in iter(partial(f.read, chunk_size), ''):
+            yield escape(chunk)
+        yield '</pre></details>\n'
+
+
+def render_delta(delta):
+    """Section for the changes since the baseline build"""
+    if not delta:
+        return
+    new = delta['new']
+    yield f"""
+        <div class="section">
+            <h2>🔀 Changes Since Baseline</h2>
+            <div class='summary'>New: {new['total']} (Critical: {new['critical']}, High: {new['high']}),
+            Fixed: {delta['fixed']['total']}, Unchanged: {delta['unchanged']}</div>
+            <table>
+                {table_header(DELTA_COLUMNS)}
+    """
+    for finding in delta['new_findings']:
+        yield finding_row(finding, DELTA_COLUMNS)
+    yield '</table>'
+    shown = len(delta['new_findings'])
+    if shown < new['total']:
+        yield f"<p>Showing {shown} of {new['total']} new findings.</p>"
+    yield '</div>'
+
+
+def render_report(security_data, findings_html=None, raw_reports=None):
+    """Yield the HTML report in chunks.
+
+    ``findings_html`` maps a tool to a callable returning the chunks of its
+    findings table (see :func:`render_findings`) and ``raw_reports`` maps a
+    tool to its plain-text output file; both are optional and only read
+    while their section is being rendered.
+    """
+    findings_html = findings_html or {}
+    raw_reports = raw_reports or {}
+    summary = security_data['summary']
+    tool_html = {
+        'bandit': security_data['sast']['bandit_html'],
+        'safety': security_data['dependencies']['safety_html'],
+        'trivy': security_data['container']['html'],
+        'zap': security_data['dast']['html'],
+        None: security_data['dependencies']['owasp_html']
+    }
+
+    yield f"""<!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <title>Security Report - DevSecOps Pipeline</title>
+        <style>{STYLE}        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🛡️ DevSecOps Security Report</h1>
+            <p class="timestamp">Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+        </div>
+
+        <div class="section summary">
+            <h2>📊 Executive Summary</h2>
+            <ul>
+                <li><strong>Total Vulnerabilities:</strong> {summary['total_vulnerabilities']}</li>
+                <li><strong>Critical:</strong> {summary['critical']}</li>
+                <li><strong>High:</strong> {summary['high']}</li>
+                <li><strong>Medium:</strong> {summary['medium']}</li>
+                <li><strong>Low:</strong> {summary['low']}</li>
+            </ul>
+        </div>
+    """
+    yield from render_delta(security_data.get('delta'))
+
+    for heading, tools in SECTIONS:
+        yield f'\n        <div class="section">\n            <h2>{heading}</h2>\n'
+        for subheading, tool in tools:
+            yield f"            <h3>{subheading}</h3>\n            {tool_html[tool]}\n"
+            if tool in findings_html:
+                yield from findings_html[tool]()
+            if tool in raw_reports:
+                yield from render_raw_text(raw_reports[tool])
+        yield '        </div>\n'
+
+    yield f"""
+        <div class="section">
+            <h2>📋 Recommendations</h2>
+            <ul>
+                {security_data['recommendations']}
+            </ul>
+        </div>
+    </body>
+    </html>
+    """
+
+
+def write_report(file_path, chunks):
+    """Write rendered chunks to ``file_path`` as they are produced"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Security Report Cache
+Stores each parser's result keyed by a hash of its input files, so
+unchanged scanner reports are not parsed again on the next build.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path):
+    """SHA-256 of a file's content, or 'missing' when it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return 'missing'
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """Content-addressed store of parsed scanner results.
+
+    A key covers the parser name, the parser code version and the content of
+    every input file, so any change to either produces a miss.
+    """
+
+    def __init__(self, directory, code_version=''):
+        self.directory = Path(directory)
+        self.code_version = code_version
+        self.hits = []
+        self.misses = []
+
+    def key(self, name, input_paths):
+        digest = hashlib.sha256()
+        digest.update(f"{name}\0{self.code_version}\0".encode())
+        for path in input_paths:
+            digest.update(f"{path}\0{file_digest(path)}\0".encode())
+        return digest.hexdigest()
+
+    def _path(self, name, key):
+        return self.directory / f"{name}-{key}.json"
+
+    def get(self, name, key):
+        """Cached result for ``name`` and ``key``, or None"""
+        try:
+            with open(self._path(name, key), 'r') as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses.append(name)
+            return None
+        self.hits.append(name)
+        return result
+
+    def put(self, name, key, result):
+        """Store a result, replacing older entries for the same parser"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stale in self.directory.glob(f"{name}-*.json"):
+            stale.unlink()
+
+        # Write then rename so a killed build never leaves a truncated entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(result, f)
+        os.replace(temp_path, self._path(name, key))
+
+    def _fragment_path(self, name, key):
+        return self.directory / f"{name}.fragment-{key}.html"
+
+    def fragment(self, name, key, render, chunk_size=CHUNK_SIZE):
+        """Yield a cached text fragment, rendering and storing it on a miss.
+
+        ``render`` returns an iterable of text chunks. A hit streams the
+        stored file back, so large fragments are never held in memory.
+        """
+        path = self._fragment_path(name, key)
+        try:
+            f = open(path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            pass
+        else:
+            self.hits.append(f"{name} fragment")
+            with f:
+                yield from iter(lambda: f.read(chunk_size), '')
+            return
+
+        self.misses.append(f"{name} fragment")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for chunk in render():
+                    f.write(chunk)
+                    yield chunk
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        for stale in self.directory.glob(f"{name}.fragment-*.html"):
+            stale.unlink()
+        os.replace(temp_path, path)
+
+    def _rows_path(self, name, key):
+        return self.directory / f"{name}.rows-{key}.jsonl"
+
+    def rows(self, name, key, produce):
+        """Yield cached JSON rows, producing and storing them on a miss.
+
+        ``produce`` returns an iterable of JSON-serializable rows, stored one
+        per line so a hit reads them back without loading the whole file.
+        """
+        path = self._rows_path(name, key)
+        try:
+            f = open(path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            pass
+        else:
+            self.hits.append(f"{name} rows")
+            with f:
+                for line in f:
+                    yield json.loads(line)
+            return
+
+        self.misses.append(f"{name} rows")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for row in produce():
+                    f.write(json.dumps(row, separators=(',', ':')) + '\n')
+                    yield row
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        for stale in self.directory.glob(f"{name}.rows-*.jsonl"):
+            stale.unlink()
+        os.replace(temp_path, path)
+
+    def clear(self):
+        """Remove every cached entry"""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Security Report Diff
+Compares this build's findings with a baseline snapshot by fingerprint so
+the gate and the report can focus on what a change introduced or fixed.
+"""
+
+import heapq
+import json
+from contextlib import nullcontext
+
+from findings import SEVERITY_ORDER, fingerprint
+
+SNAPSHOT_VERSION = 1
+
+# Fields kept in a snapshot row after the fingerprint
+SNAPSHOT_FIELDS = ('tool', 'rule_id', 'package', 'location', 'severity', 'title')
+
+_SEVERITY_RANK = {severity: i for i, severity in enumerate(SEVERITY_ORDER)}
+
+
+def snapshot_finding(row):
+    """Finding dict for a snapshot row (the context is not stored)"""
+    return dict(zip(SNAPSHOT_FIELDS, row), context='')
+
+
+class SnapshotWriter:
+    """Writes a findings snapshot row by row, so no build has to hold all of its findings"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._rows = 0
+
+    def __enter__(self):
+        self._file = open(self.path, 'w')
+        self._file.write(json.dumps({'version': SNAPSHOT_VERSION, 'fields': SNAPSHOT_FIELDS},
+                                    separators=(',', ':'))[:-1] + ',"findings":[')
+        return self
+
+    def add(self, fp, finding):
+        row = json.dumps([fp, *(finding[field] for field in SNAPSHOT_FIELDS)], separators=(',', ':'))
+        self._file.write(f",{row}" if self._rows else row)
+        self._rows += 1
+
+    def __exit__(self, *exc_info):
+        self._file.write(']}')
+        self._file.close()
+
+
+def load_snapshot(path):
+    """Load a baseline snapshot as a fingerprint index of compact row tuples"""
+    with open(path, 'r') as f:
+        snapshot = json.load(f)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported findings snapshot version: {snapshot.get('version')}")
+    return {row[0]: tuple(row[1:]) for row in snapshot['findings']}
+
+
+def _empty_counts():
+    return {severity.lower(): 0 for severity in SEVERITY_ORDER}
+
+
+def _severity_key(finding):
+    return (_SEVERITY_RANK[finding['severity']], finding['tool'], finding['rule_id'])
+
+
+def _listed(finding):
+    return {field: finding[field] for field in SNAPSHOT_FIELDS}
+
+
+def _counted(findings, counts):
+    """Pass findings through while counting them by severity into ``counts``"""
+    for finding in findings:
+        counts[finding['severity'].lower()] += 1
+        yield finding
+
+
+def stream_delta(findings, baseline=None, snapshot_path=None, baseline_path=None, limit=100):
+    """Snapshot and diff a build's findings in a single pass.
+
+    ``findings`` may be a generator reading straight from the tool reports:
+    each finding is written to ``snapshot_path`` and compared with
+    ``baseline`` as it arrives, and only its fingerprint is kept. Returns the
+    report's delta section, with new and fixed findings counted by severity
+    and the ``limit`` most severe of each listed, or None without a
+    baseline. The lookups are dict hits, so the pass is linear in the
+    number of findings.
+    """
+    seen = set()
+    new_counts = _empty_counts()
+
+    def new_findings(writer):
+        for finding in findings:
+            fp = fingerprint(finding)
+            if fp in seen:
+                continue
+            seen.add(fp)
+            if writer is not None:
+                writer.add(fp, finding)
+            if baseline is not None and fp not in baseline:
+                yield finding
+
+    with SnapshotWriter(snapshot_path) if snapshot_path else nullcontext() as writer:
+        top_new = heapq.nsmallest(limit, _counted(new_findings(writer), new_counts), key=_severity_key)
+
+    if baseline is None:
+        return None
+
+    fixed_counts = _empty_counts()
+    fixed = (snapshot_finding(row) for fp, row in baseline.items() if fp not in seen)
+    top_fixed = heapq.nsmallest(limit, _counted(fixed, fixed_counts), key=_severity_key)
+
+    new_counts['total'] = sum(new_counts.values())
+    fixed_counts['total'] = sum(fixed_counts.values())
+    return {
+        'baseline': baseline_path,
+        'new': new_counts,
+        'fixed': fixed_counts,
+        'unchanged': len(seen) - new_counts['total'],
+        'new_findings': [_listed(f) for f in top_new],
+        'fixed_findings': [_listed(f) for f in top_fixed]
+    }
@@ -13,6 +13,7 @@ setup(
         "Werkzeug>=2.3.0",
         "requests>=2.31.0",
         "gunicorn>=21.0.0",
+        "prometheus-client>=0.17.0",
     ],
     extras_require={
         "dev": [
@@ -22,9 +23,21 @@ setup(
             "flake8>=6.1.0",
             "isort>=5.12.0",
         ],
+        "async": [
+            "gevent>=23.9.0",
+        ],
+        "fast": [
+            "orjson>=3.8.0",
+            "brotli>=1.1.0",
+            "zstandard>=0.22.0",
+        ],
         "security": [
             "bandit>=1.7.0",
             "safety>=2.3.0",
+        ],
+        "monitoring": [
+            "aiohttp>=3.9.0",
+            "PyYAML>=6.0",
         ]
     },
     python_requires=">=3.8",
@@ -1,31 +1,111 @@
-from flask import Flask, jsonify, request
+from flask import Flask, request
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
+import sys
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+if __package__ in (None, ''):
+    # Started as ``python src/app.py``; make the ``src`` package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.compression import DEFAULT_MIN_SIZE, Compression
+from src.json_provider import FastJSONProvider
+from src.log_pipeline import configure_logging
+from src.metrics import Metrics, multiprocess_enabled
+from src.probes import Probes
+from src.rate_limit import AdmissionController, RateLimiter
+from src.request_timing import RequestTimer
+from src.response_cache import ResponseCache
+from src.sampling_profiler import Profiling
+
+# Structured logs written in batches by a background thread; LOG_SAMPLE_RATE=N
+# keeps one in N INFO/DEBUG records per message
+configure_logging(level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+                  fmt=os.environ.get('LOG_FORMAT', 'json'),
+                  sample_rate=int(os.environ.get('LOG_SAMPLE_RATE', '1')))
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# orjson-backed encoding (stdlib fallback) that serializes datetimes natively
+app.json = FastJSONProvider(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
 app.config['VERSION'] = os.environ.get('APP_VERSION', '1.0.0')
+# Worker settings, filled in by gunicorn's post_worker_init hook
+app.config['SERVER'] = None
+# Bearer token unlocking the /debug endpoints; they answer 404 without one
+app.config['DEBUG_TOKEN'] = os.environ.get('DEBUG_TOKEN')
+app.config['SERVER_TIMING'] = os.environ.get('SERVER_TIMING', 'true').lower() == 'true'
+app.config['SLOW_REQUEST_LOG_MS'] = float(os.environ.get('SLOW_REQUEST_LOG_MS', '1000'))
+app.config['PROFILE_SECONDS'] = float(os.environ.get('PROFILE_SECONDS', '30'))
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', '/tmp/profiles')
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE))
+app.config['READINESS_TTL'] = float(os.environ.get('READINESS_TTL', '5'))
+# Token buckets as "rate:burst" per second; an empty value disables a limit
+app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+app.config['RATE_LIMIT_CLIENT'] = os.environ.get('RATE_LIMIT_CLIENT', '100:200')
+app.config['RATE_LIMIT_USER'] = os.environ.get('RATE_LIMIT_USER', '20:40')
+app.config['RATE_LIMIT_REDIS_URL'] = os.environ.get('RATE_LIMIT_REDIS_URL')
+app.config['ADMISSION_MAX_IN_FLIGHT'] = int(os.environ.get('ADMISSION_MAX_IN_FLIGHT', '64'))
+app.config['ADMISSION_MAX_QUEUE_MS'] = int(os.environ.get('ADMISSION_MAX_QUEUE_MS', '2000'))
+# Proxy hops in front of the app (the ingress is one); their X-Forwarded-For
+# and X-Request-Start are trusted, so rate limits key on the real client
+app.config['TRUSTED_PROXIES'] = int(os.environ.get('TRUSTED_PROXIES', '0'))
+if app.config['TRUSTED_PROXIES']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'],
+                            x_proto=app.config['TRUSTED_PROXIES'])
+
+# Static payloads are encoded (and compressed) once per VERSION/SERVER and
+# served with ETags
+response_cache = ResponseCache(app, config_keys=('VERSION', 'SERVER', 'COMPRESS_MIN_SIZE'))
+
+# gzip/brotli/zstd for every other response above COMPRESS_MIN_SIZE bytes
+compression = Compression(app)
+
+# Routing/handler/serialization phases in Server-Timing plus the slowest
+# requests at /debug/slow-requests
+request_timer = RequestTimer(app)
+
+# Idle until a profile is requested via SIGUSR2 or /debug/profile
+profiling = Profiling(app)
+
+# Prometheus request metrics exported at /metrics
+metrics = Metrics(app)
+
+# 429 for clients or users over their budget, 503 once the process is saturated
+rate_limiter = RateLimiter(app)
+admission = AdmissionController(app)
+
+def request_user_id():
+    user_id = request.args.get('user_id')
+    return user_id if user_id and user_id.isdigit() else None
+
+# /livez and /readyz for container probes; /health stays for existing monitors
+probes = Probes(app)
+
+@probes.check('metrics_storage')
+def metrics_storage():
+    """Multiprocess metrics need a writable directory shared by the workers"""
+    if multiprocess_enabled():
+        directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+        return os.path.isdir(directory) and os.access(directory, os.W_OK)
 
 @app.route('/health')
 def health_check():
     """Health check endpoint for monitoring"""
-    return jsonify({
+    return {
         'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': datetime.now(timezone.utc),
         'version': app.config['VERSION']
-    }), 200
+    }, 200
 
 @app.route('/api/info')
+@response_cache.cached
 def app_info():
     """Application information endpoint"""
-    return jsonify({
+    return {
         'name': 'DevSecOps Demo Application',
         'version': app.config['VERSION'],
         'description': 'A sample application demonstrating DevSecOps practices',
@@ -34,51 +114,60 @@ def app_info():
             'Automated CI/CD pipeline',
             'Container security',
             'Monitoring and alerting'
-        ]
-    }), 200
+        ],
+        'server': app.config['SERVER']
+    }
 
 @app.route('/api/secure-data')
+@rate_limiter.limit(user_id=request_user_id)
+@admission.admit
 def secure_data():
     """Endpoint demonstrating secure data handling"""
     # Input validation
     user_id = request.args.get('user_id')
     if not user_id or not user_id.isdigit():
-        return jsonify({'error': 'Invalid user ID'}), 400
+        return {'error': 'Invalid user ID'}, 400
     
     # Simulated secure data response
-    return jsonify({
+    return {
         'user_id': int(user_id),
         'data': 'This is secure data',
-        'access_time': datetime.utcnow().isoformat()
-    }), 200
+        'access_time': datetime.now(timezone.utc)
+    }, 200
 
 @app.route('/')
+@response_cache.cached
 def index():
     """Main page"""
-    return jsonify({
+    return {
         'message': 'Welcome to DevSecOps Demo Application',
         'version': app.config['VERSION'],
         'endpoints': {
             'health': '/health',
+            'liveness': '/livez',
+            'readiness': '/readyz',
             'info': '/api/info',
             'secure_data': '/api/secure-data?user_id=123'
         }
-    }), 200
+    }
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({'error': 'Endpoint not found'}), 404
+    return {'error': 'Endpoint not found'}, 404
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    logger.error(f"Internal server error: {error}")
-    return jsonify({'error': 'Internal server error'}), 500
+    logger.error("Internal server error: %s", error)
+    return {'error': 'Internal server error'}, 500
+
+response_cache.warm()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('DEBUG', 'False').lower() == 'true'
     
-    logger.info(f"Starting DevSecOps Demo Application v{app.config['VERSION']}")
+    logger.info("Starting DevSecOps Demo Application v%s", app.config['VERSION'])
+    profiling.install_signal_handler()
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -0,0 +1,122 @@
+"""
+Response Compression
+Negotiates zstd, brotli or gzip from ``Accept-Encoding`` and compresses JSON
+and text responses at or above ``COMPRESS_MIN_SIZE`` bytes. brotli and
+zstandard are optional; without them only gzip is offered.
+"""
+
+import gzip
+import threading
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+DEFAULT_MIN_SIZE = 500
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/plain', 'text/css',
+                      'application/javascript')
+
+
+def _gzip(level):
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(quality):
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def _zstd(level):
+    # ZstdCompressor instances are not thread-safe and gthread workers
+    # compress responses concurrently, so each thread gets its own
+    local = threading.local()
+
+    def compress(data):
+        compressor = getattr(local, 'compressor', None)
+        if compressor is None:
+            compressor = local.compressor = zstandard.ZstdCompressor(level=level)
+        return compressor.compress(data)
+    return compress
+
+
+def codecs(precompressed=False):
+    """Available encoders in server preference order.
+
+    Per-request compression uses fast levels; bodies compressed once ahead
+    of time use the strongest ones, since their cost is paid only once.
+    """
+    available = {}
+    if zstandard is not None:
+        available['zstd'] = _zstd(19 if precompressed else 3)
+    if brotli is not None:
+        available['br'] = _brotli(11 if precompressed else 4)
+    available['gzip'] = _gzip(9 if precompressed else 6)
+    return available
+
+
+def negotiate(encodings):
+    """Best encoding from ``encodings`` the client accepts, or None for identity"""
+    return request.accept_encodings.best_match(encodings) if encodings else None
+
+
+def precompress(body, min_size=DEFAULT_MIN_SIZE):
+    """Every available encoding of ``body``, or {} when it is below ``min_size``"""
+    if len(body) < min_size:
+        return {}
+    variants = {}
+    for encoding, compress in codecs(precompressed=True).items():
+        compressed = compress(body)
+        # Incompressible bodies are cheaper to send as they are
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+class Compression:
+    """Flask extension compressing eligible responses after the view ran.
+
+    Responses that already carry a ``Content-Encoding`` (such as the
+    precomputed variants served by the response cache), streamed responses
+    and anything below the size threshold pass through untouched.
+    """
+
+    def __init__(self, app=None):
+        self._codecs = codecs()
+        self.encodings = tuple(self._codecs)
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE)
+        app.after_request(self.compress_response)
+        app.extensions['compression'] = self
+
+    def compress_response(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        if (response.content_length or 0) < self.app.config['COMPRESS_MIN_SIZE']:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(self.encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(self._codecs[encoding](response.get_data()))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
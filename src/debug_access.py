@@ -0,0 +1,29 @@
+"""
+Debug Access
+Guards diagnostic endpoints with a bearer token from ``DEBUG_TOKEN``. Without
+a token configured the endpoints answer 404, as if they did not exist.
+"""
+
+import hmac
+from functools import wraps
+
+from flask import abort, current_app, request
+
+
+def debug_authorized():
+    """True when the request carries the configured debug token"""
+    token = current_app.config.get('DEBUG_TOKEN')
+    if not token:
+        return False
+    scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def debug_only(view):
+    """Decorator hiding a view from requests without the debug token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not debug_authorized():
+            abort(404)
+        return view(*args, **kwargs)
+    return wrapper
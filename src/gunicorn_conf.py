@@ -0,0 +1,107 @@
+"""
+Gunicorn Configuration
+Server settings for the production image plus the hooks Prometheus
+multiprocess mode needs.
+
+``GUNICORN_WORKER_CLASS=gevent`` serves requests on greenlets: each worker
+then holds up to ``worker_connections`` concurrent keep-alive connections,
+so slow clients no longer tie up a whole process. The Flask routes run
+unchanged under either worker class.
+
+Workers and threads are derived from the container's cgroup CPU quota and
+memory limit (see ``src/server_tuning.py``); ``GUNICORN_WORKERS`` and
+``GUNICORN_THREADS`` override them. With ``preload_app`` the app is imported
+once in the master and shared copy-on-write with the forked workers.
+"""
+
+import gc
+import importlib.util
+import os
+import shutil
+
+
+def _load_sibling(name):
+    """Import a module next to this file; gunicorn loads the config by path,
+    so neither ``src`` nor this directory is guaranteed to be on sys.path"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"_gunicorn_conf_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+server_tuning = _load_sibling('server_tuning')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+tuned = server_tuning.detect(
+    worker_class,
+    worker_memory_mb=int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', server_tuning.WORKER_MEMORY_MB)))
+workers = int(os.environ.get('GUNICORN_WORKERS') or os.environ.get('WEB_CONCURRENCY') or tuned['workers'])
+threads = int(os.environ.get('GUNICORN_THREADS') or tuned['threads'])
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# gunicorn executes this file as ``__config__``; importing it anywhere else
+# (tests, tooling) must not monkey-patch the importing process
+if __name__ == '__config__' and preload_app and worker_class == 'gevent':
+    # The app is imported in the master, so patch before anything creates
+    # sockets, locks or threads that the workers would inherit unpatched
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def server_settings(cfg):
+    """Effective settings reported by /api/info"""
+    return {
+        'worker_class': cfg.worker_class_str,
+        'workers': cfg.workers,
+        'threads': cfg.threads,
+        'worker_connections': cfg.worker_connections,
+        'timeout': cfg.timeout,
+        'preload_app': cfg.preload_app,
+        'limits': tuned['limits']
+    }
+
+
+def on_starting(server):
+    """Start every deployment with an empty multiprocess metrics directory"""
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def when_ready(server):
+    server.log.info("Serving with %s", server_settings(server.cfg))
+
+
+def pre_fork(server, worker):
+    """Move preloaded objects out of the GC's reach so collections in the
+    workers do not touch (and copy) the pages shared with the master"""
+    if server.cfg.preload_app:
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    """Hand the effective server settings to the app and let ``kill -USR2
+    <worker pid>`` profile that worker (gunicorn resets worker signal
+    handlers during init, so this is the earliest point to install it)"""
+    config = getattr(worker.wsgi, 'config', None)
+    if config is not None:
+        config['SERVER'] = server_settings(worker.cfg)
+    profiling = getattr(worker.wsgi, 'extensions', {}).get('profiling')
+    if profiling is not None:
+        profiling.install_signal_handler()
+
+
+def child_exit(server, worker):
+    """Drop live gauges of a worker that exited so /metrics stays accurate"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,235 @@
+"""
+Log Pipeline
+Structured JSON logging that never makes a request thread wait on the log
+sink. Records go onto a bounded queue; a background writer formats them and
+writes each batch with one call. When the queue is full records are
+dropped and counted instead of blocking, and high-volume INFO/DEBUG
+messages can be sampled down per message template.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+import weakref
+from datetime import datetime, timezone
+from functools import partial
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 0.2
+
+# Message templates tracked by the sampler before its counts start over
+MAX_SAMPLED_TEMPLATES = 10000
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def _dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode('utf-8')
+    return json.dumps(payload, default=str, separators=(',', ':'))
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and any
+    ``extra`` fields"""
+
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        return _dumps(payload)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in ``rate`` records of each INFO/DEBUG message template;
+    warnings and errors always pass.
+
+    Non-string messages (a dict logged as structured data, say) may be
+    unhashable and differ on every call, so they are grouped by call site.
+    """
+
+    def __init__(self, rate=1):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self.sampled_out = 0
+        self._seen = {}
+
+    def filter(self, record):
+        if self.rate == 1 or record.levelno >= logging.WARNING:
+            return True
+        if isinstance(record.msg, str):
+            key = (record.name, record.msg)
+        else:
+            key = (record.name, record.pathname, record.lineno)
+        if len(self._seen) >= MAX_SAMPLED_TEMPLATES and key not in self._seen:
+            self._seen.clear()
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        if seen % self.rate == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+def _restart_after_fork(handler_ref):
+    handler = handler_ref()
+    if handler is not None and not handler._stopped:
+        handler._after_fork()
+
+
+class BatchingQueueHandler(logging.Handler):
+    """Enqueues records for a background writer thread.
+
+    Unlike ``logging.handlers.QueueHandler`` the message is not formatted
+    by the caller: ``%``-style arguments are rendered later on the writer
+    thread, so a record that is dropped or sampled out costs almost nothing.
+    Exceptions are rendered up front because tracebacks pin their frames.
+    """
+
+    def __init__(self, stream=None, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stderr
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._reported_drops = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._stopped = False
+        self._start()
+        # Threads do not survive fork; gunicorn workers need their own writer.
+        # Fork hooks cannot be unregistered, so the hook only holds a weak
+        # reference and does nothing once the handler is closed or collected.
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=partial(_restart_after_fork, weakref.ref(self)))
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._start()
+
+    def emit(self, record):
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self):
+        """Block for the first record, then take whatever else is queued"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or batch[-1] is None:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            stop = None in batch
+            lines = []
+            for record in batch:
+                if record is None:
+                    continue
+                try:
+                    lines.append(self.format(record))
+                except Exception:
+                    self.handleError(record)
+            dropped = self.dropped
+            if dropped != self._reported_drops:
+                lines.append(_dumps({
+                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'level': 'WARNING', 'logger': __name__,
+                    'message': f"Log queue full, dropped {dropped - self._reported_drops} records",
+                    'dropped_total': dropped
+                }))
+                self._reported_drops = dropped
+            if lines:
+                try:
+                    self.stream.write('\n'.join(lines) + '\n')
+                    self.stream.flush()
+                    self.written += len(lines)
+                except Exception:
+                    pass
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """Wait until every queued record has been written"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        self._stopped = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        super().close()
+
+
+def configure_logging(level=logging.INFO, fmt='json', sample_rate=1, stream=None,
+                      queue_size=DEFAULT_QUEUE_SIZE, force=False):
+    """Route the root logger through a batching queue handler.
+
+    Like ``logging.basicConfig`` this does nothing when the root logger
+    already has handlers (a test runner, an embedding server) unless
+    ``force`` is set. ``fmt='text'`` keeps the classic
+    ``LEVEL:logger:message`` lines, still written asynchronously. Returns
+    the handler, or None when nothing was configured.
+    """
+    root = logging.getLogger()
+    if root.handlers and not force:
+        return None
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+        existing.close()
+
+    handler = BatchingQueueHandler(stream=stream, queue_size=queue_size)
+    handler.setFormatter(JSONFormatter() if fmt == 'json' else logging.Formatter(logging.BASIC_FORMAT))
+    handler.addFilter(SamplingFilter(sample_rate))
+    root.addHandler(handler)
+    root.setLevel(level)
+    atexit.register(handler.close)
+    return handler
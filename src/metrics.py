@@ -0,0 +1,107 @@
+"""
+Prometheus Metrics
+Per-route latency histograms, status counters and an in-flight gauge,
+exported at /metrics. Under gunicorn, set PROMETHEUS_MULTIPROC_DIR so every
+worker writes to shared files and /metrics aggregates all of them.
+"""
+
+import os
+import time
+
+from flask import Response
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry,
+                               Counter, Gauge, Histogram, generate_latest, multiprocess)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+def multiprocess_enabled():
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+class Metrics:
+    """Flask extension recording request metrics with minimal per-request work.
+
+    Requests are timed by a WSGI middleware around ``app.wsgi_app`` rather
+    than Flask request hooks, which each cost a dispatch per request. The
+    route template is read from the request werkzeug keeps in the WSGI
+    environ while the response starts, and labelled children are resolved
+    once per (method, endpoint, status) and cached, so the hot path is a
+    dict lookup plus the metric updates.
+    """
+
+    def __init__(self, app=None, registry=REGISTRY, path='/metrics'):
+        self.registry = registry
+        self.path = path
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'HTTP request latency in seconds',
+            ['method', 'endpoint'], buckets=LATENCY_BUCKETS, registry=registry)
+        self.requests_total = Counter(
+            'http_requests_total', 'Total HTTP requests',
+            ['method', 'endpoint', 'status'], registry=registry)
+        self.in_progress = Gauge(
+            'http_requests_in_progress', 'HTTP requests currently being served',
+            multiprocess_mode='livesum', registry=registry)
+        self._children = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.wsgi_app = self._instrument(app.wsgi_app)
+        app.add_url_rule(self.path, 'metrics', self.export)
+        app.extensions['metrics'] = self
+
+    def _series(self, method, endpoint, status):
+        key = (method, endpoint, status)
+        series = self._children.get(key)
+        if series is None:
+            series = (self.request_duration.labels(method, endpoint),
+                      self.requests_total.labels(method, endpoint, status))
+            self._children[key] = series
+        return series
+
+    def _instrument(self, wsgi_app):
+        perf_counter = time.perf_counter
+        in_progress = self.in_progress
+        series = self._series
+        path = self.path
+
+        def instrumented(environ, start_response):
+            if environ.get('PATH_INFO') == path:
+                return wsgi_app(environ, start_response)
+
+            status = '500'
+            endpoint = 'unmatched'
+
+            def capture_status(status_line, headers, exc_info=None):
+                # Called inside the request context, before Flask clears the
+                # request from the environ
+                nonlocal status, endpoint
+                status = status_line[:3]
+                # Route template rather than path keeps label cardinality bounded
+                rule = getattr(environ.get('werkzeug.request'), 'url_rule', None)
+                if rule is not None:
+                    endpoint = rule.rule
+                return start_response(status_line, headers, exc_info)
+
+            start = perf_counter()
+            in_progress.inc()
+            try:
+                return wsgi_app(environ, capture_status)
+            finally:
+                elapsed = perf_counter() - start
+                in_progress.dec()
+                duration, total = series(environ.get('REQUEST_METHOD', 'GET'), endpoint, status)
+                duration.observe(elapsed)
+                total.inc()
+
+        return instrumented
+
+    def export(self):
+        """Prometheus text exposition of this worker or, in multiprocess mode, all workers"""
+        if multiprocess_enabled():
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = self.registry
+        return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,157 @@
+"""
+Health Probes
+Liveness and readiness endpoints for container orchestrators. ``/livez`` only
+proves the process still answers and serves pre-encoded bytes; ``/readyz``
+runs the registered dependency checks concurrently, each under its own
+timeout, and caches the outcome for ``READINESS_TTL`` seconds so probe storms
+across replicas do not multiply the load on shared backends.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import Response
+
+LIVE_BODY = b'{"status":"alive"}\n'
+LIVE_HEADERS = [('Content-Type', 'application/json'), ('Content-Length', str(len(LIVE_BODY))),
+                ('Cache-Control', 'no-store')]
+
+DEFAULT_TTL = 5.0
+DEFAULT_CHECK_TIMEOUT = 2.0
+
+
+class ReadinessResult:
+    """Encoded /readyz response and the time it stops being reusable"""
+
+    __slots__ = ('status_code', 'body', 'expires')
+
+    def __init__(self, status_code, body, expires):
+        self.status_code = status_code
+        self.body = body
+        self.expires = expires
+
+
+class Probes:
+    """Flask extension serving ``/livez`` and ``/readyz``.
+
+    ``/livez`` is answered by a WSGI middleware before Flask routing, so it
+    neither allocates a response object nor shows up in the request metrics.
+    Readiness checks are plain callables registered with :meth:`check`; a
+    check passes unless it raises or returns False.
+    """
+
+    def __init__(self, app=None, live_path='/livez', ready_path='/readyz', max_workers=4):
+        self.live_path = live_path
+        self.ready_path = ready_path
+        self.max_workers = max_workers
+        self._checks = {}
+        self._result = None
+        self._lock = threading.Lock()
+        self._executor = None
+        self._running = {}
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('READINESS_TTL', DEFAULT_TTL)
+        app.config.setdefault('READINESS_CHECK_TIMEOUT', DEFAULT_CHECK_TIMEOUT)
+        app.wsgi_app = self._serve_liveness(app.wsgi_app)
+        app.add_url_rule(self.ready_path, 'readyz', self.readyz)
+        app.extensions['probes'] = self
+
+    def _serve_liveness(self, wsgi_app):
+        path = self.live_path
+        body = [LIVE_BODY]
+
+        def liveness(environ, start_response):
+            if environ.get('PATH_INFO') == path:
+                start_response('200 OK', LIVE_HEADERS)
+                return body
+            return wsgi_app(environ, start_response)
+
+        return liveness
+
+    def check(self, name, timeout=None):
+        """Decorator registering a readiness check under ``name``"""
+        def register(func):
+            self._checks[name] = (func, timeout)
+            self.invalidate()
+            return func
+        return register
+
+    def invalidate(self):
+        """Forget the cached readiness result"""
+        self._result = None
+
+    def _run(self, func):
+        start = time.perf_counter()
+        try:
+            ok = func() is not False
+            error = None if ok else 'check returned False'
+        except Exception as e:
+            ok, error = False, str(e) or e.__class__.__name__
+        return ok, error, time.perf_counter() - start
+
+    def _submit(self, name, func):
+        """Start a check, unless its previous run is still going.
+
+        A timed-out check keeps its pool thread until it returns; starting it
+        again on every probe would let one hung dependency take over the
+        whole pool. Until it finishes, later probes wait on the same run.
+        """
+        future = self._running.get(name)
+        if future is None or future.done():
+            future = self._running[name] = self._executor.submit(self._run, func)
+        return future
+
+    def run_checks(self):
+        """Run every check concurrently; returns (ready, {name: result})"""
+        if self._executor is None:
+            # Created on first use so preloaded apps start it in each worker
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='readyz')
+        default_timeout = self.app.config['READINESS_CHECK_TIMEOUT']
+        start = time.perf_counter()
+        futures = {name: (self._submit(name, func), timeout or default_timeout)
+                   for name, (func, timeout) in self._checks.items()}
+
+        results = {}
+        for name, (future, timeout) in futures.items():
+            remaining = max(0.0, start + timeout - time.perf_counter())
+            try:
+                ok, error, duration = future.result(timeout=remaining)
+                results[name] = {'status': 'ok' if ok else 'failed', 'duration': round(duration, 6)}
+                if error:
+                    results[name]['error'] = error
+            except TimeoutError:
+                # The check keeps running in its thread; only the probe stops waiting
+                results[name] = {'status': 'timeout', 'duration': timeout}
+        return all(result['status'] == 'ok' for result in results.values()), results
+
+    def _refresh(self, now):
+        ready, checks = self.run_checks()
+        payload = {'status': 'ready' if ready else 'not ready', 'checks': checks}
+        body = f"{self.app.json.dumps(payload)}\n".encode('utf-8')
+        self._result = ReadinessResult(200 if ready else 503, body,
+                                       now + self.app.config['READINESS_TTL'])
+        return self._result
+
+    def readiness(self):
+        """Cached readiness result, refreshed by at most one caller at a time"""
+        now = time.monotonic()
+        result = self._result
+        if result is None or now >= result.expires:
+            with self._lock:
+                result = self._result
+                if result is None or now >= result.expires:
+                    result = self._refresh(now)
+        return result
+
+    def readyz(self):
+        result = self.readiness()
+        response = Response(result.body, status=result.status_code, mimetype='application/json')
+        response.headers['Cache-Control'] = 'no-store'
+        return response
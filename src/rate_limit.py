@@ -0,0 +1,269 @@
+"""
+Rate Limiting and Admission Control
+Token buckets keyed by client address and by ``user_id`` answer floods with
+429, and a per-process concurrency limit sheds excess load with 503 before
+queued requests drive latency up for everyone.
+
+Buckets live in process memory by default. ``RATE_LIMIT_REDIS_URL`` moves
+them to Redis so every worker and replica shares the same budget; the
+``redis`` package is then required. If Redis is unreachable requests are
+let through rather than failed.
+
+Clients are told apart by ``request.remote_addr``. Behind a proxy set
+``TRUSTED_PROXIES`` to the number of proxy hops so the app applies
+``ProxyFix`` and the address comes from ``X-Forwarded-For``.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+
+from flask import jsonify, request
+
+DEFAULT_MAX_KEYS = 100000
+
+logger = logging.getLogger(__name__)
+
+# Atomic refill-and-take on a Redis hash; returns {allowed, retry_after_ms}
+REDIS_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, retry_after}
+"""
+
+
+@lru_cache(maxsize=64)
+def parse_limit(value):
+    """``"20:40"`` -> (20.0 tokens per second, burst of 40); empty disables"""
+    if not value:
+        return None
+    rate, _, burst = str(value).partition(':')
+    rate = float(rate)
+    burst = float(burst) if burst else max(1.0, rate)
+    if not rate > 0 or not burst >= 1:
+        raise ValueError(f"Rate limit needs a positive rate and a burst of at least 1: {value!r}")
+    return rate, burst
+
+
+class LocalBuckets:
+    """In-process token buckets; the least recently used keys are evicted
+    beyond ``max_keys`` so a flood of distinct clients cannot grow memory"""
+
+    def __init__(self, max_keys=DEFAULT_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst):
+        """Take one token; returns (allowed, seconds until the next token)"""
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0.0
+            return False, (1 - bucket[0]) / rate
+
+
+def _redis_errors():
+    try:
+        import redis
+    except ImportError:
+        return (OSError,)
+    return (redis.RedisError, OSError)
+
+
+class RedisBuckets:
+    """Token buckets shared through Redis, updated atomically by a Lua script.
+
+    When Redis cannot be reached the request is allowed: an outage of the
+    limiter should not become an outage of the API.
+    """
+
+    def __init__(self, client, prefix='ratelimit:', clock=time.time):
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+        self._take = client.register_script(REDIS_TAKE_SCRIPT)
+        self._errors = _redis_errors()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def take(self, key, rate, burst):
+        try:
+            allowed, retry_after_ms = self._take(keys=[self.prefix + key], args=[rate, burst, self.clock()])
+        except self._errors as e:
+            logger.warning('Rate limit backend unavailable, allowing request: %s', e)
+            return True, 0.0
+        return bool(allowed), retry_after_ms / 1000
+
+
+def _rejected(status, error, retry_after):
+    response = jsonify({'error': error})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+class RateLimiter:
+    """Per-client and per-user token buckets in front of a view.
+
+    Limits come from ``RATE_LIMIT_CLIENT`` and ``RATE_LIMIT_USER`` as
+    ``"rate:burst"`` strings; each check is one bucket update.
+    """
+
+    def __init__(self, app=None, backend=None):
+        self.backend = backend
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('RATE_LIMIT_ENABLED', True)
+        app.config.setdefault('RATE_LIMIT_CLIENT', '100:200')
+        app.config.setdefault('RATE_LIMIT_USER', '20:40')
+        app.config.setdefault('RATE_LIMIT_REDIS_URL', None)
+        app.config.setdefault('TRUSTED_PROXIES', 0)
+        # Fail at startup rather than on the first request
+        parse_limit(app.config['RATE_LIMIT_CLIENT'])
+        parse_limit(app.config['RATE_LIMIT_USER'])
+        if self.backend is None:
+            url = app.config['RATE_LIMIT_REDIS_URL']
+            self.backend = RedisBuckets.from_url(url) if url else LocalBuckets()
+        app.extensions['rate_limiter'] = self
+
+    def check(self, user_id=None):
+        """Return a 429 response when a bucket is empty, else None"""
+        config = self.app.config
+        if not config['RATE_LIMIT_ENABLED']:
+            return None
+        checks = [('client', f"client:{request.remote_addr}", config['RATE_LIMIT_CLIENT'])]
+        if user_id is not None:
+            checks.append(('user', f"user:{user_id}", config['RATE_LIMIT_USER']))
+
+        for scope, key, limit in checks:
+            limit = parse_limit(limit)
+            if limit is None:
+                continue
+            allowed, retry_after = self.backend.take(key, *limit)
+            if not allowed:
+                return _rejected(429, f"Rate limit exceeded for this {scope}", retry_after)
+        return None
+
+    def limit(self, user_id=None):
+        """Decorator; ``user_id`` extracts the user key from the request"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                rejected = self.check(user_id() if user_id else None)
+                return rejected if rejected is not None else view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+def parse_request_start(value):
+    """Epoch seconds from an ``X-Request-Start`` header, or None.
+
+    Proxies disagree on the unit: nginx's ``t=${msec}`` sends seconds with
+    a fraction, others milliseconds, Apache's ``t=%t`` microseconds. As in
+    APM agents the unit is told apart by magnitude, which is unambiguous
+    for any time after 1973.
+    """
+    try:
+        stamp = float(value[2:] if value.startswith('t=') else value)
+    except ValueError:
+        return None
+    if not math.isfinite(stamp) or stamp <= 0:
+        return None
+    for scale in (1, 1e3, 1e6):
+        if stamp < 1e11 * scale:
+            return stamp / scale
+    return stamp / 1e9
+
+
+class AdmissionController:
+    """Caps concurrent requests per process and sheds the rest with 503.
+
+    Requests beyond ``ADMISSION_MAX_IN_FLIGHT`` are refused immediately
+    instead of queueing behind slow ones. When a trusted proxy stamps
+    ``X-Request-Start`` (``TRUSTED_PROXIES`` > 0), requests that already
+    waited longer than ``ADMISSION_MAX_QUEUE_MS`` are shed as well, since
+    their client has likely given up. Without one the header is ignored:
+    it would come straight from the client.
+    """
+
+    def __init__(self, app=None):
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('ADMISSION_MAX_IN_FLIGHT', 64)
+        app.config.setdefault('ADMISSION_MAX_QUEUE_MS', 2000)
+        app.config.setdefault('TRUSTED_PROXIES', 0)
+        app.extensions['admission'] = self
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _queued_too_long(self):
+        started = request.headers.get('X-Request-Start', '')
+        if not started or not self.app.config['TRUSTED_PROXIES']:
+            return False
+        started = parse_request_start(started)
+        if started is None:
+            return False
+        return (time.time() - started) * 1000 > self.app.config['ADMISSION_MAX_QUEUE_MS']
+
+    def admit(self, view):
+        """Decorator admitting a request only while capacity is left"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if self._queued_too_long():
+                return _rejected(503, 'Server overloaded, request queued too long', 1)
+            with self._lock:
+                if self._in_flight >= self.app.config['ADMISSION_MAX_IN_FLIGHT']:
+                    return _rejected(503, 'Server overloaded, try again later', 1)
+                self._in_flight += 1
+            try:
+                return view(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+        return wrapper
@@ -0,0 +1,168 @@
+"""
+Request Timing
+Splits every request into routing, handler and serialization phases,
+reports them in a ``Server-Timing`` header and keeps the slowest requests
+with their breakdown for ``/debug/slow-requests``.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from flask import request
+
+from src.debug_access import debug_only
+
+logger = logging.getLogger(__name__)
+
+# [start, routed] of the request being served by this thread or greenlet
+_marks = ContextVar('request_timing_marks', default=None)
+PHASES = ('routing', 'handler', 'serialization')
+
+
+class SlowRequests:
+    """The ``size`` slowest requests seen, kept in a min-heap so a request
+    faster than all of them is rejected with one comparison"""
+
+    def __init__(self, size=50):
+        self.size = size
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def would_keep(self, total):
+        if self.size <= 0:
+            return False
+        with self._lock:
+            return len(self._heap) < self.size or total > self._heap[0][0]
+
+    def add(self, total, record):
+        if self.size <= 0:
+            return
+        with self._lock:
+            entry = (total, next(self._counter), record)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, entry)
+            elif total > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def slowest(self):
+        with self._lock:
+            entries = sorted(self._heap, reverse=True)
+        return [record for _, _, record in entries]
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+
+class RequestTimer:
+    """Flask extension timing request phases with monotonic clocks.
+
+    A WSGI middleware stamps the start, a wrapper around
+    ``app.dispatch_request`` marks where routing (context push and
+    ``before_request`` hooks) ends and the view starts, and a wrapper
+    around ``app.finalize_request`` times turning the return value into a
+    response, ``after_request`` hooks included. Marks are kept in a context
+    variable, so no Flask hooks, ``g`` or request proxy lookups are added to
+    the request path.
+    """
+
+    def __init__(self, app=None):
+        self.slow_requests = SlowRequests()
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('SERVER_TIMING', True)
+        app.config.setdefault('SLOW_REQUESTS_KEPT', 50)
+        app.config.setdefault('SLOW_REQUEST_LOG_MS', 1000)
+        self.slow_requests.size = app.config['SLOW_REQUESTS_KEPT']
+
+        app.wsgi_app = self._stamp(app.wsgi_app)
+        app.dispatch_request = self._time_dispatch(app.dispatch_request)
+        app.finalize_request = self._time_finalize(app.finalize_request)
+        app.add_url_rule('/debug/slow-requests', 'slow_requests', debug_only(self.export))
+        app.extensions['request_timing'] = self
+
+    def _stamp(self, wsgi_app):
+        perf_counter = time.perf_counter
+        set_marks = _marks.set
+        reset_marks = _marks.reset
+
+        def stamped(environ, start_response):
+            token = set_marks([perf_counter(), None])
+            try:
+                return wsgi_app(environ, start_response)
+            finally:
+                reset_marks(token)
+
+        return stamped
+
+    def _time_dispatch(self, dispatch_request):
+        perf_counter = time.perf_counter
+        get_marks = _marks.get
+
+        def timed_dispatch():
+            marks = get_marks()
+            if marks is None:
+                return dispatch_request()
+            marks[1] = perf_counter()
+            return dispatch_request()
+
+        return timed_dispatch
+
+    def _time_finalize(self, finalize_request):
+        perf_counter = time.perf_counter
+        get_marks = _marks.get
+
+        def timed_finalize(rv, from_error_handler=False):
+            marks = get_marks()
+            if marks is None:
+                return finalize_request(rv, from_error_handler)
+            finalizing = perf_counter()
+            response = finalize_request(rv, from_error_handler)
+            self._finish(response, marks, finalizing, perf_counter())
+            return response
+
+        return timed_finalize
+
+    def _finish(self, response, marks, finalizing, end):
+        start, routed = marks
+        # A before_request hook that answered itself skips dispatch entirely;
+        # error handlers count towards the handler phase
+        routed = routed or finalizing
+        durations = (routed - start, finalizing - routed, end - finalizing)
+        total = end - start
+
+        if self.app.config['SERVER_TIMING']:
+            response.headers['Server-Timing'] = (
+                'routing;dur=%.3f, handler;dur=%.3f, serialization;dur=%.3f, total;dur=%.3f'
+                % (durations[0] * 1000, durations[1] * 1000, durations[2] * 1000, total * 1000))
+
+        total_ms = total * 1000
+        slow = total_ms >= self.app.config['SLOW_REQUEST_LOG_MS']
+        if slow or self.slow_requests.would_keep(total):
+            record = {
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.url_rule.rule if request.url_rule else None,
+                'status': response.status_code,
+                'total_ms': round(total_ms, 3),
+                'phases_ms': {name: round(d * 1000, 3) for name, d in zip(PHASES, durations)},
+                'timestamp': datetime.now(timezone.utc)
+            }
+            self.slow_requests.add(total, record)
+            if slow:
+                logger.warning("Slow request %s %s took %.1f ms: %s", record['method'],
+                               record['path'], total_ms, record['phases_ms'])
+
+    def export(self):
+        """Slowest requests first, with their phase breakdown"""
+        return {'slowest': self.slow_requests.slowest(), 'kept': self.slow_requests.size}
@@ -0,0 +1,103 @@
+"""
+Response Cache
+Serves pre-encoded JSON bodies with strong ETags for endpoints whose payload
+only depends on application configuration, together with compressed variants
+built once at the strongest compression levels.
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import Response, request
+
+from src.compression import DEFAULT_MIN_SIZE, negotiate, precompress
+
+
+class CachedResponse:
+    """Encoded body, its compressed variants and validator for one cached endpoint"""
+
+    __slots__ = ('key', 'body', 'etag', 'variants')
+
+    def __init__(self, key, body, etag, variants=None):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.variants = variants or {}
+
+
+class ResponseCache:
+    """Build static payloads once and answer conditional requests with 304.
+
+    Views decorated with :meth:`cached` return a plain dict. The dict is
+    serialized with the application's JSON provider the first time it is
+    needed and again only when one of ``config_keys`` changes. Bodies of at
+    least ``COMPRESS_MIN_SIZE`` bytes are also compressed with every
+    available encoding at that point, and each variant gets its own ETag.
+    """
+
+    def __init__(self, app=None, config_keys=('VERSION',)):
+        self.config_keys = tuple(config_keys)
+        self._builders = {}
+        self._entries = {}
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['response_cache'] = self
+
+    def _config_key(self):
+        config = self.app.config
+        return tuple(config.get(key) for key in self.config_keys)
+
+    def _build(self, name, key):
+        payload = self._builders[name]()
+        body = f"{self.app.json.dumps(payload)}\n".encode('utf-8')
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        variants = precompress(body, self.app.config.get('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE))
+        entry = CachedResponse(key, body, etag, variants)
+        self._entries[name] = entry
+        return entry
+
+    def get(self, name):
+        """Return the current entry for ``name``, rebuilding it if stale"""
+        key = self._config_key()
+        entry = self._entries.get(name)
+        if entry is None or entry.key != key:
+            entry = self._build(name, key)
+        return entry
+
+    def warm(self):
+        """Encode every registered payload ahead of the first request"""
+        with self.app.app_context():
+            for name in self._builders:
+                self.get(name)
+
+    def invalidate(self):
+        """Drop all encoded bodies; they are rebuilt on next access"""
+        self._entries.clear()
+
+    def cached(self, view):
+        """Decorator turning a payload-returning view into a cached one"""
+        name = view.__name__
+        self._builders[name] = view
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            entry = self.get(name)
+            encoding = negotiate(entry.variants)
+            etag = f"{entry.etag}-{encoding}" if encoding else entry.etag
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            elif encoding:
+                response = Response(entry.variants[encoding], mimetype='application/json')
+                response.headers['Content-Encoding'] = encoding
+            else:
+                response = Response(entry.body, mimetype='application/json')
+            if entry.variants:
+                response.vary.add('Accept-Encoding')
+            response.set_etag(etag)
+            return response
+
+        return wrapper
@@ -0,0 +1,188 @@
+"""
+Sampling Profiler
+Opt-in wall-clock profiler for running workers. A background thread samples
+every thread's stack at a fixed interval for a bounded number of seconds
+and aggregates them as collapsed stacks (``frame;frame;frame count``), the
+input format of flamegraph.pl, speedscope and inferno.
+
+Nothing runs until a profile is requested, either by sending the worker
+``SIGUSR2`` (see ``post_worker_init`` in ``src/gunicorn_conf.py``) or through
+``/debug/profile`` with the debug token. Under gevent workers the sampler
+still runs on its own OS thread and sees whichever greenlet holds the CPU.
+"""
+
+import importlib
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import Response, request
+
+from src.debug_access import debug_only
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_SECONDS = 30
+MAX_SECONDS = 300
+
+# How often the signal watcher checks for a pending SIGUSR2
+SIGNAL_POLL_INTERVAL = 0.1
+
+
+def collapse(frame):
+    """``module:function`` names from the outermost call to ``frame``"""
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def _original(module, name):
+    """Unpatched function, so the sampler runs on a real OS thread and sees
+    the worker's frames even after gevent monkey-patching"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return getattr(importlib.import_module(module), name)
+    return monkey.get_original(module, name)
+
+
+class SamplingProfiler:
+    """Collects stack samples for a fixed duration on a native daemon thread"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self.duration = None
+        self.running = False
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._sleep = _original('time', 'sleep')
+
+    def start(self, seconds=DEFAULT_SECONDS, on_finish=None):
+        """Begin sampling; returns False if a profile is already running"""
+        with self._lock:
+            if self.running:
+                return False
+            self.stacks = Counter()
+            self.samples = 0
+            self.started = time.time()
+            self.duration = None
+            self._stopping = False
+            self.running = True
+        _original('_thread', 'start_new_thread')(self._sample, (seconds, on_finish))
+        return True
+
+    def stop(self):
+        """End the running profile early and wait for the sampler to exit"""
+        self._stopping = True
+        while self.running:
+            self._sleep(self.interval)
+
+    def _sample(self, seconds, on_finish):
+        own_id = _original('_thread', 'get_ident')()
+        start = time.monotonic()
+        deadline = start + seconds
+        stacks = self.stacks
+        try:
+            while not self._stopping and time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != own_id:
+                        stacks[collapse(frame)] += 1
+                self.samples += 1
+                self._sleep(self.interval)
+            self.duration = time.monotonic() - start
+            if on_finish is not None:
+                on_finish(self)
+        finally:
+            self.running = False
+
+    def collapsed(self):
+        """Collapsed-stack text, most frequent stacks first"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, directory):
+        """Save the last profile as ``profile-<pid>-<start>.folded`` in ``directory``"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"profile-{os.getpid()}-{int(self.started)}.folded")
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+        return path
+
+
+class Profiling:
+    """Flask extension exposing a per-worker profiler.
+
+    ``POST /debug/profile?seconds=N`` starts a profile in the background
+    (so the worker keeps serving the traffic being profiled) and
+    ``GET /debug/profile`` returns the collapsed stacks once it finished.
+    """
+
+    def __init__(self, app=None, profiler=None):
+        self.profiler = profiler or SamplingProfiler()
+        self._signalled = False
+        self._watching = False
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('PROFILE_SECONDS', DEFAULT_SECONDS)
+        app.config.setdefault('PROFILE_DIR', '/tmp/profiles')
+        app.add_url_rule('/debug/profile', 'profile', debug_only(self.profile), methods=['GET', 'POST'])
+        app.extensions['profiling'] = self
+
+    def _save(self, profiler):
+        path = profiler.write(self.app.config['PROFILE_DIR'])
+        logger.info("Wrote %d samples over %.1f s to %s", profiler.samples, profiler.duration, path)
+
+    def install_signal_handler(self, signum=signal.SIGUSR2):
+        """Profile for PROFILE_SECONDS whenever this process receives ``signum``;
+        the collapsed stacks are written to PROFILE_DIR.
+
+        The handler runs on the main thread between any two bytecodes, possibly
+        while that thread holds the profiler's lock, so it only sets a flag. A
+        native watcher thread picks the flag up and starts the profile.
+        """
+        def handle(signum, frame):
+            self._signalled = True
+        signal.signal(signum, handle)
+        if not self._watching:
+            self._watching = True
+            _original('_thread', 'start_new_thread')(self._watch_signals, ())
+
+    def _watch_signals(self):
+        sleep = self.profiler._sleep
+        while True:
+            sleep(SIGNAL_POLL_INTERVAL)
+            if not self._signalled:
+                continue
+            self._signalled = False
+            if not self.profiler.start(self.app.config['PROFILE_SECONDS'], on_finish=self._save):
+                logger.warning("Profile already running in worker %s", os.getpid())
+
+    def profile(self):
+        profiler = self.profiler
+        if request.method == 'POST':
+            seconds = request.args.get('seconds', self.app.config['PROFILE_SECONDS'], type=float)
+            seconds = min(max(seconds, 0.1), MAX_SECONDS)
+            if not profiler.start(seconds):
+                return {'error': 'Profile already running'}, 409
+            return {'status': 'started', 'seconds': seconds, 'pid': os.getpid()}, 202
+
+        if profiler.running:
+            return {'status': 'running', 'samples': profiler.samples, 'pid': os.getpid()}, 409
+        if profiler.started is None:
+            return {'error': 'No profile recorded in this worker'}, 404
+        response = Response(profiler.collapsed(), mimetype='text/plain')
+        response.headers['X-Profile-Samples'] = str(profiler.samples)
+        return response
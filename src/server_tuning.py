@@ -0,0 +1,101 @@
+"""
+Server Tuning
+Derives gunicorn worker settings from the CPU quota and memory limit the
+container actually runs under (cgroup v2 or v1) instead of the host's core
+count.
+"""
+
+import math
+import os
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Limits at or above this are how cgroup v1 spells "unlimited"
+UNLIMITED = 2 ** 60
+
+# Resident memory budgeted per worker and for the master process
+WORKER_MEMORY_MB = 128
+MASTER_MEMORY_MB = 64
+
+
+def _read(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root=CGROUP_ROOT):
+    """CPUs allowed by the cgroup quota, or None when unlimited"""
+    cpu_max = _read(os.path.join(root, 'cpu.max'))
+    if cpu_max:
+        quota, _, period = cpu_max.partition(' ')
+        if quota == 'max':
+            return None
+        return int(quota) / int(period or 100000)
+
+    for directory in ('cpu', 'cpu,cpuacct'):
+        quota = _read(os.path.join(root, directory, 'cpu.cfs_quota_us'))
+        period = _read(os.path.join(root, directory, 'cpu.cfs_period_us'))
+        if quota and period:
+            return int(quota) / int(period) if int(quota) > 0 else None
+    return None
+
+
+def cgroup_memory_limit(root=CGROUP_ROOT):
+    """Memory limit in bytes, or None when unlimited"""
+    for path in ('memory.max', os.path.join('memory', 'memory.limit_in_bytes')):
+        value = _read(os.path.join(root, path))
+        if value is None:
+            continue
+        if value == 'max' or int(value) >= UNLIMITED:
+            return None
+        return int(value)
+    return None
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def tune(worker_class='sync', cpus=None, memory=None, worker_memory_mb=WORKER_MEMORY_MB):
+    """Worker and thread counts for the given limits.
+
+    Async workers (gevent) multiplex connections, so one per CPU is enough.
+    Sync workers follow gunicorn's ``2 * CPUs + 1`` rule. The worker count is
+    then capped by how many fit in the memory limit; when that cap bites,
+    sync workers get threads to keep the same total concurrency.
+    """
+    cpus = cpus or available_cpus()
+    if worker_class == 'gevent':
+        target = max(1, math.ceil(cpus))
+    else:
+        target = max(2, math.ceil(2 * cpus) + 1)
+
+    workers = target
+    if memory is not None:
+        fit = (memory // (1024 * 1024) - MASTER_MEMORY_MB) // worker_memory_mb
+        workers = max(1, min(target, fit))
+
+    threads = 1
+    if worker_class != 'gevent' and workers < target:
+        threads = math.ceil(target / workers)
+
+    return {'workers': workers, 'threads': threads}
+
+
+def detect(worker_class='sync', root=CGROUP_ROOT, worker_memory_mb=WORKER_MEMORY_MB):
+    """Tuned settings plus the limits they were derived from"""
+    cpus = cgroup_cpu_limit(root)
+    memory = cgroup_memory_limit(root)
+    settings = tune(worker_class, cpus, memory, worker_memory_mb)
+    settings['limits'] = {
+        'cpus': cpus if cpus is not None else available_cpus(),
+        'cpu_quota': cpus is not None,
+        'memory_mb': memory // (1024 * 1024) if memory is not None else None
+    }
+    return settings
@@ -0,0 +1,55 @@
+import os
+import sys
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# monitoring/ and security/ are script directories that import their
+# siblings directly, so make them importable the same way here
+for directory in ('monitoring', 'security'):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class LiveServer:
+    """Serve a WSGI app on an ephemeral localhost port in a background thread"""
+
+    def __init__(self, wsgi_app):
+        self.server = make_server('127.0.0.1', 0, wsgi_app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.thread.join()
+
+
+@pytest.fixture
+def serve():
+    """Factory fixture starting local servers that are stopped after the test"""
+    servers = []
+
+    def start(wsgi_app):
+        server = LiveServer(wsgi_app).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def live_server(serve):
+    """The real application served over HTTP"""
+    from src.app import app
+    return serve(app)
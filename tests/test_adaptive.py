@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from adaptive import AdaptivePolicy, AdaptiveSession
+from async_checks import collect_health_checks
+from http_pool import create_session, timed_get
+
+
+@pytest.fixture
+def fault_server():
+    """aiohttp stub injecting latency and failures.
+
+    Tests set ``faults[path] = lambda n: (delay, status)`` to decide the
+    fate of the n-th request to ``path``; other requests answer 200 at once.
+    """
+    loop = asyncio.new_event_loop()
+    faults = {}
+    counts = Counter()
+
+    async def respond(request):
+        n = counts[request.path]
+        counts[request.path] += 1
+        delay, status = faults.get(request.path, lambda n: (0, 200))(n)
+        await asyncio.sleep(delay)
+        return web.json_response({'status': 'healthy', 'n': n}, status=status)
+
+    stub = web.Application()
+    stub.router.add_get('/{path:.*}', respond)
+    # Abandoned requests are cancelled instead of holding up the shutdown
+    runner = web.AppRunner(stub, handler_cancellation=True)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    loop.run_until_complete(site.start())
+    port = runner.addresses[0][1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{port}", faults
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def run_requests(url, policy, count, timeout=5):
+    """Issue ``count`` sequential requests; returns (statuses, latencies, stats)"""
+    async def run():
+        statuses, latencies = [], []
+        async with create_session() as session:
+            adaptive = AdaptiveSession(session, policy)
+            for _ in range(count):
+                start = time.perf_counter()
+                response, _, _ = await timed_get(adaptive, url, aiohttp.ClientTimeout(total=timeout))
+                latencies.append(time.perf_counter() - start)
+                statuses.append(response.status)
+            await adaptive.drain(timeout)
+        return statuses, latencies, adaptive.stats
+
+    return asyncio.run(run())
+
+
+def test_policy_timeouts_follow_observed_latency():
+    """Test the timeout tracks p99 once enough samples exist, within bounds"""
+    policy = AdaptivePolicy(max_timeout=10, min_timeout=0.25, timeout_factor=3, min_samples=5)
+    assert policy.timeout('/health') == 10
+
+    for _ in range(50):
+        policy.observe('/health', 0.2)
+        policy.observe('/fast', 0.001)
+    assert policy.timeout('/health') == pytest.approx(0.6, rel=0.02)
+    assert policy.timeout('/fast') == 0.25
+    assert policy.hedge_delay('/health') is None
+
+    hedging = AdaptivePolicy(hedge=True, min_samples=5)
+    for _ in range(50):
+        hedging.observe('/health', 0.2)
+    assert hedging.hedge_delay('/health') == pytest.approx(0.2, rel=0.02)
+
+
+def test_backoff_is_capped_with_full_jitter():
+    """Test retry delays grow exponentially but are spread over [0, cap]"""
+    policy = AdaptivePolicy(backoff=0.1, max_backoff=1.0, seed=3)
+    for attempt, cap in enumerate([0.1, 0.2, 0.4, 0.8, 1.0, 1.0]):
+        delays = [policy.backoff_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+        assert max(delays) > cap * 0.8 and min(delays) < cap * 0.2
+
+
+def test_retries_recover_from_failures(fault_server):
+    """Test 503s are retried with backoff until the endpoint answers"""
+    url, faults = fault_server
+    faults['/flaky'] = lambda n: (0, 503 if n < 2 else 200)
+
+    statuses, _, stats = run_requests(f"{url}/flaky", AdaptivePolicy(retries=2, backoff=0.01), 1)
+
+    assert statuses == [200]
+    assert stats.retries == 2
+    assert stats.attempts == 3
+
+
+def test_retries_give_up_after_limit(fault_server):
+    """Test the last failure is returned once retries are spent"""
+    url, faults = fault_server
+    faults['/down'] = lambda n: (0, 503)
+
+    statuses, _, stats = run_requests(f"{url}/down", AdaptivePolicy(retries=1, backoff=0.01), 1)
+
+    assert statuses == [503]
+    assert stats.attempts == 2
+
+
+def test_adaptive_timeout_abandons_stuck_request(fault_server):
+    """Test a request stuck far beyond the observed p99 is cut short and retried"""
+    url, faults = fault_server
+    faults['/health'] = lambda n: (3.0 if n == 10 else 0.005, 200)
+    policy = AdaptivePolicy(max_timeout=5, min_timeout=0.2, retries=2, backoff=0.01)
+
+    statuses, latencies, stats = run_requests(f"{url}/health", policy, 12)
+
+    assert statuses == [200] * 12
+    assert stats.timeouts == 1
+    assert latencies[10] < 1.0
+    assert policy.timeout('/health') < 0.5
+
+
+def test_hedging_cuts_tail_latency(fault_server):
+    """Test hedged requests hide occasional slow responses and report savings"""
+    url, faults = fault_server
+    faults['/tail'] = lambda n: (0.4 if n % 25 == 24 else 0.002, 200)
+    policy = AdaptivePolicy(hedge=True, min_samples=10, retries=0)
+
+    statuses, latencies, stats = run_requests(f"{url}/tail", policy, 100)
+    slow = [latency for latency in latencies[20:] if latency > 0.3]
+
+    assert statuses == [200] * 100
+    assert not slow
+    assert stats.hedges >= 3
+    assert stats.hedge_wins >= 3
+    assert stats.saved > 0.3
+
+    report = stats.to_dict(policy)
+    assert report['hedge_rate'] == stats.hedges
+    assert report['avg_saved_latency'] > 0.1
+
+
+def test_health_checks_report_scheduling(fault_server):
+    """Test the async engine retries through a failure and reports scheduling stats"""
+    url, faults = fault_server
+    faults['/api/info'] = lambda n: (0, 503 if n == 0 else 200)
+
+    results = collect_health_checks(url, timeout=5, adaptive={'hedge': True, 'backoff': 0.01})
+
+    assert results['api_endpoints']['/api/info']['status_code'] == 200
+    assert results['performance']['success_rate'] == 100
+    scheduling = results['scheduling']
+    assert scheduling['retries'] >= 1
+    assert scheduling['requests'] == 14
+    assert set(scheduling) >= {'hedge_rate', 'hedge_wins', 'saved_latency', 'timeouts_by_endpoint'}
+    assert '/health' in scheduling['timeouts_by_endpoint']
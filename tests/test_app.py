@@ -29,6 +29,7 @@ def test_app_info(client):
     assert 'version' in data
     assert 'features' in data
     assert len(data['features']) > 0
+    assert data['server'] is None
 
 def test_secure_data_valid_user(client):
     """Test secure data endpoint with valid user ID"""
@@ -79,3 +80,40 @@ def test_app_configuration():
         assert app.config['TESTING'] == True
         assert 'SECRET_KEY' in app.config
         assert 'VERSION' in app.config
+
+def test_index_etag(client):
+    """Test cached endpoints send a strong ETag"""
+    response = client.get('/')
+    assert response.status_code == 200
+    assert response.headers['ETag']
+    assert not response.headers['ETag'].startswith('W/')
+
+def test_app_info_not_modified(client):
+    """Test If-None-Match with a matching ETag returns 304"""
+    etag = client.get('/api/info').headers['ETag']
+
+    response = client.get('/api/info', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+def test_app_info_stale_etag(client):
+    """Test a non-matching ETag gets the full body"""
+    response = client.get('/api/info', headers={'If-None-Match': '"stale"'})
+    assert response.status_code == 200
+
+    data = json.loads(response.data)
+    assert data['name'] == 'DevSecOps Demo Application'
+
+def test_cache_rebuilt_on_version_change(client):
+    """Test cached bodies follow app.config['VERSION']"""
+    original = app.config['VERSION']
+    first = client.get('/')
+    try:
+        app.config['VERSION'] = '9.9.9'
+        second = client.get('/')
+    finally:
+        app.config['VERSION'] = original
+
+    assert json.loads(second.data)['version'] == '9.9.9'
+    assert first.headers['ETag'] != second.headers['ETag']
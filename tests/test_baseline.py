@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+import health_check
+from baseline import BaselineStore, bootstrap_ratio_interval, compare_endpoint, mann_whitney
+from quantile_sketch import QuantileSketch
+from test_health_check import make_stub_app
+
+
+def sketch_of(samples):
+    sketch = QuantileSketch()
+    for sample in samples:
+        sketch.add(sample)
+    return sketch
+
+
+def latencies(count, seed, scale=1.0):
+    rng = random.Random(seed)
+    return [scale * rng.lognormvariate(-3, 0.3) for _ in range(count)]
+
+
+def test_mann_whitney_matches_normal_approximation():
+    """Test fully separated samples give the textbook U = n1 * n2 p-value"""
+    baseline = sketch_of([0.010 * 1.1 ** i for i in range(10)])
+    current = sketch_of([0.030 * 1.1 ** i for i in range(10)])
+
+    # U = 100, mean 50, variance 10 * 10 * 21 / 12 => z = 49.5 / sqrt(175)
+    assert mann_whitney(baseline, current) == pytest.approx(9.2e-5, rel=0.02)
+    assert mann_whitney(current, baseline) > 0.999
+    assert mann_whitney(baseline, baseline) == pytest.approx(0.5, abs=0.05)
+
+
+def test_bootstrap_interval_covers_true_ratio():
+    """Test the quantile ratio interval brackets the real scale change"""
+    baseline = sketch_of(latencies(600, 1))
+
+    doubled = bootstrap_ratio_interval(baseline, sketch_of(latencies(100, 2, scale=2)), 90, seed=1)
+    same = bootstrap_ratio_interval(baseline, sketch_of(latencies(100, 3)), 90, seed=1)
+
+    assert doubled[0] < 2 < doubled[1] and doubled[0] > 1.5
+    assert same[0] < 1 < same[1]
+
+
+def test_compare_endpoint_classifies_changes():
+    """Test shifts, tail-only slowdowns, speedups and noise are told apart"""
+    baseline = sketch_of(latencies(600, 1))
+    tail = [sample * (3 if i % 5 == 0 else 1) for i, sample in enumerate(latencies(100, 5))]
+
+    assert compare_endpoint(baseline, sketch_of(latencies(30, 4, scale=2)), seed=1)['status'] == 'regressed'
+    assert compare_endpoint(baseline, sketch_of(tail), seed=1)['status'] == 'regressed'
+    assert compare_endpoint(baseline, sketch_of(latencies(30, 6, scale=0.5)), seed=1)['status'] == 'improved'
+    assert compare_endpoint(baseline, sketch_of(latencies(30, 7)), seed=1)['status'] == 'unchanged'
+    # Significant but below the minimum relative or absolute slowdown
+    assert compare_endpoint(baseline, sketch_of(latencies(5000, 8, scale=1.05)), seed=1)['status'] == 'unchanged'
+    assert compare_endpoint(sketch_of(latencies(600, 1, scale=0.02)), sketch_of(latencies(30, 4, scale=0.04)),
+                            seed=1)['status'] == 'unchanged'
+    assert compare_endpoint(QuantileSketch(), sketch_of(latencies(30, 9)))['status'] == 'insufficient data'
+
+
+def test_store_keeps_runs_per_environment_and_version(tmp_path):
+    """Test baselines merge the latest runs of one version in one environment"""
+    with BaselineStore(str(tmp_path / 'history' / 'baselines.db')) as store:
+        for version, count in (('1.0', 10), ('1.0', 20), ('1.1', 40), ('1.0', 30)):
+            store.record_run('staging', version, {'/health': sketch_of(latencies(count, count))})
+        store.record_run('production', '2.0', {'/health': sketch_of(latencies(5, 1))})
+
+        assert [row['version'] for row in store.versions('staging')] == ['1.0', '1.1']
+        assert store.versions('staging')[0]['runs'] == 3
+        assert store.latest_version('staging', exclude='1.0') == '1.1'
+        assert store.latest_version('production', exclude='2.0') is None
+
+        sketches, runs = store.baseline('staging', '1.0', runs=2)
+        assert runs == 2
+        assert sketches['/health'].count == 50
+        assert store.baseline('staging', '0.9') == ({}, 0)
+
+
+def test_report_fails_on_latency_regression(serve, tmp_path, monkeypatch):
+    """Test a deploy doubling /api/secure-data latency fails against the stored baseline"""
+    monkeypatch.chdir(tmp_path)
+    delays = {'/api/secure-data': 0.02}
+    server = serve(make_stub_app(delays))
+    baseline = {'store_path': str(tmp_path / 'baselines.db'), 'seed': 1}
+
+    first = health_check.generate_health_report('staging', server.url, timeout=5, latency_samples=20,
+                                                baseline=dict(baseline, version='1'))
+    assert first['latency_baseline']['baseline_version'] is None
+    assert first['latency_baseline']['recorded']
+    assert set(first['endpoint_latency']['endpoints']) == {'/health', '/api/info', '/api/secure-data?user_id=123'}
+
+    steady = health_check.generate_health_report('staging', server.url, timeout=5, latency_samples=20,
+                                                 baseline=dict(baseline, version='2'))
+    assert steady['latency_baseline']['baseline_version'] == '1'
+    assert steady['latency_baseline']['regressions'] == []
+    assert steady['latency_baseline']['recorded']
+
+    delays['/api/secure-data'] = 0.04
+    slow = health_check.generate_health_report('staging', server.url, timeout=5, latency_samples=20,
+                                               baseline=dict(baseline, version='3'))
+    comparison = slow['latency_baseline']
+    assert comparison['baseline_version'] == '2'
+    assert comparison['regressions'] == ['/api/secure-data?user_id=123']
+    assert comparison['endpoints']['/api/secure-data?user_id=123']['p50_ratio'] > 1.5
+    assert comparison['endpoints']['/health']['status'] != 'regressed'
+    assert not comparison['recorded']
+    assert any(issue.startswith('Latency regression on /api/secure-data') for issue in slow['issues'])
+    assert slow['overall_status'] != 'healthy'
@@ -0,0 +1,130 @@
+import gzip
+import json
+import os
+import threading
+
+import brotli
+import pytest
+import zstandard
+from flask import Flask
+
+from src.app import app
+from src.compression import Compression, codecs, precompress
+
+
+@pytest.fixture
+def compress_everything():
+    """Drop the global app's size threshold so the small static payloads compress"""
+    original = app.config['COMPRESS_MIN_SIZE']
+    app.config['COMPRESS_MIN_SIZE'] = 0
+    yield app.test_client()
+    app.config['COMPRESS_MIN_SIZE'] = original
+
+
+def make_compressed_app(min_size=100):
+    compressed_app = Flask('compressed')
+    compressed_app.config['COMPRESS_MIN_SIZE'] = min_size
+    Compression(compressed_app)
+
+    @compressed_app.route('/report')
+    def report():
+        return {'findings': ['finding'] * 100}
+
+    @compressed_app.route('/small')
+    def small():
+        return {'status': 'ok'}
+
+    return compressed_app
+
+
+def test_negotiates_preferred_encoding():
+    """Test the server prefers zstd, then brotli, then gzip, honouring q-values"""
+    client = make_compressed_app().test_client()
+
+    assert client.get('/report', headers={'Accept-Encoding': 'gzip, br, zstd'}).headers['Content-Encoding'] == 'zstd'
+    assert client.get('/report', headers={'Accept-Encoding': 'gzip, br'}).headers['Content-Encoding'] == 'br'
+    assert client.get('/report', headers={'Accept-Encoding': 'br;q=0.5, gzip'}).headers['Content-Encoding'] == 'gzip'
+
+    response = client.get('/report', headers={'Accept-Encoding': 'gzip'})
+    assert json.loads(gzip.decompress(response.data))['findings'][0] == 'finding'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+
+def test_identity_without_accept_encoding():
+    """Test clients that accept no encoding get the plain body"""
+    client = make_compressed_app().test_client()
+    response = client.get('/report')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()['findings']
+
+
+def test_below_threshold_not_compressed():
+    """Test bodies under COMPRESS_MIN_SIZE are sent as they are"""
+    client = make_compressed_app(min_size=100).test_client()
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Vary' not in response.headers
+
+
+def test_precompressed_static_variants(compress_everything):
+    """Test / and /api/info serve variants built once, each with its own ETag"""
+    plain = compress_everything.get('/')
+    encoded = compress_everything.get('/', headers={'Accept-Encoding': 'br'})
+
+    assert encoded.headers['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(encoded.data)) == plain.get_json()
+    assert encoded.headers['ETag'] != plain.headers['ETag']
+    assert encoded.headers['Vary'] == 'Accept-Encoding'
+
+    entry = app.extensions['response_cache'].get('index')
+    assert encoded.data == entry.variants['br']
+
+    zstd = compress_everything.get('/api/info', headers={'Accept-Encoding': 'zstd'})
+    assert json.loads(zstandard.ZstdDecompressor().decompress(zstd.data))['name'] == 'DevSecOps Demo Application'
+
+
+def test_precompressed_variant_not_modified(compress_everything):
+    """Test revalidating a compressed variant with its ETag returns 304"""
+    headers = {'Accept-Encoding': 'gzip'}
+    etag = compress_everything.get('/api/info', headers=headers).headers['ETag']
+
+    response = compress_everything.get('/api/info', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert compress_everything.get('/api/info', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_precompress_skips_small_and_incompressible():
+    """Test no variants are kept for small bodies or ones compression would grow"""
+    assert precompress(b'{"a": 1}', min_size=100) == {}
+    assert precompress(os.urandom(2048), min_size=0) == {}
+
+
+def test_zstd_compressor_per_thread(monkeypatch):
+    """Test concurrent threads never share a zstd compressor"""
+    created = []
+    real = zstandard.ZstdCompressor
+
+    def counting(**kwargs):
+        created.append(real(**kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(zstandard, 'ZstdCompressor', counting)
+    compress = codecs()['zstd']
+    bodies = [json.dumps({'thread': i, 'rows': list(range(i * 1000))}).encode() for i in range(8)]
+    results = {}
+    barrier = threading.Barrier(len(bodies))
+
+    def work(i):
+        barrier.wait()
+        results[i] = [compress(bodies[i]) for _ in range(20)]
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(len(bodies))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == len(bodies)
+    decompressor = zstandard.ZstdDecompressor()
+    for i, compressed in results.items():
+        assert all(decompressor.decompress(data) == bodies[i] for data in compressed)
@@ -0,0 +1,94 @@
+import asyncio
+
+import aiohttp
+import pytest
+from flask import Flask
+
+import health_check
+from daemon import HealthMonitor, RollingWindows, start_metrics_server
+
+
+def make_flaky_app():
+    """Stub whose /api/info always fails"""
+    stub = Flask('flaky')
+    stub.add_url_rule('/health', 'health', lambda: {'status': 'healthy'})
+    stub.add_url_rule('/api/info', 'info', lambda: ({'error': 'boom'}, 500))
+    stub.add_url_rule('/api/secure-data', 'secure', lambda: {'data': 'ok'})
+    return stub
+
+
+def test_rolling_windows_slide():
+    """Test each window only aggregates its most recent slots"""
+    windows = RollingWindows({'1m': 60, '5m': 300}, slot_seconds=5)
+    for second in range(0, 120):
+        windows.record(second, None if second < 60 else 0.010)
+
+    last_minute = windows.aggregate('1m', 119)
+    assert last_minute['requests'] == 60
+    assert last_minute['success_rate'] == 100
+    assert last_minute['avg_response_time'] == pytest.approx(0.010)
+
+    five_minutes = windows.aggregate('5m', 119)
+    assert five_minutes['requests'] == 120
+    assert five_minutes['success_rate'] == 50
+
+    assert windows.aggregate('1m', 1000)['requests'] == 0
+
+
+def test_rolling_windows_memory_bounded():
+    """Test a week of probes keeps no more than the ring's slots"""
+    windows = RollingWindows({'1m': 60, '15m': 900}, slot_seconds=5)
+    for second in range(0, 7 * 24 * 3600, 3):
+        windows.record(second, (second % 1000) / 1000)
+
+    # 180 slots of 5 s hold the last 15 minutes and nothing older
+    assert len(windows._ring) == 180
+    assert sum(slot.requests for slot in windows._ring) == 300
+    assert sum(len(slot.latency.bins) + slot.latency.zero_count for slot in windows._ring) <= 300
+    assert windows.aggregate('15m', 7 * 24 * 3600 - 1)['requests'] == 300
+
+
+def test_monitor_evaluates_thresholds_over_windows(serve):
+    """Test failing probes show up per endpoint and fail the success threshold"""
+    server = serve(make_flaky_app())
+    monitor = HealthMonitor(server.url, interval=0.01, jitter=0.5, timeout=2,
+                            assess=health_check.performance_issues)
+
+    asyncio.run(monitor.run(cycles=6))
+
+    window = monitor.snapshot()['1m']
+    assert window['overall']['requests'] == 18
+    assert window['overall']['success_rate'] == pytest.approx(200 / 3)
+    assert window['endpoints']['/health']['success_rate'] == 100
+    assert window['endpoints']['/api/info']['success_rate'] == 0
+    assert window['endpoints']['/health']['latency']['p99'] is not None
+    assert 'Success rate is below 95%' in window['issues']
+    assert window['status'] == 'degraded'
+
+
+def test_metrics_endpoint(serve):
+    """Test the daemon serves its windows in Prometheus and JSON form"""
+    server = serve(make_flaky_app())
+    monitor = HealthMonitor(server.url, endpoints=['/health'], interval=0.01, timeout=2)
+
+    async def scrape():
+        runner, port = await start_metrics_server(monitor, '127.0.0.1', 0)
+        try:
+            await monitor.run(cycles=3)
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                    metrics = await response.text()
+                async with session.get(f"http://127.0.0.1:{port}/status") as response:
+                    status = await response.json()
+            return metrics, status
+        finally:
+            await runner.cleanup()
+
+    metrics, status = asyncio.run(scrape())
+
+    assert 'health_check_success_ratio{endpoint="/health",window="5m"} 1.0' in metrics
+    assert 'health_check_window_probes{endpoint="all",window="1m"} 3.0' in metrics
+    assert 'health_check_latency_seconds{endpoint="/health",quantile="0.99",window="15m"}' in metrics
+    assert 'health_check_window_healthy{window="1m"} 1.0' in metrics
+    assert status['cycles'] == 3
+    assert status['windows']['1m']['status'] == 'healthy'
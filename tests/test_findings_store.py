@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from findings import fingerprint, iter_bandit_findings, iter_trivy_findings, iter_zap_findings, make_finding
+from findings_store import FindingsStore
+
+
+def trivy_finding(cve, package='openssl@1.1.1', severity='HIGH', target='debian'):
+    return make_finding('trivy', cve, package=package, location=target, severity=severity)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with FindingsStore(str(tmp_path / 'history' / 'findings.db')) as store:
+        yield store
+
+
+def test_bandit_findings_ignore_line_numbers(tmp_path):
+    """Test Bandit fingerprints survive code moving to another line"""
+    def bandit(line):
+        return {'results': [{
+            'test_id': 'B307', 'filename': 'src/app.py', 'line_number': line,
+            'issue_severity': 'MEDIUM', 'issue_text': 'Use of eval',
+            'code': f"{line - 1} x = 1\n{line} result = eval(data)\n{line + 1} return result\n"
+        }]}
+
+    path = tmp_path / 'bandit-report.json'
+    path.write_text(json.dumps(bandit(10)))
+    first = list(iter_bandit_findings(str(path)))
+    path.write_text(json.dumps(bandit(42)))
+    moved = list(iter_bandit_findings(str(path)))
+
+    assert first[0]['context'] == 'result = eval(data)'
+    assert fingerprint(first[0]) == fingerprint(moved[0])
+
+
+def test_trivy_streaming_findings_match(tmp_path):
+    """Test streamed Trivy findings keep their target like the in-memory path"""
+    report = {'Results': [
+        {'Target': 'debian', 'Vulnerabilities': [
+            {'VulnerabilityID': 'CVE-1', 'PkgName': 'openssl', 'InstalledVersion': '1.1',
+             'Severity': 'CRITICAL', 'CVSS': {'nvd': {'V3Score': 9.8}}}]},
+        {'Target': 'python', 'Vulnerabilities': None},
+        {'Target': 'node', 'Vulnerabilities': [
+            {'VulnerabilityID': 'CVE-2', 'PkgName': 'lodash', 'InstalledVersion': '4.0', 'Severity': 'LOW'}]}
+    ]}
+    path = tmp_path / 'trivy-report.json'
+    path.write_text(json.dumps(report))
+
+    streamed = list(iter_trivy_findings(str(path), stream=True))
+    assert streamed == list(iter_trivy_findings(str(path), stream=False))
+    assert [(f['location'], f['package']) for f in streamed] == [('debian', 'openssl@1.1'), ('node', 'lodash@4.0')]
+
+
+def test_zap_findings_normalize_risk(tmp_path):
+    """Test ZAP risk descriptions map onto the common severity scale"""
+    path = tmp_path / 'zap-report.json'
+    path.write_text(json.dumps({'site': [{'@name': 'http://staging', 'alerts': [
+        {'pluginid': '10021', 'alert': 'X-Content-Type-Options Header Missing', 'riskdesc': 'Low (Medium)'},
+        {'pluginid': '10096', 'alert': 'Timestamp Disclosure', 'riskdesc': 'Informational (Low)'}
+    ]}]}))
+
+    assert [f['severity'] for f in iter_zap_findings(str(path))] == ['LOW', 'INFO']
+
+
+def test_first_seen_and_trend(store):
+    """Test first appearance and per-build severity counts"""
+    store.record_build('1', {'trivy': lambda: [trivy_finding('CVE-A')]})
+    store.record_build('2', {'trivy': lambda: [trivy_finding('CVE-A'), trivy_finding('CVE-B', severity='CRITICAL')]})
+    store.record_build('3', {'trivy': lambda: [trivy_finding('CVE-B', severity='CRITICAL')]})
+
+    seen = store.first_seen('CVE-B')
+    assert len(seen) == 1
+    assert (seen[0]['first_build'], seen[0]['last_build'], seen[0]['builds']) == ('2', '3', 2)
+    assert store.first_seen('CVE-A')[0]['last_build'] == '2'
+
+    trend = store.trend()
+    assert [(row['build'], row['critical'], row['high'], row['total']) for row in trend] == [
+        ('1', 0, 1, 1), ('2', 1, 1, 2), ('3', 1, 0, 1)]
+    assert [row['build'] for row in store.trend(limit=2)] == ['2', '3']
+    assert [row['total'] for row in store.trend(severity='critical')] == [0, 1, 1]
+
+
+def test_rerated_finding_counts_at_new_severity(store):
+    """Test a finding re-rated between builds is counted at its new severity"""
+    store.record_build('1', {'trivy': lambda: [trivy_finding('CVE-A', severity='MEDIUM')]})
+    store.record_build('2', {'trivy': lambda: [trivy_finding('CVE-A', severity='CRITICAL')]})
+
+    trend = store.trend()
+    assert [(row['build'], row['medium'], row['critical']) for row in trend] == [('1', 1, 0), ('2', 0, 1)]
+    assert store.first_seen('CVE-A')[0]['severity'] == 'CRITICAL'
+    assert store.first_seen('CVE-A')[0]['builds'] == 2
+
+
+def test_diff_and_package_history(store):
+    """Test new/fixed findings between builds and package lookups across versions"""
+    store.record_build('10', {'trivy': lambda: [trivy_finding('CVE-A'), trivy_finding('CVE-B')]})
+    store.record_build('11', {'trivy': lambda: [trivy_finding('CVE-B'), trivy_finding('CVE-C', package='openssl@3.0')]})
+
+    changes = store.diff('10', '11')
+    assert [f['rule_id'] for f in changes['new']] == ['CVE-C']
+    assert [f['rule_id'] for f in changes['fixed']] == ['CVE-A']
+
+    history = store.package_history('openssl')
+    assert {row['rule_id'] for row in history} == {'CVE-A', 'CVE-B', 'CVE-C'}
+    with pytest.raises(KeyError):
+        store.diff('10', '99')
+
+
+def test_unchanged_inputs_are_copied(store):
+    """Test a tool whose report digest is unchanged is not re-read"""
+    store.record_build('1', {'trivy': lambda: [trivy_finding('CVE-A')]}, digests={'trivy': 'abc'})
+    store.record_build('2', {'trivy': lambda: pytest.fail('unchanged report re-read')},
+                       digests={'trivy': 'abc'})
+
+    assert [row['total'] for row in store.trend()] == [1, 1]
+    assert store.first_seen('CVE-A')[0]['builds'] == 2
+
+
+def test_rerecording_a_build_replaces_it(store):
+    """Test recording the same build id twice keeps only the latest findings"""
+    store.record_build('1', {'trivy': lambda: [trivy_finding('CVE-A')]})
+    store.record_build('1', {'trivy': lambda: [trivy_finding('CVE-B')]})
+
+    assert len(store.builds()) == 1
+    assert store.first_seen('CVE-A') == []
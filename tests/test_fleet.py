@@ -0,0 +1,121 @@
+import json
+import time
+
+import health_check
+from fleet import collect_fleet_checks, load_targets, summarize_fleet
+from quantile_sketch import QuantileSketch
+from test_health_check import make_stub_app
+
+
+def test_load_targets_from_text(tmp_path):
+    """Test plain target files skip comments and trailing slashes"""
+    path = tmp_path / 'targets.txt'
+    path.write_text("# staging replicas\nhttp://10.0.0.1:5000/\n\nhttp://10.0.0.2:5000  # canary\n")
+
+    assert load_targets(str(path)) == [
+        {'name': 'http://10.0.0.1:5000', 'url': 'http://10.0.0.1:5000'},
+        {'name': 'http://10.0.0.2:5000', 'url': 'http://10.0.0.2:5000'}
+    ]
+
+
+def test_load_targets_from_kubernetes_endpoints(tmp_path):
+    """Test ready addresses of Endpoints and EndpointSlices become targets"""
+    endpoints = {
+        'kind': 'Endpoints',
+        'subsets': [{
+            'addresses': [{'ip': '10.1.0.5', 'targetRef': {'kind': 'Pod', 'name': 'app-7d9f-abc'}}],
+            'notReadyAddresses': [{'ip': '10.1.0.6'}],
+            'ports': [{'name': 'metrics', 'port': 9090}, {'name': 'http', 'port': 5000}]
+        }]
+    }
+    json_path = tmp_path / 'endpoints.json'
+    json_path.write_text(json.dumps(endpoints))
+    assert load_targets(str(json_path), scheme='https') == [
+        {'name': 'app-7d9f-abc', 'url': 'https://10.1.0.5:5000'}
+    ]
+
+    yaml_path = tmp_path / 'slice.yaml'
+    yaml_path.write_text(
+        "apiVersion: discovery.k8s.io/v1\n"
+        "kind: EndpointSlice\n"
+        "ports:\n- name: http\n  port: 5000\n"
+        "endpoints:\n"
+        "- addresses: ['10.1.0.7']\n  conditions: {ready: true}\n  targetRef: {name: app-7d9f-def}\n"
+        "- addresses: ['fd00::8']\n  conditions: {ready: true}\n"
+        "- addresses: ['10.1.0.9']\n  conditions: {ready: false}\n")
+    assert load_targets(str(yaml_path)) == [
+        {'name': 'app-7d9f-def', 'url': 'http://10.1.0.7:5000'},
+        {'name': 'fd00::8', 'url': 'http://[fd00::8]:5000'}
+    ]
+
+
+def test_load_targets_from_yaml_documents(tmp_path):
+    """Test every document of a multi-document YAML file contributes targets"""
+    path = tmp_path / 'endpoints.yml'
+    path.write_text(
+        "kind: Endpoints\n"
+        "subsets:\n- addresses: [{ip: 10.2.0.1}]\n  ports: [{name: http, port: 5000}]\n"
+        "---\n"
+        "---\n"
+        "kind: EndpointSlice\n"
+        "ports: [{name: http, port: 8080}]\n"
+        "endpoints:\n- addresses: ['10.2.0.2']\n  targetRef: {name: app-canary}\n")
+
+    assert load_targets(str(path)) == [
+        {'name': '10.2.0.1', 'url': 'http://10.2.0.1:5000'},
+        {'name': 'app-canary', 'url': 'http://10.2.0.2:8080'}
+    ]
+
+
+def test_fleet_runtime_tracks_slowest_target(serve):
+    """Test many targets finish in about the time of the slowest one, streaming
+    fast targets first"""
+    slow = serve(make_stub_app({'/': 1.0}))
+    fast = serve(make_stub_app({}))
+    targets = [{'name': f"slow-{i}", 'url': slow.url} for i in range(5)]
+    targets += [{'name': f"fast-{i}", 'url': fast.url} for i in range(20)]
+    finished = []
+
+    start = time.perf_counter()
+    collect_fleet_checks(targets, lambda target, checks, error, elapsed: finished.append(target['name']),
+                         concurrency=50, timeout=5)
+    elapsed = time.perf_counter() - start
+
+    assert sorted(finished) == sorted(target['name'] for target in targets)
+    assert finished[0].startswith('fast')
+    assert all(name.startswith('slow') for name in finished[-5:])
+    # One after another the slow targets alone would take five seconds
+    assert elapsed < 3.0
+
+
+def test_fleet_report_aggregates_targets(serve, tmp_path, monkeypatch):
+    """Test the fleet report merges every target's samples and flags unreachable ones"""
+    monkeypatch.chdir(tmp_path)
+    server = serve(make_stub_app({}))
+    targets = [{'name': 'a', 'url': server.url}, {'name': 'b', 'url': server.url},
+               {'name': 'down', 'url': 'http://127.0.0.1:1'}]
+
+    report = health_check.generate_fleet_report('staging', targets, timeout=2, concurrency=2)
+
+    results = {result['name']: result for result in report['results']}
+    assert results['down']['latency']['p99'] is None
+    assert results['down']['status'] != 'healthy'
+    assert results['a']['latency']['p50'] is not None
+    assert report['latency_sketch']['count'] == sum(
+        result['checks']['performance']['latency_sketch']['count'] for result in report['results']
+        if result['checks'] is not None)
+    assert report['status_counts'].get('healthy', 0) < 3
+    assert report['overall_status'] in ('degraded', 'unhealthy')
+    assert list(tmp_path.glob('fleet-report-staging-*.json'))
+
+
+def test_summarize_fleet_status():
+    """Test the fleet is unhealthy only when most targets are"""
+    def result(status):
+        return {'name': status, 'url': 'http://x', 'status': status, 'checks': None,
+                'latency': QuantileSketch().summary()}
+
+    assert summarize_fleet([result('healthy')] * 3)['overall_status'] == 'healthy'
+    assert summarize_fleet([result('healthy')] * 2 + [result('error')])['overall_status'] == 'degraded'
+    assert summarize_fleet([result('healthy')] + [result('error')] * 2)['overall_status'] == 'unhealthy'
+
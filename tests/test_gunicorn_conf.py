@@ -0,0 +1,97 @@
+import os
+import runpy
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG = os.path.join(ROOT, 'src', 'gunicorn_conf.py')
+
+
+def test_worker_class_from_environment(monkeypatch):
+    """Test the worker class and connection settings follow the environment"""
+    monkeypatch.delenv('GUNICORN_WORKER_CLASS', raising=False)
+    assert runpy.run_path(CONFIG)['worker_class'] == 'sync'
+
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'gevent')
+    monkeypatch.setenv('GUNICORN_WORKER_CONNECTIONS', '250')
+    config = runpy.run_path(CONFIG)
+    assert config['worker_class'] == 'gevent'
+    assert config['worker_connections'] == 250
+    assert config['preload_app'] is True
+
+
+def test_loading_config_does_not_patch_process(monkeypatch):
+    """Test gevent monkey-patching only happens when gunicorn loads the config"""
+    monkey = pytest.importorskip('gevent.monkey')
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'gevent')
+    runpy.run_path(CONFIG)
+    assert not monkey.is_module_patched('socket')
+
+
+def test_worker_overrides(monkeypatch):
+    """Test explicit worker and thread counts win over the tuned values"""
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'sync')
+    monkeypatch.setenv('GUNICORN_WORKERS', '3')
+    monkeypatch.setenv('GUNICORN_THREADS', '4')
+    monkeypatch.setenv('GUNICORN_PRELOAD', 'false')
+    config = runpy.run_path(CONFIG)
+    assert (config['workers'], config['threads'], config['preload_app']) == (3, 4, False)
+
+    monkeypatch.delenv('GUNICORN_WORKERS')
+    monkeypatch.delenv('GUNICORN_THREADS')
+    config = runpy.run_path(CONFIG)
+    assert config['workers'] == config['tuned']['workers']
+    assert config['threads'] == config['tuned']['threads']
+
+
+def test_gevent_worker_serves_routes_concurrently():
+    """Test the unchanged routes answer concurrent clients under the gevent worker"""
+    pytest.importorskip('gunicorn')
+    pytest.importorskip('gevent')
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    env = dict(os.environ, GUNICORN_WORKER_CLASS='gevent')
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', CONFIG, '--bind', f"127.0.0.1:{port}",
+         '--workers', '1', '--graceful-timeout', '1', 'src.app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                requests.get(f"{base}/health", timeout=1)
+                break
+            except requests.RequestException:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+
+        # A stalled client must not block the single worker
+        stalled = socket.create_connection(('127.0.0.1', port))
+        stalled.sendall(b"GET /health HTTP/1.1\r\n")
+
+        paths = ['/', '/health', '/api/info', '/api/secure-data?user_id=7'] * 10
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            responses = list(pool.map(lambda path: requests.get(f"{base}{path}", timeout=5), paths))
+        stalled.close()
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[3].json()['user_id'] == 7
+    server_settings = responses[2].json()['server']
+    assert server_settings['worker_class'] == 'gevent'
+    assert server_settings['workers'] == 1
+    assert server_settings['preload_app'] is True
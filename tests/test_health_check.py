@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+from flask import Flask, jsonify
+
+import health_check
+from async_checks import collect_health_checks
+from http_pool import DEFAULT_KEEPALIVE, DEFAULT_POOL_SIZE
+
+
+def make_stub_app(delays):
+    """Flask stub that sleeps ``delays[path]`` seconds before answering"""
+    stub = Flask('stub')
+
+    def respond(path):
+        time.sleep(delays.get(path, 0))
+        return jsonify({'status': 'healthy', 'path': path})
+
+    for path in ('/', '/health', '/api/info', '/api/secure-data'):
+        stub.add_url_rule(path, path, lambda path=path: respond(path))
+    return stub
+
+
+@pytest.fixture
+def keepalive_server():
+    """aiohttp stub server; unlike the Werkzeug dev server it keeps connections open"""
+    loop = asyncio.new_event_loop()
+    stub = web.Application()
+
+    async def respond(request):
+        return web.json_response({'status': 'healthy'})
+
+    for path in ('/', '/health', '/api/info', '/api/secure-data'):
+        stub.router.add_get(path, respond)
+
+    runner = web.AppRunner(stub)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    loop.run_until_complete(site.start())
+    port = runner.addresses[0][1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{port}"
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def test_async_checks_match_sync_schema(live_server):
+    """Test the async engine returns the same keys as the blocking checks"""
+    async_results = collect_health_checks(live_server.url, timeout=5)
+    sync_results = health_check.run_sync_health_checks(live_server.url, timeout=5)
+
+    assert set(sync_results) <= set(async_results)
+    for name in sync_results:
+        assert set(sync_results[name]) <= set(async_results[name])
+    assert async_results['application_health']['status'] == 'healthy'
+    assert async_results['api_endpoints']['/api/info']['status_code'] == 200
+    assert async_results['performance']['success_rate'] == 100
+
+
+def test_async_checks_run_concurrently(serve):
+    """Test wall-clock time tracks the slowest check, not the sum"""
+    server = serve(make_stub_app({'/': 0.4, '/api/info': 0.4, '/api/secure-data': 0.4}))
+
+    start = time.perf_counter()
+    results = collect_health_checks(server.url, timeout=5)
+    elapsed = time.perf_counter() - start
+
+    assert results['api_endpoints']['/api/info']['status_code'] == 200
+    assert results['security_headers']['security_score'] == 0
+    assert elapsed < 1.0
+
+
+def test_async_checks_respect_budget(serve):
+    """Test a stuck endpoint is reported as an error once the budget runs out"""
+    server = serve(make_stub_app({'/health': 2.0}))
+
+    start = time.perf_counter()
+    results = collect_health_checks(server.url, timeout=30, budget=0.5)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5
+    assert results['application_health']['status'] == 'error'
+    assert results['performance']['success_rate'] == 0
+    assert results['api_endpoints']['/api/info']['status_code'] == 200
+
+
+def test_generate_health_report_async(live_server, tmp_path, monkeypatch):
+    """Test the report is produced with the async engine"""
+    monkeypatch.chdir(tmp_path)
+
+    report = health_check.generate_health_report('staging', live_server.url, timeout=5)
+
+    assert report['application_health']['status'] == 'healthy'
+    assert 'performance' in report
+    assert list(tmp_path.glob('health-report-staging-*.json'))
+
+
+def test_async_checks_reuse_connections(keepalive_server):
+    """Test keep-alive lets the performance probes skip connection setup"""
+    results = collect_health_checks(keepalive_server, timeout=5)
+
+    performance = results['performance']
+    assert performance['reused_connections'] >= performance['iterations'] - 1
+    assert performance['avg_ttfb'] is not None
+
+    timing = results['application_health']['timing']
+    assert timing['total'] >= timing['ttfb'] >= 0
+    assert results['connection_setup']['tcp_connect'] is not None
+    assert results['connection_setup']['tls_handshake'] is None
+
+
+def test_async_checks_without_keepalive(keepalive_server):
+    """Test keepalive=0 opens a fresh connection for every request"""
+    results = collect_health_checks(keepalive_server, timeout=5, keepalive=0)
+
+    assert results['performance']['reused_connections'] == 0
+    assert results['application_health']['timing']['reused_connection'] is False
+
+
+def test_sync_checks_share_session(live_server):
+    """Test the blocking checks go through the pooled session"""
+    first = health_check.get_sync_session()
+    health_check.run_sync_health_checks(live_server.url, timeout=5)
+
+    assert health_check.get_sync_session() is first
+    assert first.get_adapter(live_server.url).poolmanager.pools
+
+
+def test_sync_session_follows_settings():
+    """Test changing the pool size or keep-alive rebuilds the sync session"""
+    first = health_check.get_sync_session(4, 30)
+    assert health_check.get_sync_session() is first
+    assert health_check.get_sync_session(4, 60) is first
+
+    resized = health_check.get_sync_session(8, 30)
+    assert resized is not first
+    assert resized.get_adapter('http://example.com')._pool_maxsize == 8
+
+    closing = health_check.get_sync_session(8, 0)
+    assert closing.headers['Connection'] == 'close'
+    health_check.get_sync_session(DEFAULT_POOL_SIZE, DEFAULT_KEEPALIVE)
+
+
+def test_sync_checks_without_keepalive(keepalive_server):
+    """Test keepalive=0 leaves no idle connection behind in the sync pool"""
+    try:
+        health_check.run_sync_health_checks(keepalive_server, timeout=5, keepalive=0)
+        session = health_check.get_sync_session()
+        pool = session.get_adapter(keepalive_server).poolmanager.connection_from_url(keepalive_server)
+        assert all(conn is None or conn.sock is None for conn in list(pool.pool.queue))
+    finally:
+        health_check.get_sync_session(DEFAULT_POOL_SIZE, DEFAULT_KEEPALIVE)
@@ -0,0 +1,75 @@
+from findings import make_finding
+from html_report import render_findings, render_raw_text, render_report, write_report
+
+
+def findings(count, title='Overflow'):
+    for n in range(count):
+        yield make_finding('trivy', f"CVE-{n}", package='openssl@1.1', severity='HIGH', title=title)
+
+
+def security_data():
+    return {
+        'summary': {'total_vulnerabilities': 3, 'critical': 0, 'high': 3, 'medium': 0, 'low': 0},
+        'sast': {'bandit_html': '<p>bandit</p>'},
+        'dependencies': {'safety_html': '<p>safety</p>', 'owasp_html': '<p>owasp</p>'},
+        'container': {'html': '<p>trivy</p>'},
+        'dast': {'html': '<p>zap</p>'},
+        'recommendations': '<li>Patch</li>'
+    }
+
+
+def test_findings_are_paginated():
+    """Test rows are split into collapsible pages with only the first one open"""
+    html = ''.join(render_findings(findings(2500), page_size=1000))
+
+    assert html.count('<tr class=') == 2500
+    assert html.count('<details') == 4
+    assert '<details open><summary>Findings 1&ndash;1000' in html
+    assert '<details><summary>Findings 2001&ndash;2500' in html
+    assert '2500 findings in total' in html
+
+
+def test_findings_are_rendered_lazily():
+    """Test a page is emitted before the findings source is exhausted"""
+    consumed = []
+
+    def source():
+        for finding in findings(10_000):
+            consumed.append(1)
+            yield finding
+
+    chunks = render_findings(source(), page_size=100)
+    next(chunks)
+    next(chunks)
+
+    assert len(consumed) == 100
+
+
+def test_findings_and_raw_text_are_escaped(tmp_path):
+    """Test finding fields and tool output cannot inject markup"""
+    html = ''.join(render_findings(findings(1, title='<script>x</script>')))
+    assert '<script>' not in html and '&lt;script&gt;' in html
+
+    raw = tmp_path / 'trivy-report.txt'
+    raw.write_text('<b>' + 'x' * 200_000)
+    text = ''.join(render_raw_text(str(raw), chunk_size=4096))
+    assert '&lt;b&gt;' in text
+    assert text.count('x') >= 200_000
+    assert list(render_raw_text(str(tmp_path / 'missing.txt'))) == []
+
+
+def test_write_report(tmp_path):
+    """Test the streamed report contains every section and findings table"""
+    raw = tmp_path / 'bandit-report.txt'
+    raw.write_text('Issue: [B101]')
+    path = tmp_path / 'security-summary.html'
+
+    write_report(path, render_report(security_data(), {'trivy': lambda: render_findings(findings(3))},
+                                     {'bandit': str(raw)}))
+
+    html = path.read_text()
+    for section in ('<p>bandit</p>', '<p>owasp</p>', '<p>trivy</p>', '<p>zap</p>', '<li>Patch</li>'):
+        assert section in html
+    assert html.count('CVE-') == 3
+    assert 'Issue: [B101]' in html
+    assert html.rstrip().endswith('</html>')
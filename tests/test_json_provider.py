@@ -0,0 +1,91 @@
+import json
+import time
+from datetime import date, datetime, timezone
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import src.json_provider as json_provider
+from src.app import app
+from src.json_provider import FastJSONProvider
+
+ENDPOINTS = ['/', '/health', '/api/info', '/api/secure-data?user_id=123', '/missing']
+
+SAMPLE = {'when': datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc),
+          'day': date(2024, 5, 1), 'b': [1, 2.5, None, True], 'a': 'café'}
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def provider(request, monkeypatch):
+    """The fast provider with orjson and with the stdlib fallback"""
+    if request.param == 'json':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    elif json_provider.orjson is None:
+        pytest.skip('orjson is not installed')
+    provider_app = Flask('provider')
+    provider_app.json = FastJSONProvider(provider_app)
+    yield provider_app.json
+
+
+def test_app_uses_fast_provider():
+    """Test the application serializes through the fast provider"""
+    assert isinstance(app.json, FastJSONProvider)
+    assert app.json.backend == ('orjson' if json_provider.orjson is not None else 'json')
+
+
+def test_datetimes_encoded_as_iso_8601(provider):
+    """Test both backends produce the same compact, sorted ISO 8601 output"""
+    assert provider.dumps(SAMPLE) == (
+        '{"a":"café","b":[1,2.5,null,true],"day":"2024-05-01",'
+        '"when":"2024-05-01T12:30:15.250000+00:00"}')
+    assert provider.loads(provider.dumps(SAMPLE))['b'] == [1, 2.5, None, True]
+
+
+def test_response_body_is_bytes(provider):
+    """Test responses are encoded straight to UTF-8 bytes with a trailing newline"""
+    response = provider.response(SAMPLE)
+    assert response.mimetype == 'application/json'
+    assert response.data.endswith(b'}\n')
+    assert json.loads(response.data)['when'] == '2024-05-01T12:30:15.250000+00:00'
+
+
+def test_unserializable_type_raises(provider):
+    """Test unknown types still raise TypeError"""
+    with pytest.raises(TypeError):
+        provider.dumps({'value': object()})
+
+
+def test_health_timestamp_is_iso_8601():
+    """Test views return datetimes and the provider formats them"""
+    data = app.test_client().get('/health').get_json()
+    assert datetime.fromisoformat(data['timestamp']).tzinfo is not None
+
+
+def per_call_seconds(func, iterations=2000, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+@pytest.mark.parametrize('path', ENDPOINTS)
+def test_endpoint_serialization_benchmark(path):
+    """Microbenchmark: encoding each endpoint's payload is no slower than Flask's default"""
+    if json_provider.orjson is None:
+        pytest.skip('orjson is not installed')
+    payload = app.test_client().get(path).get_json()
+    payload.update(timestamp=datetime.now(timezone.utc))
+    default = DefaultJSONProvider(app)
+
+    with app.app_context():
+        fast = per_call_seconds(lambda: app.json.response(payload))
+        stdlib = per_call_seconds(lambda: default.response(payload))
+        request = per_call_seconds(lambda: app.test_client().get(path), iterations=200)
+
+    print(f"\n{path}: request {request * 1e6:.1f} us, encode {fast * 1e6:.2f} us "
+          f"(Flask default {stdlib * 1e6:.2f} us)")
+    assert fast < stdlib
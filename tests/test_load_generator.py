@@ -0,0 +1,85 @@
+import pytest
+from flask import Flask, jsonify
+
+import health_check
+from src.app import app
+from load_generator import evaluate_load_thresholds, parse_endpoint_mix, run_load_test
+from quantile_sketch import QuantileSketch
+
+
+def test_parse_endpoint_mix():
+    """Test weighted endpoint specs are restricted to /api/* routes"""
+    assert parse_endpoint_mix(['/api/info:3', '/api/secure-data?user_id=1']) == {
+        '/api/info': 3.0,
+        '/api/secure-data?user_id=1': 1.0
+    }
+    with pytest.raises(ValueError):
+        parse_endpoint_mix(['/health'])
+
+
+def test_closed_loop_load(live_server, monkeypatch):
+    """Test closed-loop load against the real application"""
+    # Every simulated client shares one address and user_id
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_ENABLED', False)
+    report = run_load_test(live_server.url, concurrency=4, duration=0.5, seed=1)
+
+    assert report['requests'] > 0
+    assert report['errors'] == 0
+    assert report['latency']['p99'] is not None
+    assert set(report['endpoints']) == {'/api/info', '/api/secure-data?user_id=123'}
+    assert sum(e['requests'] for e in report['endpoints'].values()) == report['requests']
+    sketch = QuantileSketch.from_dict(report['latency_sketch'])
+    assert sketch.count == report['successes']
+    assert sketch.percentile(99) == report['latency']['p99']
+
+
+def test_open_loop_rate(live_server):
+    """Test open-loop load issues requests at the scheduled rate"""
+    report = run_load_test(live_server.url, mode='open', rate=40, duration=0.5,
+                           concurrency=4, endpoints={'/api/info': 1})
+
+    assert report['mode'] == 'open'
+    assert report['requests'] == 20
+    assert report['errors'] == 0
+
+
+def test_error_breakdown(serve):
+    """Test failed responses are grouped by error type"""
+    stub = Flask('stub')
+    stub.add_url_rule('/api/broken', 'broken', lambda: (jsonify({'error': 'boom'}), 500))
+    stub.add_url_rule('/api/info', 'info', lambda: jsonify({}))
+    server = serve(stub)
+
+    report = run_load_test(server.url, concurrency=2, duration=0.3,
+                           endpoints={'/api/broken': 1, '/api/info': 1}, seed=3)
+
+    assert report['errors_by_type'].keys() == {'HTTP 500'}
+    assert report['endpoints']['/api/info']['errors'] == 0
+    assert 0 < report['error_rate'] < 100
+
+
+def test_load_thresholds():
+    """Test load gates on latency percentiles, error rate and throughput"""
+    load_report = {
+        'latency': {'p50': 0.01, 'p90': 0.05, 'p99': 0.4, 'p99.9': 0.9},
+        'error_rate': 2.0,
+        'throughput': 50.0
+    }
+
+    assert evaluate_load_thresholds(load_report, {'p99': 0.5, 'error_rate': 5}) == []
+    issues = evaluate_load_thresholds(load_report, {'p99': 0.2, 'error_rate': 1, 'min_throughput': 100})
+    assert len(issues) == 3
+
+
+def test_health_report_gates_on_load(live_server, tmp_path, monkeypatch):
+    """Test load test results feed into the overall report status"""
+    monkeypatch.chdir(tmp_path)
+
+    report = health_check.generate_health_report(
+        'staging', live_server.url, timeout=5,
+        load_profile={'concurrency': 2, 'duration': 0.3},
+        load_thresholds={'p50': 0.0}
+    )
+
+    assert report['load_test']['requests'] > 0
+    assert any('p50 latency' in issue for issue in report['issues'])
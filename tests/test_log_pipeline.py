@@ -0,0 +1,197 @@
+import gc
+import io
+import json
+import logging
+import os
+import threading
+import weakref
+
+import pytest
+
+from src.log_pipeline import BatchingQueueHandler, JSONFormatter, SamplingFilter, configure_logging
+
+
+class RecordingStream:
+    """Sink that counts write calls and can be held shut to simulate a stalled disk"""
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writes = 0
+        self.open = threading.Event()
+        self.open.set()
+        self.writing = threading.Event()
+
+    def write(self, text):
+        self.writing.set()
+        self.open.wait(5)
+        self.writes += 1
+        self.buffer.write(text)
+
+    def flush(self):
+        pass
+
+    def lines(self):
+        return [json.loads(line) for line in self.buffer.getvalue().splitlines()]
+
+
+@pytest.fixture
+def pipeline():
+    """A private logger routed through a JSON batching handler"""
+    stream = RecordingStream()
+    handler = BatchingQueueHandler(stream=stream, queue_size=100)
+    handler.setFormatter(JSONFormatter())
+    logger = logging.getLogger(f"test_log_pipeline.{id(stream)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    yield logger, handler, stream
+    logger.removeHandler(handler)
+    handler.close()
+
+
+def test_json_lines_with_extra_and_exception(pipeline):
+    """Test records become one JSON object per line with extras and tracebacks"""
+    logger, handler, stream = pipeline
+    logger.info("Served %s in %.1f ms", '/api/info', 1.25, extra={'status': 200})
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("Request failed")
+    handler.flush()
+
+    served, failed = stream.lines()
+    assert served['message'] == 'Served /api/info in 1.2 ms'
+    assert served['level'] == 'INFO'
+    assert served['status'] == 200
+    assert served['timestamp'].endswith('+00:00')
+    assert failed['level'] == 'ERROR'
+    assert 'ZeroDivisionError' in failed['exception']
+
+
+def test_messages_formatted_on_writer_thread(pipeline):
+    """Test %-arguments are rendered lazily by the background writer"""
+    logger, handler, stream = pipeline
+    rendered_on = []
+
+    class Lazy:
+        def __str__(self):
+            rendered_on.append(threading.current_thread().name)
+            return 'lazy'
+
+    # Straight to the handler: pytest's own capture handlers render eagerly
+    handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 1, "value %s", (Lazy(),), None))
+    handler.flush()
+    assert rendered_on == ['log-writer']
+    assert stream.lines()[0]['message'] == 'value lazy'
+
+
+def test_records_written_in_batches(pipeline):
+    """Test a burst of records reaches the sink in a few large writes"""
+    logger, handler, stream = pipeline
+    stream.open.clear()
+    logger.info("warm-up")
+    for i in range(90):
+        logger.info("line %d", i)
+    stream.open.set()
+    handler.flush()
+
+    assert len(stream.lines()) == 91
+    assert stream.writes <= 3
+
+
+def test_full_queue_drops_instead_of_blocking(pipeline):
+    """Test a stalled sink makes logging drop and count records, not block"""
+    logger, handler, stream = pipeline
+    stream.open.clear()
+    logger.info("first")
+    assert stream.writing.wait(5)  # the writer is now stuck in the sink
+    for i in range(250):
+        logger.info("line %d", i)
+
+    assert handler.dropped == 150
+    stream.open.set()
+    handler.flush()
+    report = stream.lines()[-1]
+    assert report['message'].startswith('Log queue full, dropped')
+    assert report['dropped_total'] == handler.dropped
+
+
+def test_sampling_keeps_one_in_n_info_records():
+    """Test INFO records are sampled per template while warnings all pass"""
+    sampler = SamplingFilter(rate=10)
+    make = lambda level, msg: logging.LogRecord('app', level, __file__, 1, msg, (), None)
+
+    kept = sum(sampler.filter(make(logging.INFO, 'hit %s')) for _ in range(100))
+    other = sum(sampler.filter(make(logging.INFO, 'miss %s')) for _ in range(5))
+    warnings = sum(sampler.filter(make(logging.WARNING, 'hit %s')) for _ in range(5))
+
+    assert (kept, other, warnings) == (10, 1, 5)
+    assert sampler.sampled_out == 94
+
+
+def test_sampling_groups_structured_messages_by_call_site():
+    """Test dict messages are sampled per logging call rather than raising"""
+    sampler = SamplingFilter(rate=10)
+    make = lambda msg, line: logging.LogRecord('app', logging.INFO, __file__, line, msg, (), None)
+
+    kept = sum(sampler.filter(make({'event': 'hit', 'n': n}, 1)) for n in range(100))
+    other = sum(sampler.filter(make({'event': 'miss'}, 2)) for _ in range(5))
+
+    assert (kept, other) == (10, 1)
+
+
+def test_configure_logging_respects_existing_handlers():
+    """Test configure_logging behaves like basicConfig unless forced"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    root.addHandler(logging.NullHandler())
+    try:
+        assert configure_logging() is None
+
+        stream = RecordingStream()
+        handler = configure_logging(stream=stream, sample_rate=2, force=True)
+        assert root.handlers == [handler]
+        logging.getLogger('app').info("configured")
+        handler.flush()
+        assert stream.lines()[0]['message'] == 'configured'
+    finally:
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+            existing.close()
+        for existing in saved_handlers:
+            root.addHandler(existing)
+        root.setLevel(saved_level)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+def test_writer_restarted_after_fork(pipeline, tmp_path):
+    """Test a forked worker gets its own writer thread"""
+    logger, handler, stream = pipeline
+    path = tmp_path / 'child.log'
+    pid = os.fork()
+    if pid == 0:
+        try:
+            handler.stream = open(path, 'w')
+            logger.info("from child")
+            handler.flush()
+            handler.stream.close()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    assert json.loads(path.read_text())['message'] == 'from child'
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+def test_closed_handler_not_restarted_after_fork():
+    """Test the fork hook neither revives a closed handler nor keeps it alive"""
+    handler = BatchingQueueHandler(stream=RecordingStream())
+    handler.close()
+    pid = os.fork()
+    if pid == 0:
+        os._exit(1 if handler._thread.is_alive() else 0)
+    assert os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) == 0
+
+    ref = weakref.ref(handler)
+    del handler
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from flask import Flask
+from prometheus_client import CollectorRegistry
+
+from src.app import app
+from src.metrics import Metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the Flask application"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def sample_value(registry, name, labels):
+    return registry.get_sample_value(name, labels) or 0
+
+
+def test_metrics_endpoint(client):
+    """Test /metrics exposes the series the alert rules query"""
+    client.get('/health')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+
+    body = response.data.decode()
+    assert 'http_request_duration_seconds_bucket' in body
+    assert 'http_requests_total{endpoint="/health",method="GET",status="200"}' in body
+    assert 'http_requests_in_progress' in body
+
+
+def test_requests_counted_by_route_and_status():
+    """Test counters use the route template and unmatched paths share one label"""
+    registry = CollectorRegistry()
+    bare = Flask('bare')
+    Metrics(bare, registry=registry)
+    bare.add_url_rule('/items/<int:item_id>', 'item', lambda item_id: 'ok')
+    client = bare.test_client()
+
+    client.get('/items/1')
+    client.get('/items/2')
+    client.get('/missing/a')
+    client.get('/missing/b')
+
+    assert sample_value(registry, 'http_requests_total',
+                        {'method': 'GET', 'endpoint': '/items/<int:item_id>', 'status': '200'}) == 2
+    assert sample_value(registry, 'http_requests_total',
+                        {'method': 'GET', 'endpoint': 'unmatched', 'status': '404'}) == 2
+    assert sample_value(registry, 'http_request_duration_seconds_count',
+                        {'method': 'GET', 'endpoint': '/items/<int:item_id>'}) == 2
+    assert sample_value(registry, 'http_requests_in_progress', {}) == 0
+
+
+def test_errors_recorded_and_gauge_released():
+    """Test a failing view is counted as 500 and leaves no request in flight"""
+    registry = CollectorRegistry()
+    bare = Flask('bare')
+    Metrics(bare, registry=registry)
+
+    def boom():
+        raise RuntimeError('boom')
+
+    bare.add_url_rule('/boom', 'boom', boom)
+    bare.test_client().get('/boom')
+
+    assert sample_value(registry, 'http_requests_total',
+                        {'method': 'GET', 'endpoint': '/boom', 'status': '500'}) == 1
+    assert sample_value(registry, 'http_requests_in_progress', {}) == 0
+
+
+def test_multiprocess_aggregation(tmp_path):
+    """Test /metrics aggregates samples written by other worker processes"""
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    worker = "from src.app import app; app.test_client().get('/health')"
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', worker], cwd=ROOT, env=env, check=True)
+
+    scrape = ("from src.app import app; "
+              "print(app.test_client().get('/metrics').data.decode())")
+    output = subprocess.run([sys.executable, '-c', scrape], cwd=ROOT, env=env,
+                            check=True, capture_output=True, text=True).stdout
+
+    assert 'http_requests_total{endpoint="/health",method="GET",status="200"} 2.0' in output
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from flask import Flask
+
+from src.app import app
+from src.probes import LIVE_BODY, Probes
+
+
+def make_probe_app(ttl=60):
+    probe_app = Flask('probes')
+    probe_app.config['READINESS_TTL'] = ttl
+    probes = Probes(probe_app)
+    return probe_app, probes
+
+
+def test_livez_served_before_routing():
+    """Test /livez returns the pre-encoded body without reaching Flask"""
+    with app.test_client() as client:
+        response = client.get('/livez')
+    assert response.status_code == 200
+    assert response.data == LIVE_BODY
+    assert response.headers['Cache-Control'] == 'no-store'
+
+
+def test_readyz_reports_checks():
+    """Test /readyz is ready when every registered check passes"""
+    with app.test_client() as client:
+        response = client.get('/readyz')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'ready'
+    assert data['checks']['metrics_storage']['status'] == 'ok'
+
+
+def test_readyz_failures_and_timeouts():
+    """Test failing, raising and slow checks make /readyz answer 503"""
+    probe_app, probes = make_probe_app()
+    probe_app.config['READINESS_CHECK_TIMEOUT'] = 0.2
+    release = threading.Event()
+
+    probes.check('database')(lambda: True)
+    probes.check('cache')(lambda: False)
+    probes.check('queue')(lambda: 1 / 0)
+    probes.check('search')(lambda: release.wait(5))
+
+    start = time.perf_counter()
+    response = probe_app.test_client().get('/readyz')
+    elapsed = time.perf_counter() - start
+    release.set()
+
+    assert response.status_code == 503
+    checks = response.get_json()['checks']
+    assert checks['database']['status'] == 'ok'
+    assert checks['cache']['status'] == 'failed'
+    assert checks['queue']['error'] == 'division by zero'
+    assert checks['search']['status'] == 'timeout'
+    assert elapsed < 1
+
+
+def test_hung_check_not_resubmitted():
+    """Test probes wait on a still-running check instead of stacking copies in the pool"""
+    probe_app, probes = make_probe_app(ttl=0)
+    probe_app.config['READINESS_CHECK_TIMEOUT'] = 0.05
+    release = threading.Event()
+    calls = []
+    probes.check('database')(lambda: calls.append(1) or release.wait(5))
+    probes.check('cache')(lambda: True)
+    client = probe_app.test_client()
+
+    for _ in range(6):
+        response = client.get('/readyz')
+        assert response.get_json()['checks']['database']['status'] == 'timeout'
+        assert response.get_json()['checks']['cache']['status'] == 'ok'
+    assert len(calls) == 1
+
+    release.set()
+    probes._running['database'].result(timeout=1)
+    assert client.get('/readyz').status_code == 200
+    assert len(calls) == 2
+
+
+def test_readyz_runs_checks_concurrently():
+    """Test checks run side by side, each bounded by its own timeout"""
+    probe_app, probes = make_probe_app()
+    for name in ('a', 'b', 'c'):
+        probes.check(name, timeout=1)(lambda: time.sleep(0.2))
+
+    start = time.perf_counter()
+    response = probe_app.test_client().get('/readyz')
+    assert response.status_code == 200
+    assert time.perf_counter() - start < 0.5
+
+
+def test_readyz_cached_for_ttl():
+    """Test probes within the TTL reuse the last result instead of re-running checks"""
+    probe_app, probes = make_probe_app(ttl=60)
+    calls = []
+    probes.check('backend')(lambda: calls.append(1))
+    client = probe_app.test_client()
+
+    for _ in range(20):
+        assert client.get('/readyz').status_code == 200
+    assert len(calls) == 1
+
+    probe_app.config['READINESS_TTL'] = 0
+    probes.invalidate()
+    client.get('/readyz')
+    client.get('/readyz')
+    assert len(calls) == 3
@@ -0,0 +1,94 @@
+import json
+import random
+
+import pytest
+
+import health_check
+from quantile_sketch import QuantileSketch, combine_reports
+
+
+def exact_percentile(ordered, percent):
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def lognormal_samples(count, seed):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(-4, 1.2) for _ in range(count)]
+
+
+def test_sketch_tail_quantiles_within_accuracy():
+    """Test p99 and p99.9 stay within the relative accuracy of the true samples"""
+    samples = lognormal_samples(100000, 3)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for sample in samples:
+        sketch.add(sample)
+
+    ordered = sorted(samples)
+    for percent in (50, 90, 99, 99.9):
+        assert sketch.percentile(percent) == pytest.approx(exact_percentile(ordered, percent), rel=0.01)
+    assert sketch.count == len(samples)
+    assert sketch.mean == pytest.approx(sum(samples) / len(samples))
+    assert sketch.max == ordered[-1]
+    assert len(sketch.bins) < 1000
+
+
+def test_sketch_memory_is_capped():
+    """Test folding keeps the bin count fixed and the tail accurate"""
+    rng = random.Random(5)
+    samples = [10 ** rng.uniform(-9, 3) for _ in range(50000)]
+    sketch = QuantileSketch(max_bins=256)
+    for sample in samples:
+        sketch.add(sample)
+
+    assert len(sketch.bins) == 256
+    ordered = sorted(samples)
+    assert sketch.percentile(99) == pytest.approx(exact_percentile(ordered, 99), rel=0.01)
+    assert sketch.percentile(99.9) == pytest.approx(exact_percentile(ordered, 99.9), rel=0.01)
+
+
+def test_sketch_merge_equals_single_sketch():
+    """Test merged sketches answer exactly like one sketch over all samples"""
+    samples = lognormal_samples(20000, 9)
+    combined, parts = QuantileSketch(), [QuantileSketch() for _ in range(4)]
+    for i, sample in enumerate(samples):
+        combined.add(sample)
+        parts[i % 4].add(sample)
+
+    merged = QuantileSketch()
+    for part in parts:
+        merged.merge(part)
+    assert merged.bins == combined.bins
+    assert merged.summary() == pytest.approx(combined.summary())
+
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(relative_accuracy=0.02))
+
+
+def test_sketch_round_trips_through_json():
+    """Test a serialized sketch rebuilds to the same quantiles"""
+    sketch = QuantileSketch()
+    for sample in lognormal_samples(5000, 1) + [0.0]:
+        sketch.add(sample)
+
+    rebuilt = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert rebuilt.bins == sketch.bins
+    assert rebuilt.zero_count == 1
+    assert rebuilt.summary() == sketch.summary()
+
+
+def test_combine_saved_reports(live_server, tmp_path, monkeypatch):
+    """Test latency from several saved reports combines into one sketch"""
+    monkeypatch.chdir(tmp_path)
+    first = health_check.generate_health_report('staging', live_server.url, timeout=5)
+    second = health_check.generate_health_report('production', live_server.url, timeout=5, engine='sync')
+    assert first['performance']['latency']['p99'] is not None
+    assert second['performance']['latency']['p99'] is not None
+
+    paths = sorted(str(path) for path in tmp_path.glob('health-report-*.json'))
+    combined = combine_reports(paths)
+
+    assert combined.count == first['performance']['latency_sketch']['count'] + \
+        second['performance']['latency_sketch']['count']
+    assert combined.max == max(first['performance']['max_response_time'],
+                               second['performance']['max_response_time'])
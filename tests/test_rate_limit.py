@@ -0,0 +1,222 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from src.app import app
+from src.rate_limit import (AdmissionController, LocalBuckets, RateLimiter, RedisBuckets, parse_limit,
+                            parse_request_start)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Records ``evalsha`` calls the way redis-py's registered scripts make them"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def register_script(self, script):
+        return lambda keys, args: self.evalsha('sha1', len(keys), *keys, *args)
+
+    def evalsha(self, sha, numkeys, *keys_and_args):
+        self.calls.append(keys_and_args)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def make_limited_app(backend, client_limit='100:100', user_limit='2:3', trusted_proxies=0):
+    limited_app = Flask('limited')
+    limited_app.config.update(RATE_LIMIT_CLIENT=client_limit, RATE_LIMIT_USER=user_limit)
+    if trusted_proxies:
+        # As src/app.py does for TRUSTED_PROXIES
+        limited_app.wsgi_app = ProxyFix(limited_app.wsgi_app, x_for=trusted_proxies)
+    limiter = RateLimiter(limited_app, backend=backend)
+
+    @limited_app.route('/data')
+    @limiter.limit(user_id=lambda: '7')
+    def data():
+        return {'ok': True}
+
+    return limited_app
+
+
+def test_parse_limit():
+    """Test "rate:burst" strings, a default burst and disabled limits"""
+    assert parse_limit('20:40') == (20.0, 40.0)
+    assert parse_limit('0.5') == (0.5, 1.0)
+    assert parse_limit('') is None
+    for invalid in ('0', '0:10', '-1:5', '5:0.5', 'nan'):
+        with pytest.raises(ValueError):
+            parse_limit(invalid)
+    with pytest.raises(ValueError):
+        make_limited_app(LocalBuckets(), client_limit='0:10')
+
+
+def test_redis_buckets_run_script():
+    """Test the Lua script gets the key, rate, burst and time, and its reply is decoded"""
+    client = FakeRedis([[1, 0], [0, 1500]])
+    buckets = RedisBuckets(client, clock=lambda: 1234.5)
+
+    assert buckets.take('user:7', 2.0, 3.0) == (True, 0.0)
+    assert buckets.take('user:7', 2.0, 3.0) == (False, 1.5)
+    assert client.calls[0] == ('ratelimit:user:7', 2.0, 3.0, 1234.5)
+
+
+def test_redis_outage_fails_open(caplog):
+    """Test an unreachable Redis lets requests through and logs why"""
+    client = make_limited_app(RedisBuckets(FakeRedis([ConnectionError('refused')] * 2))).test_client()
+
+    assert client.get('/data').status_code == 200
+    assert 'Rate limit backend unavailable' in caplog.text
+
+
+def test_bucket_refills_over_time():
+    """Test a bucket allows its burst, then one request per refilled token"""
+    clock = FakeClock()
+    buckets = LocalBuckets(clock=clock)
+
+    assert [buckets.take('k', 2, 3)[0] for _ in range(4)] == [True, True, True, False]
+    assert buckets.take('k', 2, 3) == (False, 0.5)
+
+    clock.now += 0.5
+    assert buckets.take('k', 2, 3)[0] is True
+    assert buckets.take('k', 2, 3)[0] is False
+
+
+def test_bucket_keys_bounded():
+    """Test the least recently used keys are evicted beyond max_keys"""
+    buckets = LocalBuckets(max_keys=2)
+    for key in ('a', 'b', 'a', 'c'):
+        buckets.take(key, 1, 1)
+    assert list(buckets._buckets) == ['a', 'c']
+
+
+def test_user_limit_returns_429():
+    """Test exceeding the per-user budget answers 429 with Retry-After"""
+    client = make_limited_app(LocalBuckets(clock=FakeClock())).test_client()
+
+    statuses = [client.get('/data').status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+    response = client.get('/data')
+    assert response.headers['Retry-After'] == '1'
+    assert 'user' in response.get_json()['error']
+
+
+def test_shared_backend_across_workers():
+    """Test workers sharing a backend draw from one budget per key"""
+    shared = LocalBuckets(clock=FakeClock())
+    workers = [make_limited_app(shared).test_client() for _ in range(2)]
+
+    statuses = [workers[i % 2].get('/data').status_code for i in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_client_limit_applies_across_users():
+    """Test the per-client bucket still applies when user ids rotate"""
+    client = make_limited_app(LocalBuckets(clock=FakeClock()), client_limit='1:2',
+                              user_limit='').test_client()
+    assert [client.get('/data').status_code for _ in range(3)] == [200, 200, 429]
+
+
+def test_trusted_proxy_keys_on_forwarded_client():
+    """Test clients behind a trusted proxy get their own buckets"""
+    def statuses(trusted_proxies):
+        client = make_limited_app(LocalBuckets(clock=FakeClock()), client_limit='1:1', user_limit='',
+                                  trusted_proxies=trusted_proxies).test_client()
+        return [client.get('/data', headers={'X-Forwarded-For': f"10.0.0.{i}"}).status_code
+                for i in range(3)]
+
+    assert statuses(1) == [200, 200, 200]
+    assert statuses(0) == [200, 429, 429]
+
+
+def test_admission_sheds_beyond_in_flight_limit():
+    """Test requests beyond ADMISSION_MAX_IN_FLIGHT get 503 immediately"""
+    admission_app = Flask('admission')
+    admission_app.config['ADMISSION_MAX_IN_FLIGHT'] = 1
+    admission = AdmissionController(admission_app)
+    entered, release = threading.Event(), threading.Event()
+
+    @admission_app.route('/slow')
+    @admission.admit
+    def slow():
+        entered.set()
+        release.wait(5)
+        return {'ok': True}
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(admission_app.test_client().get('/slow').status_code))
+    first.start()
+    entered.wait(5)
+
+    shed = admission_app.test_client().get('/slow')
+    release.set()
+    first.join()
+
+    assert shed.status_code == 503
+    assert shed.headers['Retry-After'] == '1'
+    assert results == [200]
+    assert admission.in_flight == 0
+
+
+@pytest.mark.parametrize('scale', [1, 1e3, 1e6, 1e9])
+def test_request_start_units(scale):
+    """Test seconds, milliseconds, microseconds and nanoseconds all parse to seconds"""
+    now = time.time()
+    assert parse_request_start(f"t={now * scale:.3f}") == pytest.approx(now)
+    assert parse_request_start(f"{now * scale:.0f}") == pytest.approx(now, abs=1)
+
+
+def test_request_start_rejects_garbage():
+    """Test unparseable or impossible stamps are ignored"""
+    for value in ('garbage', 't=', '-5', 'inf', 'nan'):
+        assert parse_request_start(value) is None
+
+
+def test_admission_sheds_requests_queued_too_long(monkeypatch):
+    """Test a trusted proxy's X-Request-Start older than ADMISSION_MAX_QUEUE_MS is shed"""
+    monkeypatch.setitem(app.config, 'TRUSTED_PROXIES', 1)
+    monkeypatch.setattr(app.extensions['rate_limiter'], 'backend', LocalBuckets())
+    now = time.time()
+    with app.test_client() as client:
+        def status(stamp):
+            return client.get('/api/secure-data?user_id=5', headers={'X-Request-Start': stamp}).status_code
+
+        assert status('t=1000') == 503
+        assert status('garbage') == 200
+        # nginx ${msec}: seconds with a fraction
+        assert status(f"t={now:.3f}") == 200
+        assert status(f"t={now - 5:.3f}") == 503
+        assert status(f"t={now * 1e3:.0f}") == 200
+        assert status(f"t={now * 1e6:.0f}") == 200
+
+
+def test_admission_ignores_request_start_without_trusted_proxy():
+    """Test a client-supplied X-Request-Start cannot get requests shed"""
+    with app.test_client() as client:
+        response = client.get('/api/secure-data?user_id=5', headers={'X-Request-Start': 't=1000'})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('user_id', ['1', None])
+def test_secure_data_rate_limited(user_id, monkeypatch):
+    """Test /api/secure-data answers 429 once the client budget is spent"""
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_CLIENT', '1:2')
+    monkeypatch.setattr(app.extensions['rate_limiter'], 'backend', LocalBuckets())
+    path = f"/api/secure-data?user_id={user_id}" if user_id else '/api/secure-data'
+    with app.test_client() as client:
+        statuses = [client.get(path).status_code for _ in range(3)]
+    assert statuses[-1] == 429
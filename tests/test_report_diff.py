@@ -0,0 +1,88 @@
+import json
+import time
+
+import pytest
+
+from findings import make_finding
+from report_diff import load_snapshot, stream_delta
+
+
+def finding(cve, severity='HIGH', package='openssl@1.1', location='debian'):
+    return make_finding('trivy', cve, package=package, location=location, severity=severity)
+
+
+def snapshot_of(tmp_path, findings, name='baseline.json'):
+    path = tmp_path / name
+    stream_delta(iter(findings), snapshot_path=path)
+    return load_snapshot(path)
+
+
+def test_diff_reports_new_and_fixed(tmp_path):
+    """Test only findings whose fingerprint changed are reported"""
+    baseline = snapshot_of(tmp_path, [finding('CVE-A'), finding('CVE-B')])
+
+    delta = stream_delta(iter([finding('CVE-B', severity='CRITICAL'), finding('CVE-C')]), baseline)
+
+    assert [f['rule_id'] for f in delta['new_findings']] == ['CVE-C']
+    assert [f['rule_id'] for f in delta['fixed_findings']] == ['CVE-A']
+    assert delta['unchanged'] == 1
+
+
+def test_fingerprint_includes_package_and_location(tmp_path):
+    """Test the same CVE in another package or target is a distinct finding"""
+    baseline = snapshot_of(tmp_path, [finding('CVE-A')])
+
+    delta = stream_delta(iter([finding('CVE-A', package='openssl@3.0'), finding('CVE-A', location='alpine')]),
+                         baseline)
+
+    assert delta['new']['total'] == 2
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test a written snapshot diffs cleanly against the same findings"""
+    current = [finding('CVE-A'), finding('CVE-B', severity='LOW')]
+    path = tmp_path / 'security-findings.json'
+    baseline = snapshot_of(tmp_path, current, path.name)
+
+    delta = stream_delta(iter(current), baseline)
+    assert delta['new']['total'] == 0 and delta['fixed']['total'] == 0
+    assert len(baseline) == 2
+
+    path.write_text(json.dumps({'version': 99, 'findings': []}))
+    with pytest.raises(ValueError):
+        load_snapshot(path)
+
+
+def test_delta_orders_by_severity_and_dedupes(tmp_path):
+    """Test new findings are listed most severe first, counted once each by severity"""
+    new = [finding('CVE-L', severity='LOW'), finding('CVE-C', severity='CRITICAL'), finding('CVE-H')]
+    snapshot_path = tmp_path / 'current.json'
+
+    delta = stream_delta(iter(new + new[:2]), {}, snapshot_path, 'baseline.json', limit=2)
+
+    assert [f['rule_id'] for f in delta['new_findings']] == ['CVE-C', 'CVE-H']
+    assert delta['new']['critical'] == 1 and delta['new']['total'] == 3
+    assert delta['baseline'] == 'baseline.json'
+    assert len(load_snapshot(snapshot_path)) == 3
+
+
+def test_diff_100k_findings_under_a_second(tmp_path):
+    """Test snapshot load plus the streaming delta of 100k-finding reports stays well under a second"""
+    snapshot_of(tmp_path, (finding(f"CVE-{n}", package=f"pkg-{n % 997}@1") for n in range(100_000)))
+    current = [finding(f"CVE-{n}", package=f"pkg-{n % 997}@1") for n in range(1000, 101_000)]
+
+    start = time.perf_counter()
+    delta = stream_delta(iter(current), load_snapshot(tmp_path / 'baseline.json'))
+    elapsed = time.perf_counter() - start
+
+    assert delta['new']['total'] == 1000 and delta['fixed']['total'] == 1000
+    assert delta['unchanged'] == 99_000
+    assert elapsed < 1.0
+
+
+def test_stream_delta_without_baseline(tmp_path):
+    """Test only the snapshot is written when there is nothing to diff against"""
+    path = tmp_path / 'current.json'
+    assert stream_delta(finding(f"CVE-{n}") for n in range(3)) is None
+    assert stream_delta((finding(f"CVE-{n}") for n in range(3)), snapshot_path=path) is None
+    assert len(load_snapshot(path)) == 3
@@ -0,0 +1,104 @@
+import re
+import time
+
+from flask import Flask
+
+from src.app import app
+from src.request_timing import RequestTimer, SlowRequests
+
+SERVER_TIMING = re.compile(
+    r'routing;dur=[\d.]+, handler;dur=([\d.]+), serialization;dur=[\d.]+, total;dur=([\d.]+)')
+
+
+def make_timed_app(**config):
+    timed_app = Flask('timed')
+    timed_app.config.update(config)
+    timer = RequestTimer(timed_app)
+
+    @timed_app.route('/sleep/<int:ms>')
+    def sleep(ms):
+        time.sleep(ms / 1000)
+        return {'slept': ms}
+
+    return timed_app, timer
+
+
+def test_server_timing_header():
+    """Test responses break their time down into routing, handler and serialization"""
+    timed_app, _ = make_timed_app()
+    response = timed_app.test_client().get('/sleep/20')
+
+    match = SERVER_TIMING.fullmatch(response.headers['Server-Timing'])
+    assert match
+    handler, total = map(float, match.groups())
+    assert 20 <= handler <= total
+
+
+def test_server_timing_on_errors_and_app_routes():
+    """Test 404s and the real application's routes are timed too"""
+    timed_app, _ = make_timed_app()
+    assert SERVER_TIMING.fullmatch(timed_app.test_client().get('/missing').headers['Server-Timing'])
+    assert SERVER_TIMING.fullmatch(app.test_client().get('/api/info').headers['Server-Timing'])
+
+
+def test_server_timing_can_be_disabled():
+    """Test SERVER_TIMING=False drops the header but keeps recording"""
+    timed_app, timer = make_timed_app(SERVER_TIMING=False)
+    response = timed_app.test_client().get('/sleep/1')
+    assert 'Server-Timing' not in response.headers
+    assert timer.slow_requests.slowest()[0]['endpoint'] == '/sleep/<int:ms>'
+
+
+def test_slow_requests_keep_the_slowest():
+    """Test the buffer holds only the N slowest requests, slowest first"""
+    slow = SlowRequests(size=3)
+    for total in (5, 1, 9, 3, 7, 2):
+        slow.add(total, {'total': total})
+    assert [record['total'] for record in slow.slowest()] == [9, 7, 5]
+    assert not slow.would_keep(4)
+    assert slow.would_keep(6)
+
+
+def test_slow_requests_disabled(caplog):
+    """Test SLOW_REQUESTS_KEPT=0 keeps nothing but still logs slow requests"""
+    timed_app, timer = make_timed_app(SLOW_REQUESTS_KEPT=0, SLOW_REQUEST_LOG_MS=0)
+    assert timed_app.test_client().get('/sleep/0').status_code == 200
+    assert timer.slow_requests.slowest() == []
+    assert not timer.slow_requests.would_keep(1e9)
+    assert len(caplog.records) == 1
+
+
+def test_slow_request_logged(caplog):
+    """Test requests over SLOW_REQUEST_LOG_MS are logged with their phases"""
+    timed_app, _ = make_timed_app(SLOW_REQUEST_LOG_MS=10)
+    client = timed_app.test_client()
+    client.get('/sleep/0')
+    client.get('/sleep/15')
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 1
+    assert messages[0].startswith('Slow request GET /sleep/15 took')
+
+
+def test_debug_endpoint_requires_token():
+    """Test /debug/slow-requests is hidden without the debug token"""
+    timed_app, _ = make_timed_app(DEBUG_TOKEN='secret')
+    client = timed_app.test_client()
+    client.get('/sleep/5')
+    client.get('/sleep/1')
+
+    assert client.get('/debug/slow-requests').status_code == 404
+    assert client.get('/debug/slow-requests', headers={'Authorization': 'Bearer wrong'}).status_code == 404
+
+    data = client.get('/debug/slow-requests', headers={'Authorization': 'Bearer secret'}).get_json()
+    slowest = data['slowest'][0]
+    assert slowest['path'] == '/sleep/5'
+    assert slowest['status'] == 200
+    assert set(slowest['phases_ms']) == {'routing', 'handler', 'serialization'}
+
+
+def test_debug_endpoint_disabled_without_token():
+    """Test no configured token means no access at all"""
+    timed_app, _ = make_timed_app()
+    response = timed_app.test_client().get('/debug/slow-requests', headers={'Authorization': 'Bearer '})
+    assert response.status_code == 404
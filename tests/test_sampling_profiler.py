@@ -0,0 +1,136 @@
+import os
+import signal
+import time
+
+from flask import Flask
+
+from src.app import app
+from src.sampling_profiler import Profiling, SamplingProfiler, collapse
+
+AUTH = {'Authorization': 'Bearer secret'}
+
+
+def busy_handler(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(1000))
+
+
+def wait_until_finished(profiler, timeout=5):
+    deadline = time.monotonic() + timeout
+    while profiler.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not profiler.running
+
+
+def make_profiled_app(tmp_path):
+    profiled_app = Flask('profiled')
+    profiled_app.config.update(DEBUG_TOKEN='secret', PROFILE_SECONDS=0.2, PROFILE_DIR=str(tmp_path))
+    profiling = Profiling(profiled_app, SamplingProfiler(interval=0.001))
+
+    @profiled_app.route('/work')
+    def work():
+        busy_handler(0.3)
+        return {'done': True}
+
+    return profiled_app, profiling
+
+
+def test_collapse_orders_frames_outermost_first():
+    """Test collapsed stacks name frames as module:function from the root down"""
+    def inner():
+        return collapse(__import__('sys')._getframe())
+
+    stack = inner().split(';')
+    assert stack[-1] == f"{__name__}:inner"
+    assert stack[-2] == f"{__name__}:test_collapse_orders_frames_outermost_first"
+
+
+def test_profiler_samples_busy_code():
+    """Test a profile attributes samples to the code that was running"""
+    profiler = SamplingProfiler(interval=0.001)
+    assert profiler.start(0.2)
+    assert not profiler.start(0.2)
+    busy_handler(0.25)
+    wait_until_finished(profiler)
+
+    lines = profiler.collapsed().splitlines()
+    assert profiler.samples > 0
+    assert any('busy_handler' in line for line in lines)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+
+def test_stop_ends_profile_early():
+    """Test stop() ends sampling before the requested duration"""
+    profiler = SamplingProfiler()
+    profiler.start(30)
+    start = time.monotonic()
+    profiler.stop()
+    assert not profiler.running
+    assert time.monotonic() - start < 1
+
+
+def test_profile_endpoint_round_trip(tmp_path):
+    """Test starting a profile over HTTP and fetching its collapsed stacks"""
+    profiled_app, profiling = make_profiled_app(tmp_path)
+    client = profiled_app.test_client()
+
+    assert client.get('/debug/profile', headers=AUTH).status_code == 404
+    started = client.post('/debug/profile?seconds=0.2', headers=AUTH)
+    assert started.status_code == 202
+    assert started.get_json()['pid'] == os.getpid()
+    assert client.post('/debug/profile', headers=AUTH).status_code == 409
+
+    client.get('/work')
+    wait_until_finished(profiling.profiler)
+
+    response = client.get('/debug/profile', headers=AUTH)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert 'test_sampling_profiler:busy_handler' in response.get_data(as_text=True)
+    assert int(response.headers['X-Profile-Samples']) > 0
+
+
+def test_profile_endpoint_requires_token():
+    """Test the profiler cannot be triggered without the debug token"""
+    response = app.test_client().post('/debug/profile')
+    assert response.status_code == 404
+    assert not app.extensions['profiling'].profiler.running
+
+
+def test_signal_starts_profile_and_writes_file(tmp_path):
+    """Test SIGUSR2 profiles the process and saves the stacks to PROFILE_DIR"""
+    profiled_app, profiling = make_profiled_app(tmp_path)
+    previous = signal.getsignal(signal.SIGUSR2)
+    profiling.install_signal_handler()
+    try:
+        os.kill(os.getpid(), signal.SIGUSR2)
+        busy_handler(0.25)
+        wait_until_finished(profiling.profiler)
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+    written = list(tmp_path.glob('profile-*.folded'))
+    assert len(written) == 1
+    assert 'busy_handler' in written[0].read_text()
+
+
+def test_signal_handler_does_not_take_the_profiler_lock(tmp_path):
+    """Test SIGUSR2 arriving while the main thread holds the profiler lock
+    does not deadlock; the profile starts once the lock is free"""
+    profiled_app, profiling = make_profiled_app(tmp_path)
+    previous = signal.getsignal(signal.SIGUSR2)
+    profiling.install_signal_handler()
+    try:
+        with profiling.profiler._lock:
+            os.kill(os.getpid(), signal.SIGUSR2)
+            busy_handler(0.05)
+        deadline = time.monotonic() + 2
+        while profiling.profiler.started is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert profiling.profiler.started is not None
+        wait_until_finished(profiling.profiler)
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+    assert len(list(tmp_path.glob('profile-*.folded'))) == 1
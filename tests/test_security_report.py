@@ -0,0 +1,356 @@
+import json
+import threading
+import time
+
+import pytest
+
+import generate_security_report as report
+
+SEVERITIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'UNKNOWN']
+
+
+def trivy_report(per_target=10, targets=3):
+    """Trivy-shaped report with a predictable severity mix"""
+    results = []
+    for target in range(targets):
+        results.append({
+            'Target': f"image-layer-{target}",
+            'Vulnerabilities': [
+                {
+                    'VulnerabilityID': f"CVE-2023-{target:02d}{i:03d}",
+                    'PkgName': f"pkg-{i}",
+                    'Severity': SEVERITIES[i % len(SEVERITIES)],
+                    'CVSS': {'nvd': {'V3Score': 7.5}}
+                }
+                for i in range(per_target)
+            ]
+        })
+    results.append({'Target': 'python-pkg', 'Vulnerabilities': None})
+    return {'SchemaVersion': 2, 'Results': results}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the report parsers inside an empty directory"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_trivy_streaming_matches_full_parse(workdir):
+    """Test streaming and in-memory parsing produce the same summary"""
+    (workdir / 'trivy-report.json').write_text(json.dumps(trivy_report()))
+
+    streamed = report.parse_trivy_report(stream='always')
+    loaded = report.parse_trivy_report(stream='never')
+
+    assert streamed == loaded
+    assert streamed['summary'] == {'total': 30, 'critical': 6, 'high': 6, 'medium': 6, 'low': 6}
+
+
+def test_trivy_streaming_avoids_full_load(workdir, monkeypatch):
+    """Test streaming mode never decodes the whole document"""
+    (workdir / 'trivy-report.json').write_text(json.dumps(trivy_report()))
+
+    def fail(*args, **kwargs):
+        raise AssertionError('json.load called in streaming mode')
+
+    monkeypatch.setattr(report.json, 'load', fail)
+    assert report.parse_trivy_report(stream='always')['summary']['total'] == 30
+
+
+def test_iter_trivy_vulnerabilities_is_lazy(workdir):
+    """Test records are yielded one at a time in document order"""
+    (workdir / 'trivy-report.json').write_text(json.dumps(trivy_report(per_target=2, targets=2)))
+
+    records = report.iter_trivy_vulnerabilities('trivy-report.json')
+    first = next(records)
+
+    assert first['VulnerabilityID'] == 'CVE-2023-00000'
+    assert first['CVSS']['nvd']['V3Score'] == 7.5
+    assert len(list(records)) == 3
+
+
+def test_trivy_auto_streams_large_files(workdir, monkeypatch):
+    """Test auto mode switches to streaming above the size threshold"""
+    (workdir / 'trivy-report.json').write_text(json.dumps(trivy_report()))
+
+    assert not report.use_trivy_streaming('trivy-report.json', 'auto')
+    monkeypatch.setattr(report, 'TRIVY_STREAM_THRESHOLD', 10)
+    assert report.use_trivy_streaming('trivy-report.json', 'auto')
+
+
+@pytest.mark.parametrize('stream', ['always', 'never'])
+def test_trivy_invalid_or_missing_report(workdir, stream):
+    """Test truncated or missing reports are treated as absent"""
+    assert report.parse_trivy_report(stream=stream)['html'] == '<p>No Trivy report found.</p>'
+
+    (workdir / 'trivy-report.json').write_text(json.dumps(trivy_report())[:200])
+    assert report.parse_trivy_report(stream=stream)['summary']['total'] == 0
+
+
+def bandit_report(high=0, medium=0):
+    results = ([{'issue_severity': 'HIGH'}] * high) + ([{'issue_severity': 'MEDIUM'}] * medium)
+    return {'results': results}
+
+
+def write_reports(workdir, critical=True):
+    data = trivy_report(per_target=5 if critical else 0, targets=2)
+    (workdir / 'trivy-report.json').write_text(json.dumps(data))
+    (workdir / 'bandit-report.json').write_text(json.dumps(bandit_report(high=2, medium=1)))
+    (workdir / 'safety-report.json').write_text(json.dumps([{'package': 'flask'}]))
+
+
+def default_parsers():
+    return {
+        'bandit': report.parse_bandit_report,
+        'safety': report.parse_safety_report,
+        'trivy': report.parse_trivy_report,
+        'zap': report.parse_zap_report
+    }
+
+
+@pytest.mark.parametrize('executor', ['process', 'thread'])
+def test_parallel_parsers_match_serial(workdir, executor):
+    """Test pooled parsing merges to the same results as running serially"""
+    write_reports(workdir)
+
+    serial, _ = report.run_parsers(default_parsers(), executor='serial')
+    parallel, skipped = report.run_parsers(default_parsers(), executor=executor)
+
+    assert parallel == serial
+    assert skipped == []
+
+
+def test_short_circuit_skips_slow_parsers():
+    """Test the gate does not wait for slow parsers once it has failed"""
+    release = threading.Event()
+
+    def critical():
+        return {'summary': {'total': 1, 'critical': 1, 'high': 0, 'medium': 0, 'low': 0}, 'html': ''}
+
+    def stuck():
+        release.wait(5)
+        return {'summary': {'total': 0, 'high': 0, 'medium': 0, 'low': 0}, 'html': ''}
+
+    start = time.perf_counter()
+    results, skipped = report.run_parsers({'trivy': critical, 'bandit': stuck},
+                                          executor='thread', short_circuit=True)
+    elapsed = time.perf_counter() - start
+    release.set()
+
+    assert elapsed < 1
+    assert skipped == ['bandit']
+    assert report.gate_decision(report.calculate_summary(results))[0] == 1
+
+
+def test_parser_errors_propagate():
+    """Test an exception inside a pooled parser fails the run"""
+    def broken():
+        raise ValueError('bad report')
+
+    with pytest.raises(ValueError):
+        report.run_parsers({'bandit': broken}, executor='thread')
+
+
+def test_main_writes_reports(workdir, monkeypatch):
+    """Test the full report is written and the gate fails on critical findings"""
+    write_reports(workdir)
+    monkeypatch.setattr('sys.argv', ['generate_security_report.py', '--executor', 'thread'])
+
+    with pytest.raises(SystemExit) as exit_info:
+        report.main()
+
+    assert exit_info.value.code == 1
+    summary = json.loads((workdir / 'security-reports' / 'security-summary.json').read_text())
+    assert summary['summary']['critical'] == 2
+    assert summary['summary']['total_vulnerabilities'] == 14
+    assert 'Trivy Scan Results' in (workdir / 'security-reports' / 'security-summary.html').read_text()
+
+
+def test_report_cache_keys_follow_content(workdir):
+    """Test cache keys change with input content and code version only"""
+    from report_cache import ReportCache
+
+    (workdir / 'bandit-report.json').write_text(json.dumps(bandit_report(high=1)))
+    cache = ReportCache(workdir / 'cache', code_version='v1')
+    key = cache.key('bandit', ['bandit-report.json', 'bandit-report.txt'])
+
+    assert cache.key('bandit', ['bandit-report.json', 'bandit-report.txt']) == key
+    assert ReportCache(workdir / 'cache', code_version='v2').key(
+        'bandit', ['bandit-report.json', 'bandit-report.txt']) != key
+
+    (workdir / 'bandit-report.json').write_text(json.dumps(bandit_report(high=2)))
+    assert cache.key('bandit', ['bandit-report.json', 'bandit-report.txt']) != key
+
+
+def test_report_cache_round_trip(workdir):
+    """Test stored results come back and replace older entries"""
+    from report_cache import ReportCache
+
+    cache = ReportCache(workdir / 'cache')
+    cache.put('zap', 'old', {'summary': {'total': 1}, 'html': 'old'})
+    cache.put('zap', 'new', {'summary': {'total': 2}, 'html': 'new'})
+
+    assert cache.get('zap', 'old') is None
+    assert cache.get('zap', 'new') == {'summary': {'total': 2}, 'html': 'new'}
+    assert cache.hits == ['zap'] and cache.misses == ['zap']
+
+    cache.clear()
+    assert cache.get('zap', 'new') is None
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr('sys.argv', ['generate_security_report.py', '--executor', 'serial', *args])
+    with pytest.raises(SystemExit) as exit_info:
+        report.main()
+    return exit_info.value.code
+
+
+def test_main_skips_unchanged_reports(workdir, monkeypatch):
+    """Test only parsers whose inputs changed run on the next build"""
+    write_reports(workdir, critical=False)
+    run_main(monkeypatch)
+
+    calls = []
+    original = report.parse_bandit_report
+    monkeypatch.setattr(report, 'parse_bandit_report', lambda: calls.append('bandit') or original())
+    monkeypatch.setattr(report, 'parse_trivy_report', lambda stream: pytest.fail('trivy re-parsed'))
+
+    (workdir / 'bandit-report.json').write_text(json.dumps(bandit_report(high=5)))
+    run_main(monkeypatch)
+
+    assert calls == ['bandit']
+    summary = json.loads((workdir / 'security-reports' / 'security-summary.json').read_text())
+    assert summary['summary']['high'] == 5
+
+
+def test_main_invalidate_and_disable_cache(workdir, monkeypatch):
+    """Test --invalidate-cache and --no-cache both force a full parse"""
+    write_reports(workdir, critical=False)
+    run_main(monkeypatch)
+
+    calls = []
+    original = report.parse_zap_report
+    monkeypatch.setattr(report, 'parse_zap_report', lambda: calls.append('zap') or original())
+
+    run_main(monkeypatch)
+    run_main(monkeypatch, '--invalidate-cache')
+    run_main(monkeypatch, '--no-cache')
+
+    assert calls == ['zap', 'zap']
+
+
+def test_main_records_findings_history(workdir, monkeypatch):
+    """Test --store appends one build of normalized findings per run"""
+    from findings_store import FindingsStore
+
+    write_reports(workdir)
+    run_main(monkeypatch, '--store', 'history/findings.db', '--build-id', '41')
+    run_main(monkeypatch, '--store', 'history/findings.db', '--build-id', '42')
+
+    with FindingsStore('history/findings.db') as store:
+        assert [row['build'] for row in store.trend()] == ['41', '42']
+        assert store.trend()[-1]['critical'] == 2
+        assert store.first_seen('CVE-2023-00000')[0]['first_build'] == '41'
+
+
+def test_main_delta_gate(workdir, monkeypatch):
+    """Test the delta gate ignores findings already present in the baseline"""
+    write_reports(workdir)
+    assert run_main(monkeypatch, '--write-findings', '--no-cache') == 1
+    (workdir / 'baseline.json').write_bytes((workdir / 'security-reports' / 'security-findings.json').read_bytes())
+
+    assert run_main(monkeypatch, '--baseline', 'baseline.json', '--gate', 'delta', '--no-cache') == 0
+    summary = json.loads((workdir / 'security-reports' / 'security-summary.json').read_text())
+    assert summary['delta']['new']['total'] == 0
+    baseline = json.loads((workdir / 'baseline.json').read_text())
+    assert summary['delta']['unchanged'] == len(baseline['findings'])
+
+    data = trivy_report(per_target=5, targets=2)
+    data['Results'][0]['Vulnerabilities'].append(
+        {'VulnerabilityID': 'CVE-2024-0001', 'PkgName': 'zlib', 'Severity': 'CRITICAL'})
+    (workdir / 'trivy-report.json').write_text(json.dumps(data))
+
+    assert run_main(monkeypatch, '--baseline', 'baseline.json', '--gate', 'delta', '--no-cache') == 1
+    summary = json.loads((workdir / 'security-reports' / 'security-summary.json').read_text())
+    assert [f['rule_id'] for f in summary['delta']['new_findings']] == ['CVE-2024-0001']
+    assert 'Changes Since Baseline' in (workdir / 'security-reports' / 'security-summary.html').read_text()
+
+
+def test_main_html_includes_findings_tables(workdir, monkeypatch):
+    """Test the HTML report lists every finding and the untruncated text output"""
+    write_reports(workdir)
+    (workdir / 'trivy-report.txt').write_text('line\n' * 2000)
+
+    run_main(monkeypatch, '--no-cache', '--page-size', '4')
+    html = (workdir / 'security-reports' / 'security-summary.html').read_text()
+    assert html.count('CVE-2023-') == 10
+    assert 'Findings 9&ndash;10' in html
+    assert html.count('line\n') == 2000
+
+    run_main(monkeypatch, '--no-cache', '--summary-only')
+    assert 'CVE-2023-' not in (workdir / 'security-reports' / 'security-summary.html').read_text()
+
+
+def test_delta_gate_ignores_short_circuit(workdir, monkeypatch):
+    """Test old findings served from the cache do not skip parsers under the delta gate"""
+    write_reports(workdir)
+    run_main(monkeypatch, '--write-findings')
+    (workdir / 'baseline.json').write_bytes((workdir / 'security-reports' / 'security-findings.json').read_bytes())
+
+    # Trivy (with its old criticals) now comes from the cache; Bandit has new issues
+    new_issues = [{'test_id': f"B{600 + n}", 'issue_severity': 'HIGH', 'filename': 'src/app.py'}
+                  for n in range(12)]
+    (workdir / 'bandit-report.json').write_text(json.dumps({'results': new_issues}))
+
+    assert run_main(monkeypatch, '--baseline', 'baseline.json', '--gate', 'delta', '--short-circuit') == 1
+    summary = json.loads((workdir / 'security-reports' / 'security-summary.json').read_text())
+    assert 'skipped_parsers' not in summary
+    assert summary['delta']['new']['high'] == 12
+
+
+def test_main_reuses_cached_findings_tables(workdir, monkeypatch):
+    """Test findings tables of unchanged reports come from the cache, not a re-parse"""
+    write_reports(workdir)
+    run_main(monkeypatch)
+
+    parsed = []
+    original = report.iter_findings
+    monkeypatch.setattr(report, 'iter_findings',
+                        lambda tool, stream_trivy: parsed.append(tool) or original(tool, stream_trivy))
+
+    (workdir / 'bandit-report.json').write_text(json.dumps(bandit_report(high=5)))
+    run_main(monkeypatch)
+
+    assert parsed == ['bandit']
+    html = (workdir / 'security-reports' / 'security-summary.html').read_text()
+    assert html.count('CVE-2023-') == 10
+
+    # Re-rendering reads the cached findings rows instead of the reports
+    run_main(monkeypatch, '--page-size', '3')
+    assert parsed == ['bandit']
+    html = (workdir / 'security-reports' / 'security-summary.html').read_text()
+    assert html.count('CVE-2023-') == 10 and 'Findings 1&ndash;3' in html
+
+
+def test_delta_gate_parses_each_report_once(workdir, monkeypatch):
+    """Test the delta, history and tables share one parse per report and reuse it on the next build"""
+    write_reports(workdir)
+    parsed = []
+    original = report.iter_findings
+    monkeypatch.setattr(report, 'iter_findings',
+                        lambda tool, stream_trivy: parsed.append(tool) or original(tool, stream_trivy))
+
+    assert run_main(monkeypatch, '--write-findings', '--store', 'findings.db', '--build-id', '1') == 1
+    assert sorted(parsed) == ['bandit', 'safety', 'trivy', 'zap']
+    (workdir / 'baseline.json').write_bytes((workdir / 'security-reports' / 'security-findings.json').read_bytes())
+
+    parsed.clear()
+    assert run_main(monkeypatch, '--baseline', 'baseline.json', '--gate', 'delta',
+                    '--store', 'findings.db', '--build-id', '2', '--page-size', '3') == 0
+    assert parsed == []
+    summary = json.loads((workdir / 'security-reports' / 'security-summary.json').read_text())
+    baseline = json.loads((workdir / 'baseline.json').read_text())
+    assert summary['delta']['unchanged'] == len(baseline['findings'])
+    assert (workdir / 'security-reports' / 'security-findings.json').read_bytes() == \
+        (workdir / 'baseline.json').read_bytes()
@@ -0,0 +1,57 @@
+import pytest
+
+from src import server_tuning
+from src.server_tuning import cgroup_cpu_limit, cgroup_memory_limit, detect, tune
+
+MB = 1024 * 1024
+
+
+def write(root, path, value):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(f"{value}\n")
+
+
+def test_cgroup_v2_limits(tmp_path):
+    """Test cpu.max and memory.max are read as CPUs and bytes"""
+    write(tmp_path, 'cpu.max', '50000 100000')
+    write(tmp_path, 'memory.max', 512 * MB)
+    assert cgroup_cpu_limit(tmp_path) == 0.5
+    assert cgroup_memory_limit(tmp_path) == 512 * MB
+
+    write(tmp_path, 'cpu.max', 'max 100000')
+    write(tmp_path, 'memory.max', 'max')
+    assert cgroup_cpu_limit(tmp_path) is None
+    assert cgroup_memory_limit(tmp_path) is None
+
+
+def test_cgroup_v1_limits(tmp_path):
+    """Test CFS quota files and v1's huge 'unlimited' memory value"""
+    write(tmp_path, 'cpu,cpuacct/cpu.cfs_quota_us', 200000)
+    write(tmp_path, 'cpu,cpuacct/cpu.cfs_period_us', 100000)
+    write(tmp_path, 'memory/memory.limit_in_bytes', 9223372036854771712)
+    assert cgroup_cpu_limit(tmp_path) == 2
+    assert cgroup_memory_limit(tmp_path) is None
+
+    write(tmp_path, 'cpu,cpuacct/cpu.cfs_quota_us', -1)
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_no_cgroup_falls_back_to_host(tmp_path, monkeypatch):
+    """Test missing cgroup files mean no quota and the host CPU count is used"""
+    monkeypatch.setattr(server_tuning, 'available_cpus', lambda: 8)
+    settings = detect('sync', root=tmp_path)
+    assert settings['workers'] == 17
+    assert settings['limits'] == {'cpus': 8, 'cpu_quota': False, 'memory_mb': None}
+
+
+@pytest.mark.parametrize('worker_class, cpus, memory_mb, expected', [
+    ('gevent', 0.5, 512, {'workers': 1, 'threads': 1}),   # production pod
+    ('sync', 0.5, 512, {'workers': 2, 'threads': 1}),
+    ('sync', 0.2, 256, {'workers': 1, 'threads': 2}),     # staging pod
+    ('gevent', 4, 1024, {'workers': 4, 'threads': 1}),
+    ('sync', 4, 1024, {'workers': 7, 'threads': 2}),      # memory caps 9 workers at 7
+])
+def test_tune(worker_class, cpus, memory_mb, expected):
+    """Test workers follow the CPU quota and are capped by the memory limit"""
+    assert tune(worker_class, cpus, memory_mb * MB) == expected